@@ -0,0 +1,22 @@
+import os
+
+import ape
+import pytest
+
+from tests.rpc_node import RPCNode
+
+# * Seconds of latency injected into every request to the stand-in node, e.g. APE_UTILS_BENCH_LATENCY=0,0.02
+LATENCIES = [float(latency) for latency in os.environ.get("APE_UTILS_BENCH_LATENCY", "0,0.005").split(",")]
+
+
+@pytest.fixture(scope="session", autouse=True)
+def provider():
+    with ape.networks.ethereum.local.use_provider("test") as provider:
+        yield provider
+
+
+@pytest.fixture(scope="module", params=LATENCIES, ids=lambda latency: f"latency={latency * 1000:g}ms")
+def rpc_node(request):
+    node = RPCNode(latency=request.param).start()
+    yield node
+    node.stop()
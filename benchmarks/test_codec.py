@@ -0,0 +1,52 @@
+"""
+Throughput of the calldata codec across signature shapes, with the parsed-ABI caches warm.
+
+Run with `hatch run bench:bench`, see the `bench` environment in pyproject.toml.
+"""
+
+import pytest
+
+from ape_utils.codec import abi_decode_calldata, decode_calldata, encode_calldata
+from ape_utils.columnar import encode_columns
+
+ADDRESS = "0xDbB18e367E4A2A36A9F2AF7af8b3c743938deCF2"
+
+SHAPES = {
+    "static": ("transfer(address to, uint256 amount)", [ADDRESS, 10**18]),
+    "static-wide": (
+        "settle(address owner, uint256 amount, int128 delta, bool flag, bytes32 salt, uint8 kind)",
+        [ADDRESS, 10**18, -5, True, "0x" + "ab" * 32, 3],
+    ),
+    "dynamic": ("call_this_view_function(uint256 arg1, string addr)", [1234, "0xdeadbeef"]),
+    "arrays": ("airdrop(address[] to, uint256[] amounts)", [[ADDRESS] * 16, list(range(16))]),
+}
+
+
+@pytest.mark.parametrize("shape", SHAPES)
+def test_encode_calldata(benchmark, shape) -> None:
+    signature, args = SHAPES[shape]
+    calldata = benchmark(encode_calldata, signature, *args)
+    assert len(calldata) > 4
+
+
+@pytest.mark.parametrize("shape", SHAPES)
+def test_decode_calldata(benchmark, shape) -> None:
+    signature, args = SHAPES[shape]
+    calldata = f"0x{bytes(encode_calldata(signature, *args)).hex()}"
+    decoded = benchmark(decode_calldata, signature, calldata)
+    assert len(decoded) == len(args)
+
+
+def test_abi_decode_calldata(benchmark) -> None:
+    signature, args = SHAPES["static"]
+    encoded = f"0x{bytes(encode_calldata(signature, *args))[4:].hex()}"
+    decoded = benchmark(abi_decode_calldata, signature, encoded)
+    assert decoded["amount"] == 10**18
+
+
+@pytest.mark.parametrize(("shape", "rows"), [("static", 10_000), ("dynamic", 1_000)])
+def test_encode_columns(benchmark, shape, rows) -> None:
+    signature, args = SHAPES[shape]
+    columns = [[value] * rows for value in args]
+    batch = benchmark(encode_columns, signature, columns)
+    assert len(batch) == rows
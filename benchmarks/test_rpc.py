@@ -0,0 +1,62 @@
+"""
+Latency and throughput of view calls and storage reads against an in-process stand-in node.
+
+The latency injected into every request is set with `APE_UTILS_BENCH_LATENCY`, see conftest.py.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import ape_utils.utils
+from ape_utils.clients import aclose_clients
+from ape_utils.result_cache import ResultCache
+from ape_utils.utils import async_call_many, call_view_function, read_storage_many
+
+ADDRESS = "0xDbB18e367E4A2A36A9F2AF7af8b3c743938deCF2"
+SIGNATURE = "balanceOf(address)(uint256)"
+
+
+@pytest.fixture
+def node(rpc_node, monkeypatch):
+    rpc_node.call_handler = lambda transaction, block: "0x" + (10**18).to_bytes(32, "big").hex()
+    rpc_node.storage[(ADDRESS.lower(), 0)] = 42
+    monkeypatch.setattr(ape_utils.utils, "provider_http_uri", lambda _: rpc_node.uri)
+    return SimpleNamespace(uri=rpc_node.uri, chain_id=1337)
+
+
+def test_call_view_function(benchmark, node) -> None:
+    output = benchmark(call_view_function, SIGNATURE, ADDRESS, [ADDRESS], node)
+    assert output == 10**18
+
+
+def test_call_view_function_cached(benchmark, node, tmp_path) -> None:
+    cache = ResultCache(tmp_path / "results.sqlite")
+    call_view_function(SIGNATURE, ADDRESS, [ADDRESS], node, block_identifier=100, cache=cache)
+    output = benchmark(call_view_function, SIGNATURE, ADDRESS, [ADDRESS], node, block_identifier=100, cache=cache)
+    assert output == 10**18
+    cache.close()
+
+
+def test_async_call_many(benchmark, node) -> None:
+    calls = [(ADDRESS, SIGNATURE, [ADDRESS])] * 100
+
+    def run() -> list:
+        async def main() -> list:
+            try:
+                return await async_call_many(calls, node, concurrency=16)
+            finally:
+                await aclose_clients()
+
+        return asyncio.run(main())
+
+    results = benchmark(run)
+    assert results == [(True, 10**18)] * 100
+
+
+@pytest.mark.parametrize("slots", [1, 256])
+def test_read_storage_many(benchmark, node, slots) -> None:
+    values = benchmark(read_storage_many, ADDRESS, range(slots), batch_size=100)
+    assert len(values) == slots
+    assert int.from_bytes(values[0], "big") == 42
@@ -1,29 +1,57 @@
 import ast
+import asyncio
+import functools
+import json
 import logging
-from typing import Any
+from collections.abc import Iterable
+from contextlib import nullcontext
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Optional, TextIO
 
 import click
 import rich_click as rclick
 from ape.cli import ConnectedProviderCommand, network_option
-from ape_node.provider import Node
-from rich.console import Console
-
-# from rich.logging import RichHandler
-from rich.pretty import pprint
-from rich.traceback import install
+from ape.types import HexBytes
 
 from ape_utils.__version__ import version
-from ape_utils.utils import (
-    abi_decode_calldata,
-    abi_encode_calldata,
-    call_view_function,
-    decode_calldata,
-    encode_calldata,
-    read_storage,
+from ape_utils.codec import abi_decode_calldata, abi_encode_calldata, decode_calldata, encode_calldata
+from ape_utils.columnar import encode_columns, read_csv_columns
+from ape_utils.constants import (
+    DEFAULT_BATCH_CALLDATA_LIMIT,
+    DEFAULT_BATCH_GAS_LIMIT,
+    DEFAULT_CALL_TIMEOUT,
+    DEFAULT_LOG_CHUNK_SIZE,
+    DEFAULT_RETRIES,
+    DEFAULT_RPC_BATCH_SIZE,
+    DEFAULT_SWEEP_WORKERS,
+)
+from ape_utils.dispatch import SelectorDecoder
+from ape_utils.profiling import PROFILER
+from ape_utils.server import DEFAULT_SOCKET_PATH, Worker, forward, from_typed_response
+from ape_utils.streaming import (
+    OUTPUT_FORMATS,
+    buffered,
+    decode_stream,
+    input_columns,
+    iter_calldata,
+    to_json_value,
+    write_csv,
+    write_json,
+    write_ndjson,
+    write_rows,
 )
 
-install()
-console = Console()
+# * The network stack (web3, multicall, aiohttp, the node provider) takes over a second to import.
+# * It is only imported inside the commands that talk to a node, so `encode` and `decode` start fast.
+# * Rich is only imported for human-facing output, `--raw` and `--format` never load it.
+if TYPE_CHECKING:
+    from ape_node.provider import Node
+    from rich.console import Console
+    from rich.table import Table
+
+    from ape_utils.fork import ForkState
+    from ape_utils.result_cache import ResultCache
+
 FORMAT = "%(message)s"
 # logging.basicConfig(level="WARN", format=FORMAT, datefmt="[%X]", handlers=[RichHandler()])
 
@@ -35,9 +63,21 @@ rclick.OPTION_GROUPS = {
             "name": "Required options",
             "options": ["--function-sig", "--address", "--args"],
         },
+        {
+            "name": "Batch options",
+            "options": ["--batch", "--batch-calldata-limit", "--batch-gas-limit", "--concurrency"],
+        },
+        {
+            "name": "Sweep options",
+            "options": ["--from-block", "--to-block", "--step", "--checkpoint"],
+        },
+        {
+            "name": "Network options",
+            "options": ["--network", "--network-timeout"],
+        },
         {
             "name": "Additional options",
-            "options": ["--help", "--version"],
+            "options": ["--help", "--version", "--profile", "--profile-output", "--profile-format"],
         },
     ]
 }
@@ -59,76 +99,1147 @@ rclick.COMMAND_GROUPS = {
 class PythonLiteralOption(click.Option):
     @classmethod
     def type_cast_value(cls, _: Any, value: Any) -> Any:
+        if value is None:
+            return None
         try:
             return ast.literal_eval(value)
         except:  # noqa: E722
             raise click.BadParameter(value)  # noqa: B904
 
 
+@functools.cache
+def get_console(stderr: bool = False) -> "Console":  # noqa: FBT001, FBT002
+    """
+    Returns the Rich console of the human-facing output, importing Rich and installing its tracebacks on first use.
+    """
+    from rich.console import Console  # noqa: PLC0415
+    from rich.traceback import install  # noqa: PLC0415
+
+    install()
+    return Console(stderr=stderr)
+
+
+def echo_raw(value: Any) -> None:
+    """
+    Prints a value as plain text for `--raw`, without markup, highlighting or wrapping.
+    """
+    click.echo(str(value))
+
+
+def to_hex(value: Any) -> str:
+    """
+    Returns bytes, or a hex string, as a `0x` prefixed hex string.
+    """
+    return f"0x{bytes(HexBytes(value)).hex()}"
+
+
+def format_option(*choices: str) -> Callable:
+    """
+    Adds the `--format` option writing machine-readable output instead of the Rich rendering.
+    """
+    return click.option(
+        "--format",
+        "output_format",
+        type=click.Choice(list(choices or OUTPUT_FORMATS)),
+        help="Write machine-readable output to stdout without any terminal rendering.",
+    )
+
+
+def write_output(
+    rows: Iterable[Any],
+    output_format: str,
+    columns: Optional[list[str]] = None,
+    hex_key: Optional[str] = None,
+    output: Optional[TextIO] = None,
+    *,
+    single: bool = False,
+) -> None:
+    """
+    Writes rows to stdout, or `output`, with `write_rows` through a block buffered stream.
+
+    A `single` result is written as a bare JSON value rather than an array of one row.
+    """
+    if single and output_format == "json":
+        output_format = "ndjson"
+    with buffered(output if output is not None else click.get_text_stream("stdout")) as stream:
+        try:
+            write_rows(rows, stream, output_format, columns, hex_key)
+        except ValueError as e:
+            raise click.ClickException(str(e)) from e
+
+
+def report_error(e: Exception, raw: bool, output_format: Optional[str]) -> None:  # noqa: FBT001
+    """
+    Prints an error of a command, or raises it as a `ClickException` on stderr with machine-readable output.
+    """
+    if output_format is not None:
+        raise click.ClickException(str(e)) from e
+    if raw:
+        echo_raw(e)
+    else:
+        get_console().print(f"Error: [red]{e!s}")
+
+
+def profiled(callback: Callable, lap: Optional[str] = None) -> Callable:
+    """
+    Wraps a command callback so that `--profile` times it as the `command` stage.
+
+    With `lap`, the time since `PROFILER.mark()` is first recorded under that stage, e.g. the
+    provider connection between the start of `invoke` and the callback.
+    """
+
+    @functools.wraps(callback)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if lap is not None:
+            PROFILER.lap(lap)
+        with PROFILER.stage("command"):
+            return callback(*args, **kwargs)
+
+    return wrapper
+
+
+class ProfiledCommand(rclick.RichCommand):
+    """
+    A `RichCommand` whose callback is timed as the `command` stage of `--profile`.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        if self.callback is not None:
+            self.callback = profiled(self.callback)
+
+
+class ForwardingCommand(ConnectedProviderCommand):
+    """
+    A `ConnectedProviderCommand` that first tries to hand the request to a running `ape_utils serve` worker.
+
+    Resolving the network and connecting the provider is what makes a cold `call` or `read` slow, so
+    the arguments are pre-parsed with the network option kept as a plain string. If `to_request` builds
+    a request and the worker answers it, `render` prints the response and the command exits without
+    ever loading the network. Otherwise the command runs as usual. With `--fork-state`, the request
+    is answered by a `LocalFork` of the state file instead, again without loading the network.
+
+    With a `fan_out` handler, `--network` may also be given several times or as comma separated
+    choices, and the pre-parsed arguments are handed to `fan_out` instead of connecting one provider.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        self.to_request: Callable[[dict], Optional[dict]] = kwargs.pop("to_request")
+        self.render: Callable[[dict, dict], int] = kwargs.pop("render")
+        self.fan_out: Optional[Callable[[dict], int]] = kwargs.pop("fan_out", None)
+        super().__init__(*args, **kwargs)
+        if self.callback is not None:
+            self.callback = profiled(self.callback, lap="connect")
+
+    def parse_args(self, ctx: click.Context, args: list[str]) -> list[str]:
+        if not set(args) & set(ctx.help_option_names):
+            params = self._pre_parse(args)
+            if params is not None and params.get("fork_state") is not None and not params["capture"]:
+                with PROFILER.stage("command"):
+                    ctx.exit(self.render(answer_from_fork(self.to_request(params), params), params))
+            if params is not None and self.fan_out is not None and len(params["networks"]) > 1:
+                with PROFILER.stage("command"):
+                    ctx.exit(self.fan_out(params))
+            if params is not None and DEFAULT_SOCKET_PATH.exists():
+                request = self.to_request(params)
+                with PROFILER.stage("forward"):
+                    response = None if request is None else forward(request, DEFAULT_SOCKET_PATH)
+                if response is not None:
+                    ctx.exit(self.render(response, params))
+        # * Resolving the `--network` choice loads the network stack and the plugins
+        with PROFILER.stage("network"):
+            return super().parse_args(ctx, args)
+
+    def invoke(self, ctx: click.Context) -> Any:
+        PROFILER.mark()
+        return super().invoke(ctx)
+
+    def _pre_parse(self, args: list[str]) -> Optional[dict]:
+        params: list[click.Parameter] = []
+        default_network = None
+        for param in self.params:
+            if param.name == "network":
+                default_network = param.default
+                params.append(click.Option(param.opts, multiple=True))
+            elif isinstance(getattr(param, "type", None), click.File):
+                # * Kept as strings: no network resolution and no file opened before forwarding
+                params.append(click.Option(param.opts, default=param.default))
+            else:
+                params.append(param)
+        try:
+            with click.Command(self.name, params=params).make_context(self.name, list(args)) as shadow:
+                parsed = dict(shadow.params)
+        except click.ClickException:
+            return None
+        parsed["networks"] = [choice for value in parsed["network"] for choice in value.split(",") if choice]
+        parsed["network"] = parsed["networks"][-1] if parsed["networks"] else default_network
+        return parsed
+
+
+def network_chain_id(choice: str) -> Optional[int]:
+    """
+    Returns the chain id of a `--network` choice without connecting to it, or `None` if it is only known once connected.
+    """
+    import ape  # noqa: PLC0415
+    from ape.exceptions import ProviderNotConnectedError  # noqa: PLC0415
+
+    try:
+        provider = ape.networks.get_provider_from_choice(choice)
+    except Exception as e:
+        raise click.BadParameter(str(e), param_hint="--network")  # noqa: B904
+    try:
+        return int(provider.network.chain_id)
+    except ProviderNotConnectedError:
+        # * Local networks, e.g. a development node, report the chain id of whatever they are connected to
+        return None
+
+
+def answer_from_fork(request: Optional[dict], params: dict) -> dict:
+    """
+    Answers a `call` or `read` request from the local fork of the `--fork-state` file, like a worker would.
+
+    A `--network` given explicitly must be the chain the state was captured on.
+    """
+    if request is None:
+        msg = "--fork-state answers a single call, or a read of --slot and --slots."
+        raise click.UsageError(msg)
+    if len(params["networks"]) > 1:
+        msg = "--fork-state answers for the chain of its state, not for several --network values."
+        raise click.UsageError(msg)
+    from ape_utils.fork import LocalFork  # noqa: PLC0415
+
+    try:
+        fork = LocalFork.open(params["fork_state"])
+    except (OSError, ValueError, KeyError) as e:
+        msg = f"Cannot load the fork state: {e}"
+        raise click.BadParameter(msg, param_hint="--fork-state")  # noqa: B904
+    if params["networks"]:
+        request = {**request, "chain_id": network_chain_id(params["network"])}
+    return from_typed_response(fork.handle({**request, "typed": True}))
+
+
+def capture_block(path: str, provider: "Node", block: Optional[int]) -> int:
+    """
+    Returns the block a `--capture` runs at: `--block`, else the block of the existing state file, else the latest.
+
+    The command runs at that block too, so the output it prints is the one the state reproduces.
+    """
+    from ape_utils.fork import ForkState  # noqa: PLC0415
+
+    if Path(path).exists():
+        state_block = ForkState.load(path).block
+        if block is not None and block != state_block:
+            msg = f"The fork state is at block {state_block}, not {block}."
+            raise click.BadParameter(msg, param_hint="--block")
+        return state_block
+    if block is not None:
+        return block
+    from ape_utils.logs import latest_block  # noqa: PLC0415
+
+    return latest_block(provider)
+
+
+def capture_into(path: str, capture: Callable[[Optional["ForkState"]], "ForkState"]) -> None:
+    """
+    Adds the state captured by `capture` to the fork state file at `path`, creating the file if it is missing.
+    """
+    from ape_utils.fork import ForkState  # noqa: PLC0415
+
+    state = ForkState.load(path) if Path(path).exists() else None
+    capture(state).save(path)
+
+
+def forward_or_run(request: dict, run: Callable[[], Any]) -> Any:
+    """
+    Returns the result of `request` from a running `ape_utils serve` worker, or of `run()` if none is running.
+    """
+    response = forward(request, DEFAULT_SOCKET_PATH)
+    if response is None:
+        return run()
+    if not response["ok"]:
+        raise RuntimeError(response["error"])
+    return response["result"]
+
+
+def print_forwarded_error(response: dict, raw: bool, output_format: Optional[str] = None) -> int:  # noqa: FBT001
+    """
+    Prints the error of a forwarded request like the commands print their own errors, returning the exit code.
+    """
+    report_error(RuntimeError(response["error"]), raw, output_format)
+    return 1
+
+
+def read_batch_file(batch: TextIO) -> list[tuple[str, str, list[Any]]]:
+    """
+    Reads `(address, function_sig, args)` tuples, one Python literal per line, skipping blank and `#` lines.
+    """
+    calls = []
+    for line_number, line in enumerate(batch, start=1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        try:
+            address, function_sig, args = ast.literal_eval(line)
+        except Exception:
+            msg = f"Line {line_number}: expected (address, function_sig, args), got {line!r}"
+            raise click.BadParameter(msg, param_hint="--batch")  # noqa: B904
+        calls.append((address, function_sig, list(args)))
+    return calls
+
+
+async def call_concurrently(
+    calls: list[tuple[str, str, list[Any]]], provider: "Node", concurrency: int, block: Optional[int] = None
+) -> list[tuple[bool, Any]]:
+    """
+    Runs `async_call_many` and releases the async clients before the event loop closes.
+    """
+    from ape_utils.clients import aclose_clients, get_retry_policy  # noqa: PLC0415
+    from ape_utils.utils import async_call_many  # noqa: PLC0415
+
+    policy = get_retry_policy()
+    try:
+        return await async_call_many(
+            calls, provider, concurrency, block_identifier=block, retries=policy.retries, backoff=policy.backoff
+        )
+    finally:
+        await aclose_clients()
+
+
+def block_options(command: Callable) -> Callable:
+    """
+    Adds the `--block` and `--no-cache` options used to pin reads to a block.
+    """
+    command = click.option(
+        "--no-cache",
+        is_flag=True,
+        help="Do not read or write the on-disk cache of block-pinned results.",
+    )(command)
+    return click.option(
+        "--block",
+        type=click.IntRange(min=0),
+        help="Block number to read at. Results at a fixed block are cached on disk.",
+    )(command)
+
+
+def fork_options(command: Callable) -> Callable:
+    """
+    Adds the `--fork-state` and `--capture` options running reads on a local fork of a captured state.
+    """
+    command = click.option(
+        "--capture",
+        is_flag=True,
+        help="Run on the network, then add the accounts and storage it read to the --fork-state file.",
+    )(command)
+    return click.option(
+        "--fork-state",
+        type=click.Path(dir_okay=False),
+        help="State file of a local fork to answer from without any network, see --capture.",
+    )(command)
+
+
+def open_result_cache(block: Optional[int], no_cache: bool) -> Optional["ResultCache"]:  # noqa: FBT001
+    """
+    Opens the default on-disk result cache, unless reads are not block-pinned or `--no-cache` is set.
+
+    The cache is closed when the command finishes.
+    """
+    if block is None or no_cache:
+        return None
+    from ape_utils.result_cache import ResultCache  # noqa: PLC0415
+
+    cache = ResultCache()
+    click.get_current_context().call_on_close(cache.close)
+    return cache
+
+
+def stream_decode(
+    signature: Optional[str],
+    source: TextIO,
+    output: TextIO,
+    output_format: Optional[str],
+    *,
+    with_selector: bool,
+    decoder: Optional[SelectorDecoder] = None,
+    abi_file: Optional[str] = None,
+    workers: Optional[int] = None,
+    shard_dir: Optional[str] = None,
+) -> None:
+    """
+    Decodes every calldata line of `source` and writes the rows to `output` as NDJSON, JSON or CSV.
+
+    With a `decoder`, each calldata is dispatched on its selector instead of using `signature`.
+    With `workers` or a `shard_dir`, the file is decoded by a pool of processes, see `parallel_decode`.
+    """
+    if workers is not None or shard_dir is not None:
+        if not Path(source.name).is_file():
+            msg = "--workers and --shard-dir need --input to be a file, not a stream."
+            raise click.UsageError(msg)
+        from ape_utils.parallel import parallel_decode  # noqa: PLC0415
+
+        with nullcontext() if shard_dir is not None else buffered(output) as stream:
+            parallel_decode(
+                source.name,
+                None if abi_file is not None else signature,
+                abi_file,
+                with_selector=with_selector,
+                output=stream,
+                output_format=output_format or "ndjson",
+                shard_dir=shard_dir,
+                workers=workers,
+            )
+        return
+    calldata = iter_calldata(source)
+    if decoder is not None:
+        rows = decoder.decode_stream(calldata)
+        columns = ["selector", "function", "args"]
+    else:
+        rows = decode_stream(signature, calldata, with_selector=with_selector)  # type: ignore[arg-type]
+        columns = input_columns(signature)  # type: ignore[arg-type]
+    with buffered(output) as stream:
+        if output_format == "csv":
+            write_csv(rows, stream, columns)
+        elif output_format == "json":
+            write_json(rows, stream)
+        else:
+            write_ndjson(rows, stream)
+
+
+def stream_options(command: Callable) -> Callable:
+    """
+    Adds the `--input`, `--output`, `--format`, `--workers` and `--shard-dir` options used to decode calldata in bulk.
+    """
+    command = click.option(
+        "--shard-dir",
+        type=click.Path(file_okay=False),
+        help="Write the rows of every chunk of the --input file to its own file in this directory instead of --output.",
+    )(command)
+    command = click.option(
+        "--workers",
+        "-w",
+        type=click.IntRange(min=1),
+        help="Decode the --input file in this many processes, each taking a byte range of it. Defaults to one process.",
+    )(command)
+    command = click.option(
+        "--output",
+        "-o",
+        type=click.File("w"),
+        default="-",
+        help="Where to write the decoded rows with --input. Defaults to stdout.",
+    )(command)
+    command = click.option(
+        "--format",
+        "output_format",
+        type=click.Choice(["json", "ndjson", "csv"]),
+        help="Write machine-readable output without any terminal rendering. Defaults to ndjson with --input.",
+    )(command)
+    return click.option(
+        "--input",
+        "-i",
+        "source",
+        type=click.File("r"),
+        help="File with one hex calldata per line to decode in bulk. Use - for stdin.",
+    )(command)
+
+
+def sweep_from_cli(  # noqa: PLR0917
+    function_sig: str,
+    address: str,
+    args: list[Any],
+    provider: "Node",
+    blocks: list[int],
+    workers: Optional[int],
+    checkpoint: Optional[str],
+    no_cache: bool,  # noqa: FBT001
+    raw: bool,  # noqa: FBT001
+    output_format: Optional[str] = None,
+) -> None:
+    """
+    Runs a multi-block sweep and prints every `(block, output)` row as soon as it completes.
+    """
+    from ape_utils.result_cache import ResultCache  # noqa: PLC0415
+    from ape_utils.sweep import open_checkpoint, read_checkpoint, sweep_call, write_checkpoint  # noqa: PLC0415
+
+    if checkpoint is not None:
+        done = read_checkpoint(checkpoint)
+        blocks = [block for block in blocks if block not in done]
+    rows = sweep_call(
+        function_sig,
+        address,
+        args,
+        provider,
+        blocks,
+        workers=workers or DEFAULT_SWEEP_WORKERS,
+        cache=None if no_cache else ResultCache(),
+    )
+    with open_checkpoint(checkpoint) if checkpoint is not None else nullcontext() as file:
+        if file is not None:
+            rows = write_checkpoint(rows, file)
+        if output_format is not None:
+            records = ({"block": block, "success": success, "output": output} for block, success, output in rows)
+            write_output(records, output_format, ["block", "success", "output"], "output")
+            return
+        for block, success, output in rows:
+            if raw:
+                click.echo(f"{block}\t{success}\t{output}")
+            elif success:
+                get_console().print(f"[blue bold]{block}: [green]{output}")
+            else:
+                get_console().print(f"[blue bold]{block}: [red]call failed: {output}")
+
+
+def parse_slots(spec: str) -> list[int]:
+    """
+    Parses comma separated storage slots and inclusive `start-end` ranges, decimal or `0x` hex.
+    """
+    slots: list[int] = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            if "-" in part:
+                start, end = (int(bound, 0) for bound in part.split("-", 1))
+                slots.extend(range(start, end + 1))
+            else:
+                slots.append(int(part, 0))
+        except ValueError:
+            msg = f"Invalid storage slot or range: {part!r}"
+            raise click.BadParameter(msg)  # noqa: B904
+    return slots
+
+
+def profile_tables(report: dict) -> list["Table"]:
+    """
+    Renders a `Profiler.report` as tables of the stages, the RPC counters and the caches.
+    """
+    from rich.table import Table  # noqa: PLC0415
+
+    stages = Table("Stage", "Count", "Seconds", title="Profile")
+    for name, stage in report["stages"].items():
+        stages.add_row(name, str(stage["count"]), f"{stage['seconds']:.4f}")
+    counters = Table("Counter", "Value")
+    for name, value in report["counters"].items():
+        counters.add_row(name, str(value))
+    caches = Table("Cache", "Hits", "Misses", "Hit rate")
+    for name, stats in report["caches"].items():
+        caches.add_row(name, str(stats["hits"]), str(stats["misses"]), f"{stats['hit_rate']:.1%}")
+    return [stages, counters, caches]
+
+
+def print_profile(show: bool, output: Optional[TextIO], profile_format: str) -> None:  # noqa: FBT001
+    """
+    Prints the profile of the run to stderr if `show`, and exports it to `output` if given.
+    """
+    from ape_utils.abi import abi_cache_info  # noqa: PLC0415
+
+    caches = abi_cache_info()
+    if show:
+        for table in profile_tables(PROFILER.report(caches)):
+            get_console(stderr=True).print(table)
+    if output is not None:
+        output.write(PROFILER.to_json(caches) if profile_format == "json" else PROFILER.to_openmetrics(caches))
+        output.flush()
+
+
 @click.group(cls=rclick.RichGroup)
 @click.version_option(version=version, prog_name="ape_utils")
-def cli() -> None:
+@click.option(
+    "--profile", is_flag=True, help="Print per-stage timings, RPC counters and cache hit rates to stderr at exit."
+)
+@click.option("--profile-output", type=click.File("w"), help="Export the profile to this file, '-' for stdout.")
+@click.option(
+    "--profile-format",
+    type=click.Choice(["json", "openmetrics"]),
+    default="json",
+    show_default=True,
+    help="The format of --profile-output.",
+)
+@click.option(
+    "--rpc-retries",
+    type=click.IntRange(min=0),
+    default=DEFAULT_RETRIES,
+    show_default=True,
+    help="Times a request failing with a timeout, connection error or rate limit is sent again to the same node.",
+)
+@click.option(
+    "--rpc-rate",
+    type=click.FloatRange(min=0, min_open=True),
+    help="Maximum requests per second sent to each node. Without it nodes are only slowed down once they throttle.",
+)
+@click.option(
+    "--fallback-uri",
+    multiple=True,
+    help="HTTP URI of a node taking over when the node of --network keeps failing. Repeat to try several in order.",
+)
+@click.pass_context
+def cli(  # noqa: PLR0917
+    ctx: click.Context,
+    profile: bool,  # noqa: FBT001
+    profile_output: Optional[TextIO],
+    profile_format: str,
+    rpc_retries: int,
+    rpc_rate: Optional[float],
+    fallback_uri: tuple[str, ...],
+) -> None:
     """
     Ape Utils CLI tool for calling view functions on Ethereum smart contracts.
     """
-    pass
+    if profile or profile_output is not None:
+        PROFILER.enable()
+        PROFILER.lap("startup")
+        ctx.call_on_close(lambda: print_profile(profile, profile_output, profile_format))
+    if rpc_retries != DEFAULT_RETRIES or rpc_rate is not None or fallback_uri:
+        from ape_utils.clients import configure_clients  # noqa: PLC0415
 
+        configure_clients(retries=rpc_retries, rate_limit=rpc_rate, fallback_uris=fallback_uri)
 
-@click.command(cls=ConnectedProviderCommand)
+
+def call_request(params: dict) -> Optional[dict]:
+    """
+    Builds the worker request of a single `call`, or `None` for batches and `--capture`, which run locally.
+    """
+    if (
+        params["batch"] is not None
+        or params["from_block"] is not None
+        or params["capture"]
+        or any(params[name] is None for name in ("function_sig", "address", "args"))
+    ):
+        return None
+    return {
+        "op": "call",
+        "function_sig": params["function_sig"],
+        "address": params["address"],
+        "args": list(params["args"]),
+        "block": params["block"],
+        "cache": not params["no_cache"],
+        "raw_output": params["raw_output"],
+        "network": params["network"],
+    }
+
+
+def print_call_output(output: Any, raw: bool, output_format: Optional[str]) -> None:  # noqa: FBT001
+    """
+    Prints the output of a single `call`.
+    """
+    if output_format is not None:
+        write_output([output], output_format, ["output"], single=True)
+    elif raw:
+        echo_raw(output)
+    else:
+        get_console().print(f"[blue bold]Output: [green]{output}")
+
+
+def print_calldata(calldata: Any, raw: bool, output_format: Optional[str]) -> None:  # noqa: FBT001
+    """
+    Prints encoded calldata as a `0x` prefixed hex string.
+    """
+    if output_format is not None:
+        write_output([to_hex(calldata)], output_format, ["calldata"], single=True)
+    elif raw:
+        echo_raw(to_hex(calldata))
+    else:
+        get_console().print(f"[blue bold]Encoded Calldata: [green]{to_hex(calldata)}", soft_wrap=True)
+
+
+def print_decoded(decoded: Any, raw: bool, output_format: Optional[str], columns: list[str]) -> None:  # noqa: FBT001
+    """
+    Prints decoded calldata, with `columns` as the CSV header.
+    """
+    if output_format is not None:
+        write_output([decoded], output_format, columns, single=True)
+    elif raw:
+        echo_raw(decoded)
+    else:
+        from rich.pretty import pprint  # noqa: PLC0415
+
+        console = get_console()
+        console.print("[blue bold]Decoded Data: ", end="")
+        pprint(decoded, console=console)
+
+
+def render_call(response: dict, params: dict) -> int:
+    """
+    Prints the output of a forwarded `call` like the command does.
+    """
+    if not response["ok"]:
+        return print_forwarded_error(response, params["raw"], params["output_format"])
+    print_call_output(response["result"], params["raw"], params["output_format"])
+    return 0
+
+
+def call_on_networks_from_cli(params: dict) -> int:
+    """
+    Runs a single call on every `--network` concurrently and prints the merged results, returning the exit code.
+    """
+    from ape_utils.clients import aclose_clients, get_retry_policy  # noqa: PLC0415
+    from ape_utils.utils import acall_on_networks  # noqa: PLC0415
+
+    if params["batch"] is not None or params["from_block"] is not None or params["raw_output"]:
+        msg = "Several --network values cannot be combined with --batch, a sweep or --raw-output."
+        raise click.UsageError(msg)
+    if any(params[name] is None for name in ("function_sig", "address", "args")):
+        msg = "--function-sig, --address and --args are required with several --network values."
+        raise click.UsageError(msg)
+
+    async def run() -> dict[str, tuple[bool, Any]]:
+        try:
+            return await acall_on_networks(
+                params["function_sig"],
+                params["address"],
+                list(params["args"]),
+                params["networks"],
+                timeout=params["network_timeout"],
+                retries=get_retry_policy().retries,
+                backoff=get_retry_policy().backoff,
+                block_identifier=params["block"],
+            )
+        finally:
+            await aclose_clients()
+
+    results = asyncio.run(run())
+    if params["output_format"] is not None:
+        records = (
+            {"network": choice, "success": success, "output": output} for choice, (success, output) in results.items()
+        )
+        write_output(records, params["output_format"], ["network", "success", "output"], "output")
+    elif params["raw"]:
+        merged = {
+            choice: {"success": success, "output": to_json_value(output)}
+            for choice, (success, output) in results.items()
+        }
+        click.echo(json.dumps(merged))
+    else:
+        from rich.table import Table  # noqa: PLC0415
+
+        table = Table("Network", "Output")
+        for choice, (success, output) in results.items():
+            table.add_row(f"[blue bold]{choice}", f"[green]{output}" if success else f"[red]{output}")
+        get_console().print(table)
+    return 0 if any(success for success, _ in results.values()) else 1
+
+
+@click.command(cls=ForwardingCommand, to_request=call_request, render=render_call, fan_out=call_on_networks_from_cli)
 @click.option(
     "--function-sig",
     "-s",
-    required=True,
     help="The function signature (e.g., function_name(input param type)(output param type)).",
 )
-@click.option("--address", "-a", required=True, help="The address of the smart contract.")
-@click.option("--args", "-ag", required=True, help="The arguments for the function call.", cls=PythonLiteralOption)
+@click.option("--address", "-a", help="The address of the smart contract.")
+@click.option("--args", "-ag", help="The arguments for the function call.", cls=PythonLiteralOption)
+@click.option(
+    "--batch",
+    "-b",
+    type=click.File("r"),
+    help="File with one (address, function_sig, args) tuple per line, called through Multicall. Use - for stdin.",
+)
+@click.option(
+    "--batch-calldata-limit",
+    type=int,
+    default=DEFAULT_BATCH_CALLDATA_LIMIT,
+    show_default=True,
+    help="Maximum calldata bytes per Multicall aggregate call.",
+)
+@click.option(
+    "--batch-gas-limit",
+    type=int,
+    default=DEFAULT_BATCH_GAS_LIMIT,
+    show_default=True,
+    help="Gas limit for each Multicall aggregate call.",
+)
+@click.option(
+    "--concurrency",
+    "-c",
+    type=click.IntRange(min=1),
+    help="Run the --batch calls as concurrent eth_calls, at most N in flight, instead of Multicall. "
+    "With --from-block, the number of JSON-RPC batches in flight.",
+)
+@click.option(
+    "--from-block", type=click.IntRange(min=0), help="First block of a sweep calling the function at many blocks."
+)
+@click.option("--to-block", type=click.IntRange(min=0), help="Last block of the sweep, included.")
+@click.option("--step", type=click.IntRange(min=1), default=1, show_default=True, help="Blocks between sweep calls.")
+@click.option(
+    "--checkpoint",
+    type=click.Path(dir_okay=False),
+    help="File recording finished sweep blocks as JSON lines. Rerunning the sweep skips them.",
+)
+@block_options
+@fork_options
 @click.option("--raw", "-r", is_flag=True, help="Print raw data without colorful output or additional text.")
+@click.option(
+    "--raw-output",
+    is_flag=True,
+    help="Print the return data as undecoded 0x hex instead of decoding it with the output types.",
+)
+@format_option()
+@click.option(
+    "--network-timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    default=DEFAULT_CALL_TIMEOUT,
+    show_default=True,
+    help="Deadline in seconds for each network when --network is given several times.",
+)
 @network_option(default="ethereum:local:node", required=True)
-def call_view_function_from_cli(function_sig: str, address: str, args: str, provider: Node, raw: bool) -> None:  # noqa: FBT001
+def call_view_function_from_cli(  # noqa: PLR0917
+    function_sig: Optional[str],
+    address: Optional[str],
+    args: Any,
+    batch: Optional[TextIO],
+    batch_calldata_limit: int,
+    batch_gas_limit: int,
+    concurrency: Optional[int],
+    from_block: Optional[int],
+    to_block: Optional[int],
+    step: int,
+    checkpoint: Optional[str],
+    block: Optional[int],
+    no_cache: bool,  # noqa: FBT001
+    fork_state: Optional[str],
+    capture: bool,  # noqa: FBT001
+    provider: "Node",
+    raw: bool,  # noqa: FBT001
+    raw_output: bool,  # noqa: FBT001
+    output_format: Optional[str],
+    network_timeout: float,  # noqa: ARG001
+) -> None:
     """
     Calls a view function on the blockchain given a function signature and address.
-    Using ape's native network parsing.
+    Using ape's native network parsing. Pass --network several times to run the call on every network.
     """
+    from ape_utils.utils import call_view_function, call_view_functions  # noqa: PLC0415
+
+    if batch is None and (function_sig is None or address is None or args is None):
+        msg = "Either --function-sig, --address and --args or --batch are required."
+        raise click.UsageError(msg)
+    sweep = from_block is not None or to_block is not None
+    if sweep and (from_block is None or to_block is None or batch is not None or block is not None):
+        msg = "A sweep needs both --from-block and --to-block, and cannot be combined with --batch or --block."
+        raise click.UsageError(msg)
+    if sweep and from_block > to_block:  # type: ignore[operator]
+        msg = "--from-block must not be after --to-block."
+        raise click.UsageError(msg)
+    if raw_output and (sweep or batch is not None):
+        msg = "--raw-output only applies to a single call, not to --batch or a sweep."
+        raise click.UsageError(msg)
+    if capture and (fork_state is None or sweep or batch is not None):
+        msg = "--capture needs --fork-state and a single call, not --batch or a sweep."
+        raise click.UsageError(msg)
+    if capture:
+        block = capture_block(fork_state, provider, block)  # type: ignore[arg-type]
     try:
+        if sweep:
+            from ape_utils.sweep import block_range  # noqa: PLC0415
+
+            blocks = block_range(from_block, to_block, step)  # type: ignore[arg-type]
+            sweep_from_cli(
+                function_sig,  # type: ignore[arg-type]
+                address,  # type: ignore[arg-type]
+                list(args),
+                provider,
+                blocks,
+                concurrency,
+                checkpoint,
+                no_cache,
+                raw,
+                output_format,
+            )
+            return
+        if batch is not None:
+            calls = read_batch_file(batch)
+            if concurrency is not None:
+                results = asyncio.run(call_concurrently(calls, provider, concurrency, block))
+            else:
+                results = call_view_functions(calls, provider, batch_calldata_limit, batch_gas_limit, block)
+            if output_format is not None:
+                records = (
+                    {"index": index, "success": success, "output": output}
+                    for index, (success, output) in enumerate(results)
+                )
+                write_output(records, output_format, ["index", "success", "output"], "output")
+                return
+            for index, (success, output) in enumerate(results):
+                if raw:
+                    click.echo(f"{success}\t{output}")
+                elif success:
+                    get_console().print(f"[blue bold]{index}: [green]{output}")
+                else:
+                    get_console().print(f"[blue bold]{index}: [red]call failed")
+            return
+
         parsed_args = list(args)
-        output = call_view_function(function_sig, address, parsed_args, provider)
-        if raw:
-            console.print(output)
-        else:
-            console.print(f"[blue bold]Output: [green]{output}")
+        output = call_view_function(
+            function_sig,  # type: ignore[arg-type]
+            address,  # type: ignore[arg-type]
+            parsed_args,
+            provider,
+            block_identifier=block,
+            cache=open_result_cache(block, no_cache),
+            raw_output=raw_output,
+        )
+        print_call_output(to_hex(output) if raw_output else output, raw, output_format)
+        if capture:
+            from ape_utils.fork import capture_call  # noqa: PLC0415
+
+            capture_into(
+                fork_state,  # type: ignore[arg-type]
+                lambda state: capture_call(provider, function_sig, address, parsed_args, block, state),  # type: ignore[arg-type]
+            )
+    except click.ClickException:
+        raise
     except Exception as e:
+        report_error(e, raw, output_format)
+        raise e
+
+
+def read_request(params: dict) -> Optional[dict]:
+    """
+    Builds the worker request of a `read` of `--slot` or `--slots`, or `None` for files, `--diff` and `--capture`.
+    """
+    if params["slot_file"] is not None or params["mappings"] or params["diff"] or params["capture"]:
+        return None
+    if params["slot"] is None and params["slots"] is None:
+        return None
+    try:
+        slots = ([] if params["slot"] is None else [params["slot"]]) + parse_slots(params["slots"] or "")
+    except click.BadParameter:
+        return None
+    return {
+        "op": "read",
+        "address": params["address"],
+        "slots": slots,
+        "block": params["block"],
+        "cache": not params["no_cache"],
+        "network": params["network"],
+    }
+
+
+def print_storage_value(value: Any, raw: bool, output_format: Optional[str]) -> None:  # noqa: FBT001
+    """
+    Prints the value of a single storage slot.
+    """
+    if output_format is not None:
+        write_output([to_hex(value)], output_format, ["value"], single=True)
+    elif raw:
+        echo_raw(value)
+    else:
+        get_console().print(f"[blue bold]Storage Data: [green]{value}")
+
+
+def print_storage_values(slots: list[int], values: list[Any], raw: bool, output_format: Optional[str]) -> None:  # noqa: FBT001
+    """
+    Prints the values of many storage slots, one row per slot.
+    """
+    if output_format is not None:
+        records = ({"slot": slot, "value": to_hex(value)} for slot, value in zip(slots, values))
+        write_output(records, output_format, ["slot", "value"], "value")
+        return
+    for slot, value in zip(slots, values):
         if raw:
-            console.print(e)
+            click.echo(f"{slot}\t{value.hex()}")
         else:
-            console.print(f"Error: [red]{e!s}")
-        raise e
+            get_console().print(f"[blue bold]{slot}: [green]{value.hex()}")
 
 
-@click.command(cls=ConnectedProviderCommand)
+def render_read(response: dict, params: dict) -> int:
+    """
+    Prints the values of a forwarded `read` like the command does.
+    """
+    if not response["ok"]:
+        return print_forwarded_error(response, params["raw"], params["output_format"])
+    values = response["result"]
+    if params["slots"] is None:
+        print_storage_value(values[0], params["raw"], params["output_format"])
+        return 0
+    slots = ([] if params["slot"] is None else [params["slot"]]) + parse_slots(params["slots"])
+    print_storage_values(slots, values, params["raw"], params["output_format"])
+    return 0
+
+
+def capture_slots(path: str, provider: "Node", address: str, slots: list[int], block: Optional[int]) -> None:
+    """
+    Adds storage slots of `address` to the fork state file at `path`.
+    """
+    from ape_utils.fork import capture_storage  # noqa: PLC0415
+
+    capture_into(path, lambda state: capture_storage(provider, address, slots, block, state))
+
+
+def read_slot_file(slot_file: TextIO) -> list[int]:
+    """
+    Parses a file of storage slots or ranges, one per line, skipping blank lines and `#` comments.
+    """
+    slots = []
+    for line in slot_file:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            slots.extend(parse_slots(line))
+    return slots
+
+
+def read_mapping_keys(keys_file: TextIO, key_type: str) -> list[Any]:
+    """
+    Returns the mapping keys of a file, one per line, parsed as `key_type` and skipping blank lines and `#` comments.
+
+    Raises:
+        click.BadParameter: If a line is not a valid key of that type, naming the line.
+    """
+    from ape_utils.storage import parse_mapping_key  # noqa: PLC0415
+
+    keys = []
+    for number, line in enumerate(keys_file, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        try:
+            keys.append(parse_mapping_key(line, key_type))
+        except ValueError as e:
+            msg = f"Bad {key_type} key on line {number} of {keys_file.name}: {e}"
+            raise click.BadParameter(msg, param_hint="--mapping") from e
+    return keys
+
+
+def print_storage_diff(changes: Iterable[tuple[int, bytes, bytes]], raw: bool, output_format: Optional[str]) -> None:  # noqa: FBT001
+    """
+    Prints the changed slots of a storage diff, one row per slot with its old and new value.
+    """
+    if output_format is not None:
+        records = ({"slot": slot, "before": to_hex(old), "after": to_hex(new)} for slot, old, new in changes)
+        write_output(records, output_format, ["slot", "before", "after"], "after")
+        return
+    if raw:
+        for slot, old, new in changes:
+            click.echo(f"{slot}\t{old.hex()}\t{new.hex()}")
+        return
+    from rich.table import Table  # noqa: PLC0415
+
+    table = Table("Slot", "Before", "After")
+    for slot, old, new in changes:
+        table.add_row(f"[blue bold]{hex(slot)}", f"[red]{old.hex()}", f"[green]{new.hex()}")
+    get_console().print(table)
+
+
+@click.command(cls=ForwardingCommand, to_request=read_request, render=render_read)
 @click.option("--address", "-a", required=True, help="The address of the smart contract.")
-@click.option("--slot", required=True, type=int, help="The storage slot to read from the contract.")
+@click.option("--slot", type=int, help="The storage slot to read from the contract.")
+@click.option("--slots", help="Storage slots to read in bulk, e.g. 0-255,300,0x10. Ranges are inclusive.")
+@click.option(
+    "--slot-file",
+    type=click.File("r"),
+    help="File with storage slots or ranges to read in bulk, one per line. Use - for stdin.",
+)
+@click.option(
+    "--mapping",
+    "mappings",
+    nargs=2,
+    type=(click.IntRange(min=0), click.File("r")),
+    multiple=True,
+    help="Declaration slot of a mapping and a file of its keys, one per line. Reads the value of every key.",
+)
+@click.option(
+    "--key-type",
+    default="address",
+    show_default=True,
+    help="Solidity type of the --mapping keys, e.g. address, uint256 or bytes32.",
+)
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    default=DEFAULT_RPC_BATCH_SIZE,
+    show_default=True,
+    help="Maximum eth_getStorageAt requests per JSON-RPC batch payload.",
+)
+@block_options
+@fork_options
+@click.option("--diff", is_flag=True, help="Print only the slots whose value changed from --from-block to --to-block.")
+@click.option("--from-block", type=click.IntRange(min=0), help="Block of the old values of --diff.")
+@click.option("--to-block", type=click.IntRange(min=0), help="Block of the new values of --diff.")
 @click.option("--raw", "-r", is_flag=True, help="Print raw data without colorful output or additional text.")
+@format_option()
 @network_option(default="ethereum:local:node", required=True)
-def read_storage_from_cli(address: str, slot: int, provider: Node, raw: bool) -> None:  # noqa: ARG001, FBT001
+def read_storage_from_cli(  # noqa: PLR0917
+    address: str,
+    slot: Optional[int],
+    slots: Optional[str],
+    slot_file: Optional[TextIO],
+    mappings: tuple[tuple[int, TextIO], ...],
+    key_type: str,
+    batch_size: int,
+    block: Optional[int],
+    no_cache: bool,  # noqa: FBT001
+    fork_state: Optional[str],
+    capture: bool,  # noqa: FBT001
+    diff: bool,  # noqa: FBT001
+    from_block: Optional[int],
+    to_block: Optional[int],
+    provider: "Node",
+    raw: bool,  # noqa: FBT001
+    output_format: Optional[str],
+) -> None:
     """
     Reads storage from a given address and storage slot on the blockchain.
+    With --diff, prints the slots that changed between two blocks.
     """
+    from ape_utils.utils import read_storage, read_storage_many  # noqa: PLC0415
+
+    if slot is None and slots is None and slot_file is None and not mappings:
+        msg = "One of --slot, --slots, --slot-file or --mapping is required."
+        raise click.UsageError(msg)
+    if diff != (from_block is not None and to_block is not None) or (diff and block is not None):
+        msg = "--diff, --from-block and --to-block go together, and cannot be combined with --block."
+        raise click.UsageError(msg)
+    if capture and (fork_state is None or diff):
+        msg = "--capture needs --fork-state, and cannot be combined with --diff."
+        raise click.UsageError(msg)
+    if capture:
+        block = capture_block(fork_state, provider, block)  # type: ignore[arg-type]
     try:
-        data = read_storage(address, slot)
-        if raw:
-            console.print(data)
-        else:
-            console.print(f"[blue bold]Storage Data: [green]{data}")
+        if not diff and slot is not None and slots is None and slot_file is None and not mappings:
+            data = read_storage(address, slot, block_identifier=block, cache=open_result_cache(block, no_cache))
+            print_storage_value(data, raw, output_format)
+            if capture:
+                capture_slots(fork_state, provider, address, [slot], block)  # type: ignore[arg-type]
+            return
+
+        requested = [] if slot is None else [slot]
+        if slots is not None:
+            requested.extend(parse_slots(slots))
+        if slot_file is not None:
+            requested.extend(read_slot_file(slot_file))
+        if diff:
+            from ape_utils.snapshot import DEFAULT_SNAPSHOT_DIR, diff_storage, slot_set  # noqa: PLC0415
+
+            selected = slot_set(
+                requested, ((mapping, read_mapping_keys(keys, key_type)) for mapping, keys in mappings), key_type
+            )
+            changes = diff_storage(
+                address,
+                selected,
+                from_block,  # type: ignore[arg-type]
+                to_block,  # type: ignore[arg-type]
+                batch_size=batch_size,
+                directory=None if no_cache else DEFAULT_SNAPSHOT_DIR,
+            )
+            print_storage_diff(changes, raw, output_format)
+            return
+
+        if mappings:
+            from ape_utils.storage import mapping_slots  # noqa: PLC0415
+
+            for mapping, keys in mappings:
+                requested.extend(mapping_slots(read_mapping_keys(keys, key_type), mapping, key_type))
+        cache = open_result_cache(block, no_cache)
+        values = read_storage_many(address, requested, batch_size, "latest" if block is None else block, cache)
+        print_storage_values(requested, values, raw, output_format)
+        if capture:
+            capture_slots(fork_state, provider, address, requested, block)  # type: ignore[arg-type]
+    except click.ClickException:
+        raise
     except Exception as e:
-        if raw:
-            console.print(e)
-        else:
-            console.print(f"Error: [red]{e!s}")
+        report_error(e, raw, output_format)
         raise e
 
 
-@click.command(cls=rclick.RichCommand)
+@click.command(cls=ProfiledCommand)
 @click.option(
     "--signature",
     "-s",
@@ -137,51 +1248,63 @@ def read_storage_from_cli(address: str, slot: int, provider: Node, raw: bool) ->
 )
 @click.argument("args", nargs=-1, type=str)
 @click.option("--raw", "-r", is_flag=True, help="Print raw data without colorful output or additional text.")
-def abi_encode(signature: str, args: Any, raw: bool) -> None:  # noqa: FBT001
+@format_option()
+def abi_encode(signature: str, args: Any, raw: bool, output_format: Optional[str]) -> None:  # noqa: FBT001
     """
     Encodes calldata for a function given its signature and arguments excluding the selector.
     """
     try:
-        calldata = abi_encode_calldata(signature, *args)
-        if raw:
-            console.print(calldata.hex())
-        else:
-            console.print(f"[blue bold]Encoded Calldata: [green]{calldata.hex()}")
+        request = {"op": "abi_encode", "signature": signature, "args": list(args)}
+        calldata = forward_or_run(request, lambda: abi_encode_calldata(signature, *args))
+        print_calldata(calldata, raw, output_format)
+    except click.ClickException:
+        raise
     except Exception as e:
-        if raw:
-            console.print(e)
-        else:
-            console.print(f"Error: [red]{e!s}")
+        report_error(e, raw, output_format)
 
 
-@click.command(cls=rclick.RichCommand)
+@click.command(cls=ProfiledCommand)
 @click.option(
     "--signature",
     "-s",
     help="The function signature (e.g., function_name(input param type)).",
     required=True,
 )
-@click.argument("calldata", type=str)
+@click.argument("calldata", type=str, required=False)
 @click.option("--raw", "-r", is_flag=True, help="Print raw data without colorful output or additional text.")
-def abi_decode(signature: str, calldata: str, raw: bool) -> None:  # noqa: FBT001
+@stream_options
+def abi_decode(  # noqa: PLR0917
+    signature: str,
+    calldata: Optional[str],
+    raw: bool,  # noqa: FBT001
+    source: Optional[TextIO],
+    output_format: str,
+    output: TextIO,
+    workers: Optional[int],
+    shard_dir: Optional[str],
+) -> None:
     """
     Decodes calldata for a function given its signature and calldata string.
     """
+    if source is not None:
+        stream_decode(
+            signature, source, output, output_format, with_selector=False, workers=workers, shard_dir=shard_dir
+        )
+        return
+    if calldata is None:
+        msg = "Either CALLDATA or --input is required."
+        raise click.UsageError(msg)
     try:
-        decoded_data = abi_decode_calldata(signature, calldata)
-        if raw:
-            console.print(decoded_data)
-        else:
-            console.print("[blue bold]Decoded Data: ", end="")
-            pprint(decoded_data)
+        request = {"op": "abi_decode", "signature": signature, "calldata": calldata}
+        decoded_data = forward_or_run(request, lambda: abi_decode_calldata(signature, calldata))
+        print_decoded(decoded_data, raw, output_format, input_columns(signature))
+    except click.ClickException:
+        raise
     except Exception as e:
-        if raw:
-            console.print(e)
-        else:
-            console.print(f"Error: [red]{e!s}")
+        report_error(e, raw, output_format)
 
 
-@click.command(cls=rclick.RichCommand)
+@click.command(cls=ProfiledCommand)
 @click.option(
     "--signature",
     "-s",
@@ -190,48 +1313,205 @@ def abi_decode(signature: str, calldata: str, raw: bool) -> None:  # noqa: FBT00
 )
 @click.argument("args", nargs=-1, type=str)
 @click.option("--raw", "-r", is_flag=True, help="Print raw data without colorful output or additional text.")
-def encode(signature: str, args: Any, raw: bool) -> None:  # noqa: FBT001
+@click.option(
+    "--input",
+    "-i",
+    "source",
+    type=click.File("r"),
+    help="CSV file of argument rows to encode in bulk, with a header naming the inputs. Use - for stdin.",
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.File("w"),
+    default="-",
+    help="Where to write the calldata with --input, one per line. Defaults to stdout.",
+)
+@format_option()
+def encode(  # noqa: PLR0917
+    signature: str,
+    args: Any,
+    raw: bool,  # noqa: FBT001
+    source: Optional[TextIO],
+    output: TextIO,
+    output_format: Optional[str],
+) -> None:
     """
     Encodes calldata for a function given its signature and arguments Including the selector.
     """
     try:
-        calldata = encode_calldata(signature, *args)
-        if raw:
-            console.print(calldata.hex())
-        else:
-            console.print(f"[blue bold]Encoded Calldata: [green]{calldata.hex()}")
+        if source is not None:
+            batch = encode_columns(signature, read_csv_columns(source))
+            if output_format in {None, "hex"}:
+                with buffered(output) as stream:
+                    batch.write_hex(stream)
+            else:
+                write_output((to_hex(calldata) for calldata in batch), output_format, ["calldata"], output=output)
+            return
+        request = {"op": "encode", "signature": signature, "args": list(args)}
+        calldata = forward_or_run(request, lambda: encode_calldata(signature, *args))
+        print_calldata(calldata, raw, output_format)
+    except click.ClickException:
+        raise
     except Exception as e:
-        if raw:
-            console.print(e)
-        else:
-            console.print(f"Error: [red]{e!s}")
+        report_error(e, raw, output_format)
 
 
-@click.command(cls=rclick.RichCommand)
+@click.command(cls=ProfiledCommand)
 @click.option(
     "--signature",
     "-s",
     help="The function signature (e.g., function_name(input param type)).",
-    required=True,
 )
-@click.argument("calldata", type=str)
+@click.option(
+    "--abi-file",
+    type=click.Path(exists=True, dir_okay=False),
+    help="JSON ABI or file of signatures, one per line, to pick the function by the calldata selector.",
+)
+@click.argument("calldata", type=str, required=False)
 @click.option("--raw", "-r", is_flag=True, help="Print raw data without colorful output or additional text.")
-def decode(signature: str, calldata: str, raw: bool) -> None:  # noqa: FBT001
+@stream_options
+def decode(  # noqa: PLR0917
+    signature: Optional[str],
+    abi_file: Optional[str],
+    calldata: Optional[str],
+    raw: bool,  # noqa: FBT001
+    source: Optional[TextIO],
+    output_format: str,
+    output: TextIO,
+    workers: Optional[int],
+    shard_dir: Optional[str],
+) -> None:
     """
     Decodes calldata for a function given its signature and calldata string.
     """
+    if (signature is None) == (abi_file is None):
+        msg = "Exactly one of --signature or --abi-file is required."
+        raise click.UsageError(msg)
+    decoder = SelectorDecoder.from_file(abi_file) if abi_file is not None else None
+    if source is not None:
+        stream_decode(
+            signature,
+            source,
+            output,
+            output_format,
+            with_selector=True,
+            decoder=decoder,
+            abi_file=abi_file,
+            workers=workers,
+            shard_dir=shard_dir,
+        )
+        return
+    if calldata is None:
+        msg = "Either CALLDATA or --input is required."
+        raise click.UsageError(msg)
     try:
-        decoded_data = decode_calldata(signature, calldata)
-        if raw:
-            console.print(decoded_data)
+        if decoder is not None:
+            decoded_data = decoder.decode(calldata)
+            columns = ["selector", "function", "args"]
         else:
-            console.print("[blue bold]Decoded Data: ", end="")
-            pprint(decoded_data)
+            request = {"op": "decode", "signature": signature, "calldata": calldata}
+            decoded_data = forward_or_run(request, lambda: decode_calldata(signature, calldata))  # type: ignore[arg-type]
+            columns = input_columns(signature)  # type: ignore[arg-type]
+        print_decoded(decoded_data, raw, output_format, columns)
+    except click.ClickException:
+        raise
     except Exception as e:
-        if raw:
-            console.print(e)
-        else:
-            console.print(f"Error: [red]{e!s}")
+        report_error(e, raw, output_format)
+
+
+@click.command(cls=ConnectedProviderCommand)
+@click.option(
+    "--address",
+    "-a",
+    "addresses",
+    multiple=True,
+    help="Contract to fetch the logs of. Repeat for several contracts, every contract if omitted.",
+)
+@click.option(
+    "--event",
+    "-e",
+    "events",
+    multiple=True,
+    required=True,
+    help="Event signature marking the indexed inputs, e.g. 'Transfer(address indexed,address indexed,uint256)'. "
+    "Repeat for several events.",
+)
+@click.option("--from-block", type=click.IntRange(min=0), required=True, help="First block of the range.")
+@click.option(
+    "--to-block", type=click.IntRange(min=0), help="Last block of the range, included. The latest by default."
+)
+@click.option(
+    "--chunk-size",
+    type=click.IntRange(min=1),
+    default=DEFAULT_LOG_CHUNK_SIZE,
+    show_default=True,
+    help="Blocks per eth_getLogs request, halved whenever the node answers that a range holds too many logs.",
+)
+@click.option(
+    "--concurrency",
+    "-c",
+    type=click.IntRange(min=1),
+    default=DEFAULT_SWEEP_WORKERS,
+    show_default=True,
+    help="Maximum eth_getLogs requests in flight.",
+)
+@network_option(default="ethereum:local:node", required=True)
+def logs(  # noqa: PLR0917
+    addresses: tuple[str, ...],
+    events: tuple[str, ...],
+    from_block: int,
+    to_block: Optional[int],
+    chunk_size: int,
+    concurrency: int,
+    provider: "Node",
+) -> None:
+    """
+    Fetches and decodes the event logs of a block range, streamed as newline-delimited JSON in block order.
+    """
+    from ape_utils.logs import decode_logs  # noqa: PLC0415
+
+    if to_block is not None and from_block > to_block:
+        msg = "--from-block must not be after --to-block."
+        raise click.UsageError(msg)
+    try:
+        rows = decode_logs(
+            provider, events, addresses, from_block, to_block, chunk_size=chunk_size, workers=concurrency
+        )
+        write_output(rows, "ndjson")
+    except click.ClickException:
+        raise
+    except Exception as e:
+        raise click.ClickException(str(e)) from e
+
+
+@click.command(cls=ConnectedProviderCommand)
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(dir_okay=False),
+    default=str(DEFAULT_SOCKET_PATH),
+    show_default=True,
+    help="Unix socket to listen on. The other commands forward to the default socket when it exists.",
+)
+@click.option("--stdio", is_flag=True, help="Answer JSON-lines requests on stdin and stdout instead of a socket.")
+@click.option("--no-cache", is_flag=True, help="Do not read or write the on-disk cache of block-pinned results.")
+@network_option(default="ethereum:local:node", required=True)
+def serve(socket_path: str, stdio: bool, no_cache: bool, provider: "Node") -> None:  # noqa: FBT001
+    """
+    Keeps a warm worker with a connected provider answering encode, decode, call and read requests.
+    """
+    from ape_utils.result_cache import ResultCache  # noqa: PLC0415
+
+    worker = Worker(provider, None if no_cache else ResultCache())
+    if stdio:
+        worker.serve_lines(click.get_text_stream("stdin"), click.get_text_stream("stdout"))
+        return
+    get_console().print(f"[blue bold]Serving [green]{provider.network_choice}[/] on [green]{socket_path}")
+    try:
+        worker.serve_socket(socket_path)
+    except KeyboardInterrupt:
+        pass
 
 
 cli.add_command(call_view_function_from_cli, name="call")
@@ -240,6 +1520,8 @@ cli.add_command(abi_decode, name="abi_decode")
 cli.add_command(encode, name="encode")
 cli.add_command(decode, name="decode")
 cli.add_command(read_storage_from_cli, name="read")
+cli.add_command(logs, name="logs")
+cli.add_command(serve, name="serve")
 
 if __name__ == "__main__":
     call_view_function_from_cli()
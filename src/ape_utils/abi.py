@@ -0,0 +1,112 @@
+from functools import lru_cache
+
+from eth_utils import keccak
+from ethpm_types import EventABI, MethodABI
+
+from ape_utils.profiling import PROFILER
+
+# * Number of distinct signatures kept parsed in memory
+ABI_CACHE_SIZE: int = 1024
+
+
+@lru_cache(maxsize=ABI_CACHE_SIZE)
+def get_method_abi(signature: str) -> MethodABI:
+    """
+    Parses a function signature into a `MethodABI`, caching the result.
+
+    Parsing a signature with `MethodABI.from_signature` is the most expensive part of encoding
+    or decoding small calldata, so every codec helper goes through this bounded LRU cache.
+    The returned object is shared between callers and must not be modified.
+
+    Args:
+        signature (str): The function signature in the format "function_name(input1_type,input2_type,...)".
+
+    Returns:
+        MethodABI: The parsed ABI of the function.
+
+    Example:
+        >>> get_method_abi("transfer(address to, uint256 amount)").selector
+        'transfer(address,uint256)'
+    """
+    with PROFILER.stage("abi"):
+        return MethodABI.from_signature(signature)
+
+
+@lru_cache(maxsize=ABI_CACHE_SIZE)
+def get_selector(signature: str) -> bytes:
+    """
+    Returns the 4-byte function selector of a function signature, caching the result.
+
+    Args:
+        signature (str): The function signature in the format "function_name(input1_type,input2_type,...)".
+
+    Returns:
+        bytes: The first 4 bytes of the keccak hash of the canonical signature.
+
+    Example:
+        >>> get_selector("transfer(address to, uint256 amount)").hex()
+        'a9059cbb'
+    """
+    return keccak(text=get_method_abi(signature).selector)[:4]
+
+
+@lru_cache(maxsize=ABI_CACHE_SIZE)
+def get_event_abi(signature: str) -> EventABI:
+    """
+    Parses an event signature into an `EventABI`, caching the result like `get_method_abi`.
+
+    Args:
+        signature (str): The event signature, marking the indexed inputs, e.g.
+            "Transfer(address indexed from, address indexed to, uint256 value)".
+
+    Returns:
+        EventABI: The parsed ABI of the event.
+    """
+    with PROFILER.stage("abi"):
+        return EventABI.from_signature(signature)
+
+
+@lru_cache(maxsize=ABI_CACHE_SIZE)
+def get_topic(signature: str) -> bytes:
+    """
+    Returns the topic 0 of an event signature, the keccak hash of its canonical signature, caching the result.
+
+    Example:
+        >>> get_topic("Transfer(address indexed, address indexed, uint256)").hex()
+        'ddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef'
+    """
+    return keccak(text=get_event_abi(signature).selector)
+
+
+def abi_cache_info() -> dict[str, dict[str, int]]:
+    """
+    Returns the hit/miss statistics of the parsed-ABI, selector and topic caches.
+
+    Returns:
+        dict[str, dict[str, int]]: The `hits`, `misses`, `size` and `maxsize` of each cache.
+
+    Example:
+        >>> abi_cache_info()
+        {'method_abi': {'hits': 41, 'misses': 2, 'size': 2, 'maxsize': 1024}, 'selector': {...}}
+    """
+    stats = {}
+    caches = (
+        ("method_abi", get_method_abi),
+        ("selector", get_selector),
+        ("event_abi", get_event_abi),
+        ("topic", get_topic),
+    )
+    for name, cache in caches:
+        info = cache.cache_info()
+        stats[name] = {"hits": info.hits, "misses": info.misses, "size": info.currsize, "maxsize": info.maxsize or 0}
+    return stats
+
+
+def clear_abi_cache() -> None:
+    """
+    Empties the parsed-ABI, selector and topic caches and resets their statistics.
+    """
+    get_method_abi.cache_clear()
+    get_selector.cache_clear()
+    get_event_abi.cache_clear()
+    get_topic.cache_clear()
@@ -0,0 +1,312 @@
+import asyncio
+import atexit
+import threading
+import time
+import weakref
+from collections.abc import Sequence
+from types import SimpleNamespace
+from typing import Any, Optional
+
+import aiohttp
+import requests
+from web3 import AsyncWeb3, Web3
+
+from ape_utils.constants import DEFAULT_BACKOFF, DEFAULT_RETRIES
+from ape_utils.profiling import PROFILER
+from ape_utils.resilience import RateLimiter, ResilientAdapter, RetryPolicy, endpoint_label
+
+# * Defaults for the pooled HTTP sessions shared by every call to the same node
+DEFAULT_POOL_SIZE: int = 10
+DEFAULT_TIMEOUT: float = 30.0
+
+_AsyncClient = tuple[AsyncWeb3, aiohttp.ClientSession]
+
+_lock = threading.Lock()
+_sessions: dict[str, requests.Session] = {}
+_clients: dict[str, Web3] = {}
+# * aiohttp sessions are bound to the event loop that created them
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, _AsyncClient]]" = (
+    weakref.WeakKeyDictionary()
+)
+_async_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = weakref.WeakKeyDictionary()
+_limiters: dict[str, RateLimiter] = {}
+_pool_size: int = DEFAULT_POOL_SIZE
+_timeout: float = DEFAULT_TIMEOUT
+_retry_policy: RetryPolicy = RetryPolicy()
+_rate_limit: Optional[float] = None
+_fallback_uris: tuple[str, ...] = ()
+
+
+def _record_request(body: Any, received: int, seconds: float) -> None:
+    if isinstance(body, str):
+        body = body.encode()
+    body = body or b""
+    PROFILER.record("rpc", seconds)
+    PROFILER.add("http_requests")
+    # * A batch payload holds several requests, each with its own method
+    PROFILER.add("rpc_requests", body.count(b'"method"'))
+    PROFILER.add("rpc_bytes_sent", len(body))
+    PROFILER.add("rpc_bytes_received", received)
+
+
+def _profile_response(response: requests.Response, *args: Any, **kwargs: Any) -> None:  # noqa: ARG001
+    if PROFILER.enabled:
+        _record_request(response.request.body, len(response.content), response.elapsed.total_seconds())
+
+
+# * aiohttp only accepts coroutines as trace hooks
+async def _on_request_start(_: Any, context: SimpleNamespace, __: Any) -> None:  # noqa: RUF029
+    context.start = time.perf_counter()
+    context.body = b""
+    context.received = 0
+
+
+async def _on_request_chunk_sent(_: Any, context: SimpleNamespace, params: Any) -> None:  # noqa: RUF029
+    context.body += params.chunk
+
+
+async def _on_response_chunk_received(_: Any, context: SimpleNamespace, params: Any) -> None:  # noqa: RUF029
+    context.received += len(params.chunk)
+
+
+async def _on_request_end(_: Any, context: SimpleNamespace, params: Any) -> None:  # noqa: RUF029
+    if PROFILER.enabled:
+        # * Chunks are only reported for streamed reads, so the announced length covers the rest
+        received = max(context.received, params.response.content_length or 0)
+        _record_request(context.body, received, time.perf_counter() - context.start)
+
+
+def _trace_config() -> aiohttp.TraceConfig:
+    """
+    Returns the aiohttp hooks recording the requests of an async client with the `PROFILER`.
+    """
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(_on_request_start)
+    trace_config.on_request_chunk_sent.append(_on_request_chunk_sent)
+    trace_config.on_response_chunk_received.append(_on_response_chunk_received)
+    trace_config.on_request_end.append(_on_request_end)
+    return trace_config
+
+
+def configure_clients(
+    pool_size: int = DEFAULT_POOL_SIZE,
+    timeout: float = DEFAULT_TIMEOUT,
+    *,
+    retries: int = DEFAULT_RETRIES,
+    backoff: float = DEFAULT_BACKOFF,
+    rate_limit: Optional[float] = None,
+    fallback_uris: Sequence[str] = (),
+) -> None:
+    """
+    Sets the connection pool size, request timeout, retries, rate limit and fallback nodes used for new Web3 clients.
+
+    Clients created with the previous settings are closed, so the next call to
+    `get_web3` or `get_session` opens a pool with the new settings. The rate limiters
+    and their counters start over as well.
+
+    Args:
+        pool_size (int): The maximum number of keep-alive connections kept open per node.
+        timeout (float): The timeout in seconds for a single HTTP request.
+        retries (int): How many times a request failing with a retryable error is sent again to the same node.
+        backoff (float): The upper bound in seconds of the first jittered retry delay, doubled on every retry.
+        rate_limit (Optional[float]): The maximum requests per second sent to each node. Without it nodes are
+            only limited once they throttle.
+        fallback_uris (Sequence[str]): HTTP URIs of nodes that take over, in order, when a node runs out of retries.
+
+    Example:
+        >>> configure_clients(pool_size=50, timeout=10, rate_limit=20, fallback_uris=[alchemy_uri])
+    """
+    global _pool_size, _timeout, _retry_policy, _rate_limit, _fallback_uris  # noqa: PLW0603
+    close_clients()
+    with _lock:
+        _pool_size = pool_size
+        _timeout = timeout
+        _retry_policy = RetryPolicy(retries, backoff)
+        _rate_limit = rate_limit
+        _fallback_uris = tuple(fallback_uris)
+        _limiters.clear()
+
+
+def get_limiter(uri: str) -> RateLimiter:
+    """
+    Returns the rate limiter of a node URI, shared by the sync and async clients, creating it on first use.
+    """
+    with _lock:
+        limiter = _limiters.get(uri)
+        if limiter is None:
+            limiter = _limiters[uri] = RateLimiter(_rate_limit)
+        return limiter
+
+
+def get_retry_policy() -> RetryPolicy:
+    """
+    Returns the retries and backoff configured with `configure_clients`.
+    """
+    return _retry_policy
+
+
+def failover_uris(uri: str) -> list[str]:
+    """
+    Returns the node URIs a request for `uri` is sent to in turn: `uri` itself, then the fallback nodes.
+
+    Nodes that ran out of retries within their cooldown are moved to the end, so requests
+    do not keep waiting on a node that is down.
+    """
+    uris = [uri, *(fallback for fallback in _fallback_uris if fallback != uri)]
+    return sorted(uris, key=lambda candidate: not get_limiter(candidate).available)
+
+
+def endpoint_stats() -> dict[str, dict[str, Any]]:
+    """
+    Returns the counters of the rate limiter of every node used so far, keyed by node without its path.
+
+    Example:
+        >>> endpoint_stats()
+        {'https://mainnet.infura.io': {'requests': 120, 'retries': 3, 'throttled': 2, 'failures': 0,
+        'failovers': 0, 'wait_seconds': 1.7, 'rate': 24.3, 'available': True}}
+    """
+    with _lock:
+        limiters = list(_limiters.items())
+    return {endpoint_label(uri): limiter.stats() for uri, limiter in limiters}
+
+
+def get_session(uri: str) -> requests.Session:
+    """
+    Returns the keep-alive HTTP session for a node URI, creating it on first use.
+
+    Every request of the session is rate limited, retried and failed over to the fallback
+    nodes by a `ResilientAdapter`, following the settings of `configure_clients`.
+
+    Args:
+        uri (str): The HTTP URI of the node.
+
+    Returns:
+        requests.Session: A session whose connection pool is shared by every request to `uri`.
+    """
+    with _lock:
+        session = _sessions.get(uri)
+        if session is None:
+            session = requests.Session()
+            adapter = ResilientAdapter(
+                uri, get_limiter, _retry_policy, failover_uris, pool_connections=_pool_size, pool_maxsize=_pool_size
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.hooks["response"].append(_profile_response)
+            _sessions[uri] = session
+        return session
+
+
+def get_timeout() -> float:
+    """
+    Returns the request timeout in seconds configured with `configure_clients`.
+    """
+    return _timeout
+
+
+def get_web3(uri: str) -> Web3:
+    """
+    Returns a cached Web3 client for a node URI, creating it on first use.
+
+    The client is built once per URI on top of the pooled session from `get_session`,
+    so repeated calls reuse the same connections, TLS sessions and middleware stack.
+
+    Args:
+        uri (str): The HTTP URI of the node, e.g. `provider.uri`.
+
+    Returns:
+        Web3: The Web3 client for `uri`.
+
+    Example:
+        >>> w3 = get_web3(provider.uri)
+        >>> w3.eth.block_number
+    """
+    with _lock:
+        client = _clients.get(uri)
+    if client is not None:
+        return client
+
+    session = get_session(uri)
+    with PROFILER.stage("web3"):
+        # * Retries are left to the session, Web3's own would multiply them
+        provider = Web3.HTTPProvider(
+            uri, request_kwargs={"timeout": _timeout}, session=session, exception_retry_configuration=None
+        )
+        client = Web3(provider)
+    with _lock:
+        return _clients.setdefault(uri, client)
+
+
+async def get_async_web3(uri: str) -> AsyncWeb3:
+    """
+    Returns a cached async Web3 client for a node URI in the running event loop.
+
+    The client uses an aiohttp session limited to the configured pool size and timeout.
+    Since aiohttp sessions cannot outlive their event loop, clients are cached per loop
+    and should be released with `aclose_clients` before the loop is closed.
+
+    Args:
+        uri (str): The HTTP URI of the node, e.g. `provider.uri`.
+
+    Returns:
+        AsyncWeb3: The async Web3 client for `uri`.
+
+    Example:
+        >>> w3 = await get_async_web3(provider.uri)
+        >>> await w3.eth.block_number
+    """
+    loop = asyncio.get_running_loop()
+    clients = _async_clients.setdefault(loop, {})
+    if uri in clients:
+        return clients[uri][0]
+
+    # * Concurrent first calls must not each open their own session
+    async with _async_locks.setdefault(loop, asyncio.Lock()):
+        if uri in clients:
+            return clients[uri][0]
+        with PROFILER.stage("web3"):
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=_pool_size),
+                timeout=aiohttp.ClientTimeout(total=_timeout),
+                trace_configs=[_trace_config()],
+            )
+            provider = AsyncWeb3.AsyncHTTPProvider(
+                uri,
+                request_kwargs={"timeout": aiohttp.ClientTimeout(total=_timeout)},
+                exception_retry_configuration=None,
+            )
+            await provider.cache_async_session(session)
+            client = AsyncWeb3(provider)
+            # * The default validation middleware costs an extra `eth_chainId` round-trip per call
+            client.middleware_onion.clear()
+        clients[uri] = (client, session)
+        return client
+
+
+async def aclose_clients() -> None:
+    """
+    Closes the async Web3 clients created in the running event loop.
+    """
+    loop = asyncio.get_running_loop()
+    _async_locks.pop(loop, None)
+    clients = _async_clients.pop(loop, {})
+    for _, session in clients.values():
+        await session.close()
+
+
+def close_clients() -> None:
+    """
+    Closes every pooled HTTP session and forgets the cached Web3 clients.
+
+    This runs automatically at interpreter exit, but long running programs can call it
+    to release the connections early.
+    """
+    with _lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+        _clients.clear()
+    for session in sessions:
+        session.close()
+
+
+atexit.register(close_clients)
@@ -0,0 +1,214 @@
+import csv
+from collections.abc import Iterator, Mapping, Sequence
+from typing import Any, TextIO, Union, cast
+
+from ape_utils.abi import get_method_abi
+from ape_utils.codec import abi_encode_calldata, encode_calldata
+from ape_utils.static_codec import INT_TYPE, WORD_SIZE, get_static_codec
+
+# * A column is a list of values or a one-dimensional NumPy array, one value per row
+Column = Sequence[Any]
+Columns = Union[Mapping[str, Column], Sequence[Column]]
+
+
+class CalldataBatch:
+    """
+    Calldata of many rows stored back to back in a single contiguous buffer.
+
+    Row `i` spans `buffer[offsets[i] : offsets[i + 1]]`. For static-only signatures every row
+    has the same size and `offsets` is a `range`, so no per-row object is kept in memory.
+
+    Example:
+        >>> batch = encode_columns("transfer(address to, uint256 amount)", {"to": holders, "amount": amounts})
+        >>> batch[0].hex()
+        'a9059cbb000000000000000000000000dbb18e36...'
+    """
+
+    def __init__(self, buffer: bytearray, offsets: Sequence[int]) -> None:
+        self.buffer = buffer
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> bytes:
+        if index < 0:
+            index += len(self)
+        return bytes(self.buffer[self.offsets[index] : self.offsets[index + 1]])
+
+    def __iter__(self) -> Iterator[bytes]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def write_hex(self, output: TextIO) -> int:
+        """
+        Writes every row as a `0x` prefixed hex string, one per line.
+
+        Args:
+            output (TextIO): The text stream to write to.
+
+        Returns:
+            int: The number of rows written.
+        """
+        view = memoryview(self.buffer)
+        for index in range(len(self)):
+            output.write(f"0x{view[self.offsets[index] : self.offsets[index + 1]].hex()}\n")
+        return len(self)
+
+
+def _ordered_columns(signature: str, columns: Columns) -> list[Column]:
+    """
+    Returns the columns in input order, looking them up by input name when given as a mapping.
+    """
+    inputs = get_method_abi(signature).inputs
+    if isinstance(columns, Mapping):
+        names = [abi_input.name or str(index) for index, abi_input in enumerate(inputs)]
+        missing = [name for name in names if name not in columns]
+        if missing:
+            msg = f"Missing columns: {', '.join(missing)}"
+            raise ValueError(msg)
+        ordered = [columns[name] for name in names]
+    else:
+        ordered = list(columns)
+    if len(ordered) != len(inputs):
+        msg = f"Wrong number of columns passed. Expected: {len(inputs)} got: {len(ordered)}"
+        raise ValueError(msg)
+    if len({len(column) for column in ordered}) > 1:
+        msg = "All columns must have the same number of rows"
+        raise ValueError(msg)
+    return ordered
+
+
+def _value(column: Column, index: int) -> Any:
+    value = column[index]
+    # * NumPy scalars are turned into plain Python values before reaching the encoders
+    return value.item() if hasattr(value, "item") else value
+
+
+def _encode_numpy_column(rows: Any, offset: int, abi_type: str, column: Any) -> Union[set[int], None]:
+    """
+    Writes an integer or boolean NumPy column into its word of every row at once.
+
+    Returns the rows whose value is out of range for the ABI type, or `None` if the column
+    cannot be written this way and must go through the per-value encoders.
+    """
+    import numpy as np  # noqa: PLC0415
+
+    words = rows[:, offset : offset + WORD_SIZE]
+    if abi_type == "bool" and column.dtype.kind == "b":
+        words[:, -1] = column
+        return set()
+    match = INT_TYPE.match(abi_type)
+    if match is None or column.dtype.kind not in "iu" or column.dtype.itemsize > 8:  # noqa: PLR2004
+        return None
+
+    signed, bits = match[1] != "u", int(match[2] or 256)
+    low, high = (-(1 << (bits - 1)), (1 << (bits - 1)) - 1) if signed else (0, (1 << bits) - 1)
+    info = np.iinfo(column.dtype)
+    bad = (column < max(low, info.min)) | (column > min(high, info.max))
+    if column.dtype.kind == "i":
+        words[:, 24:] = column.astype(">i8").view(np.uint8).reshape(-1, 8)
+        # * Sign-extend negative values over the upper 24 bytes of the word
+        words[:, :24] = np.where(column < 0, 0xFF, 0).astype(np.uint8)[:, None]
+    else:
+        words[:, 24:] = column.astype(">u8").view(np.uint8).reshape(-1, 8)
+    return set(np.flatnonzero(bad).tolist())
+
+
+def _encode_row(encode: Any, signature: str, columns: list[Column], index: int) -> bytes:
+    try:
+        return bytes(encode(signature, *(_value(column, index) for column in columns)))
+    except Exception as e:
+        msg = f"Row {index}: {e}"
+        raise ValueError(msg) from e
+
+
+def encode_columns(signature: str, columns: Columns, *, with_selector: bool = True) -> CalldataBatch:
+    """
+    Encodes calldata for many rows of arguments given as columns, in one pass into a single buffer.
+
+    The signature is parsed once. For static-only signatures the buffer is preallocated from a
+    template row holding the selector, then every column is written into its 32-byte word of
+    each row: integer and boolean NumPy arrays in a single vectorized step, other columns value
+    by value. Rows with values that need Ape's conversion rules, such as `"1 ether"`, and every
+    row of a signature with dynamic inputs are encoded with `encode_calldata` instead.
+
+    Args:
+        signature (str): The function signature in the format "function_name(input1_type,input2_type,...)".
+        columns (Columns): One column per input, in input order or keyed by input name.
+            Unnamed inputs are keyed by their position, e.g. "0".
+        with_selector (bool): Whether to prefix every row with the 4-byte selector.
+
+    Returns:
+        CalldataBatch: The encoded calldata of every row, in input order.
+
+    Raises:
+        ValueError: If the columns do not match the inputs, or a row cannot be encoded.
+
+    Example:
+        >>> batch = encode_columns("transfer(address to, uint256 amount)", [holders, np.full(len(holders), 10**18)])
+        >>> with open("calldata.txt", "w") as file:
+        ...     batch.write_hex(file)
+    """
+    ordered = _ordered_columns(signature, columns)
+    count = len(ordered[0]) if ordered else 0
+    encode = encode_calldata if with_selector else abi_encode_calldata
+    codec = get_static_codec(signature)
+
+    if codec is None:
+        buffer = bytearray()
+        offsets = [0]
+        for index in range(count):
+            buffer += _encode_row(encode, signature, ordered, index)
+            offsets.append(len(buffer))
+        return CalldataBatch(buffer, offsets)
+
+    prefix = codec.selector if with_selector else b""
+    row_size = len(prefix) + codec.size
+    # * Replicating a template row writes the selector of every row in one step
+    buffer = bytearray((prefix + bytes(codec.size)) * count)
+    view = memoryview(buffer)
+    fallback: set[int] = set()
+    rows = None
+    for position, (abi_type, encoder, column) in enumerate(zip(codec.types, codec.encoders, ordered)):
+        offset = len(prefix) + position * WORD_SIZE
+        if hasattr(column, "dtype") and getattr(column, "ndim", 1) == 1:
+            if rows is None:
+                import numpy as np  # noqa: PLC0415
+
+                rows = np.frombuffer(buffer, dtype=np.uint8).reshape(count, row_size)
+            bad = _encode_numpy_column(rows, offset, abi_type, column)
+            if bad is not None:
+                fallback |= bad
+                continue
+            column = cast("Any", column).tolist()
+        for index, value in enumerate(column):
+            start = index * row_size + offset
+            if not encoder(view[start : start + WORD_SIZE], value):
+                fallback.add(index)
+
+    for index in sorted(fallback):
+        view[index * row_size : (index + 1) * row_size] = _encode_row(encode, signature, ordered, index)
+    return CalldataBatch(buffer, range(0, count * row_size + 1, row_size))
+
+
+def read_csv_columns(stream: TextIO) -> dict[str, list[str]]:
+    """
+    Reads a CSV file with a header row into columns keyed by the header names.
+
+    Args:
+        stream (TextIO): The CSV text stream. The header names the inputs, or their positions for unnamed inputs.
+
+    Returns:
+        dict[str, list[str]]: The values of every column, as strings.
+    """
+    reader = csv.reader(stream)
+    header = [name.strip() for name in next(reader, [])]
+    columns: dict[str, list[str]] = {name: [] for name in header}
+    values = list(columns.values())
+    for row in reader:
+        if not row:
+            continue
+        for column, value in zip(values, row):
+            column.append(value.strip())
+    return columns
@@ -0,0 +1,29 @@
+# * Tuning defaults shared by the library and the CLI options.
+# * Kept free of imports so the CLI can show them without loading the network stack.
+
+# * Budgets for a single `Multicall` aggregate round-trip
+DEFAULT_BATCH_CALLDATA_LIMIT: int = 100_000
+DEFAULT_BATCH_GAS_LIMIT: int = 50_000_000
+
+# * Number of requests sent in a single JSON-RPC batch payload
+DEFAULT_RPC_BATCH_SIZE: int = 100
+
+# * Number of JSON-RPC batch payloads in flight during a multi-block sweep
+DEFAULT_SWEEP_WORKERS: int = 4
+
+# * Blocks per `eth_getLogs` request, halved whenever a node answers that a range holds too many logs
+DEFAULT_LOG_CHUNK_SIZE: int = 2_000
+
+# * Upper bound of the byte range of an input file decoded by one worker process at a time
+DEFAULT_DECODE_CHUNK_BYTES: int = 8 * 1024 * 1024
+
+# * Defaults for the asyncio engine
+DEFAULT_CONCURRENCY: int = 16
+DEFAULT_CALL_TIMEOUT: float = 30.0
+DEFAULT_RETRIES: int = 3
+DEFAULT_BACKOFF: float = 0.5
+
+# * Defaults for the resilient HTTP layer shared by the sync and async clients
+DEFAULT_MAX_BACKOFF: float = 8.0
+DEFAULT_MIN_RPC_RATE: float = 1.0
+DEFAULT_FAILOVER_COOLDOWN: float = 30.0
@@ -0,0 +1,131 @@
+import json
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any, Optional, Union
+
+import ape
+from eth_utils import decode_hex, keccak
+from ethpm_types import MethodABI
+
+from ape_utils.abi import get_method_abi
+from ape_utils.streaming import DecodedRow
+
+
+class UnknownSelectorError(ValueError):
+    """
+    Raised when calldata starts with a selector that is not in the index.
+    """
+
+    def __init__(self, selector: bytes) -> None:
+        self.selector = selector
+        super().__init__(f"Unknown selector 0x{selector.hex()}")
+
+
+class SelectorDecoder:
+    """
+    Decodes calldata of many different functions by dispatching on the 4-byte selector.
+
+    The selector of every registered function is computed once and stored in a hash index,
+    so each calldata is matched to its `MethodABI` with a single dictionary lookup.
+
+    Example:
+        >>> decoder = SelectorDecoder(["transfer(address to, uint256 amount)", "approve(address, uint256)"])
+        >>> decoder.decode("0xa9059cbb...")
+        {'selector': '0xa9059cbb', 'function': 'transfer(address,uint256)', 'args': {'to': '0x...', 'amount': 1}}
+    """
+
+    def __init__(self, signatures: Iterable[str] = (), abis: Iterable[MethodABI] = ()) -> None:
+        self.index: dict[bytes, MethodABI] = {}
+        for signature in signatures:
+            self.add(get_method_abi(signature))
+        for method_abi in abis:
+            self.add(method_abi)
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path]) -> "SelectorDecoder":
+        """
+        Builds a decoder from a file holding either a JSON ABI or one function signature per line.
+
+        The JSON may be an ABI list or an object with an `abi` key, such as a compiler artifact.
+        In a signatures file, blank lines and lines starting with `#` are skipped.
+
+        Args:
+            path (Union[str, Path]): The path of the ABI or signatures file.
+
+        Returns:
+            SelectorDecoder: A decoder indexing every function of the file.
+        """
+        text = Path(path).read_text(encoding="utf-8")
+        try:
+            abi: Any = json.loads(text)
+        except json.JSONDecodeError:
+            signatures = (line.strip() for line in text.splitlines())
+            return cls(signature for signature in signatures if signature and not signature.startswith("#"))
+
+        if isinstance(abi, dict):
+            abi = abi["abi"]
+        # * The ABI spec makes "function" the default type, so entries may leave it out
+        return cls(abis=(MethodABI.model_validate(entry) for entry in abi if entry.get("type", "function") == "function"))
+
+    def add(self, method_abi: MethodABI) -> bytes:
+        """
+        Adds a function to the index, replacing any function with the same selector.
+
+        Args:
+            method_abi (MethodABI): The ABI of the function.
+
+        Returns:
+            bytes: The 4-byte selector of the function.
+        """
+        selector = keccak(text=method_abi.selector)[:4]
+        self.index[selector] = method_abi
+        return selector
+
+    def lookup(self, selector: bytes) -> Optional[MethodABI]:
+        """
+        Returns the ABI registered for a 4-byte selector, or `None` if it is unknown.
+        """
+        return self.index.get(selector)
+
+    def decode(self, calldata: Union[str, bytes]) -> dict:
+        """
+        Decodes calldata, including its selector, with the matching function of the index.
+
+        Args:
+            calldata (Union[str, bytes]): The calldata as bytes or as a hex string, with or without the `0x` prefix.
+
+        Returns:
+            dict: The `selector`, the canonical `function` signature and the decoded `args`.
+
+        Raises:
+            UnknownSelectorError: If the selector is not in the index.
+        """
+        data = decode_hex(calldata) if isinstance(calldata, str) else calldata
+        selector = data[:4]
+        method_abi = self.index.get(selector)
+        if method_abi is None:
+            raise UnknownSelectorError(selector)
+        return {
+            "selector": f"0x{selector.hex()}",
+            "function": method_abi.selector,
+            "args": ape.networks.ethereum.decode_calldata(method_abi, data[4:]),
+        }
+
+    def decode_stream(self, calldata: Iterable[str]) -> Iterator[DecodedRow]:
+        """
+        Decodes a stream of calldata strings, yielding the exception of every calldata that fails.
+
+        Args:
+            calldata (Iterable[str]): The hex calldata strings, e.g. from `iter_calldata`.
+
+        Yields:
+            DecodedRow: The decoded calldata, in input order.
+        """
+        for data in calldata:
+            try:
+                yield self.decode(data)
+            except Exception as e:
+                yield e
+
+    def __len__(self) -> int:
+        return len(self.index)
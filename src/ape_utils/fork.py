@@ -0,0 +1,361 @@
+import json
+import os
+from collections.abc import Iterable, Mapping, Sequence
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from ape.types import HexBytes
+from eth_utils import to_canonical_address
+from multicall import Call
+
+from ape_utils.outputs import ReturnHandlers, get_output_decoder
+from ape_utils.rpc import provider_http_uri, rpc_batch
+from ape_utils.server import result_response
+from ape_utils.storage import SLOT_SIZE
+
+# * `eth_call` runs as the zero address, py-evm charges it gas even for calls so it is funded on the local chain
+_CALLER = "0x0000000000000000000000000000000000000000"
+_CALLER_FUNDS = 10**30
+_CALL_GAS = 30_000_000
+
+
+class MissingStateError(KeyError):
+    """
+    Raised when a read needs a storage slot that was not captured into the fork state.
+    """
+
+    def __init__(self, address: str, slot: int) -> None:
+        self.address = address
+        self.slot = slot
+        super().__init__(f"Slot {slot} of {address} is not in the fork state, capture it first")
+
+
+def _to_int(value: Union[str, int, None]) -> int:
+    if value is None:
+        return 0
+    return int(value, 16) if isinstance(value, str) else value
+
+
+def _to_bytes(value: Union[str, bytes, None]) -> bytes:
+    if value is None:
+        return b""
+    return bytes.fromhex(value[2:]) if isinstance(value, str) else bytes(value)
+
+
+class ForkState:
+    """
+    Balances, nonces, code and storage of the accounts a workload touches on a chain at a block.
+
+    The state is captured from a node with `capture_call` and `capture_storage`, merged over
+    runs, and kept in a JSON file in the layout of the geth `prestateTracer`, with `0x` hex
+    values. `LocalFork` runs calls and reads against it without any network.
+
+    Example:
+        >>> state = capture_call(provider, "totalSupply()(uint256)", token, [], 19_000_000)
+        >>> state.save("token.fork.json")
+        >>> LocalFork(ForkState.load("token.fork.json")).call_view_function("totalSupply()(uint256)", token, [])
+    """
+
+    def __init__(
+        self,
+        chain_id: int,
+        block: int,
+        timestamp: Optional[int] = None,
+        accounts: Optional[Mapping[str, Mapping[str, Any]]] = None,
+    ) -> None:
+        self.chain_id = chain_id
+        self.block = block
+        self.timestamp = timestamp
+        # * Keyed by the lowercase address, slots as ints and values as 32-byte words
+        self.accounts: dict[str, dict[str, Any]] = {}
+        if accounts:
+            self.merge(accounts)
+
+    def merge(self, accounts: Mapping[str, Mapping[str, Any]]) -> None:
+        """
+        Adds accounts in the layout of the `prestateTracer`, keeping the slots already captured.
+
+        Args:
+            accounts (Mapping[str, Mapping[str, Any]]): The `balance`, `nonce`, `code` and `storage` of every
+                address, as hex strings or ints and bytes. Missing fields are empty, like the tracer omits them.
+        """
+        for address, fields in accounts.items():
+            account = self.accounts.setdefault(address.lower(), {"balance": 0, "nonce": 0, "code": b"", "storage": {}})
+            if "balance" in fields:
+                account["balance"] = _to_int(fields["balance"])
+            if "nonce" in fields:
+                account["nonce"] = _to_int(fields["nonce"])
+            if "code" in fields:
+                account["code"] = _to_bytes(fields["code"])
+            for slot, value in fields.get("storage", {}).items():
+                account["storage"][_to_int(slot)] = _to_bytes(value).rjust(SLOT_SIZE, b"\x00")
+
+    def storage(self, address: str, slot: int) -> Optional[bytes]:
+        """
+        Returns the captured value of a storage slot, or `None` if it was not captured.
+        """
+        account = self.accounts.get(address.lower())
+        return None if account is None else account["storage"].get(slot)
+
+    def to_json(self) -> dict:
+        """
+        Returns the state as a JSON serializable dict, the content of a state file.
+        """
+        return {
+            "chain_id": self.chain_id,
+            "block": self.block,
+            "timestamp": self.timestamp,
+            "accounts": {
+                address: {
+                    "balance": hex(account["balance"]),
+                    "nonce": account["nonce"],
+                    "code": f"0x{account['code'].hex()}",
+                    "storage": {
+                        f"0x{slot:064x}": f"0x{value.hex()}" for slot, value in sorted(account["storage"].items())
+                    },
+                }
+                for address, account in sorted(self.accounts.items())
+            },
+        }
+
+    @classmethod
+    def from_json(cls, data: Mapping[str, Any]) -> "ForkState":
+        """
+        Builds a state from the content of a state file.
+        """
+        return cls(data["chain_id"], data["block"], data.get("timestamp"), data.get("accounts"))
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "ForkState":
+        """
+        Reads a state file written by `save`.
+        """
+        return cls.from_json(json.loads(Path(path).read_text(encoding="utf-8")))
+
+    def save(self, path: Union[str, Path]) -> None:
+        """
+        Writes the state to a JSON file, next to it first and moved in place so a reader never sees a partial file.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = path.with_name(f"{path.name}.{os.getpid()}.partial")
+        partial.write_text(json.dumps(self.to_json(), indent=1), encoding="utf-8")
+        partial.replace(path)
+
+
+def _capture_target(provider: Any, block: Optional[int], state: Optional[ForkState]) -> tuple[str, ForkState]:
+    uri = provider_http_uri(provider)
+    if uri is None:
+        msg = "Capturing a fork state needs a node reached over HTTP"
+        raise ValueError(msg)
+    if state is not None:
+        if block is not None and block != state.block:
+            msg = f"The fork state is at block {state.block}, not {block}"
+            raise ValueError(msg)
+        return uri, state
+    if block is None:
+        chain_id, latest = rpc_batch(uri, [("eth_chainId", []), ("eth_blockNumber", [])])
+        block = int(latest, 16)
+    else:
+        chain_id = rpc_batch(uri, [("eth_chainId", [])])[0]
+    header = rpc_batch(uri, [("eth_getBlockByNumber", [hex(block), False])])[0]
+    return uri, ForkState(int(chain_id, 16), block, _to_int(header["timestamp"]) if header else None)
+
+
+def capture_call(  # noqa: PLR0917
+    provider: Any,
+    function_sig: str,
+    address: str,
+    args: Sequence[Any],
+    block: Optional[int] = None,
+    state: Optional[ForkState] = None,
+) -> ForkState:
+    """
+    Captures the accounts, code and storage a view call touches, with a `debug_traceCall` and the `prestateTracer`.
+
+    Args:
+        provider (Any): The connected provider, backed by a node with the `debug` namespace.
+        function_sig (str): The function signature, including the output types, e.g. "totalSupply()(uint256)".
+        address (str): The address of the smart contract.
+        args (Sequence[Any]): The arguments for the function call.
+        block (Optional[int]): The block to capture at, the block of `state` or else the latest block by default.
+        state (Optional[ForkState]): A state to add the touched accounts to, e.g. from an earlier capture.
+
+    Returns:
+        ForkState: The state holding every account the call touched.
+
+    Raises:
+        ValueError: If the provider has no HTTP node or `block` is not the block of `state`.
+        ape_utils.rpc.RPCError: If the node does not trace calls.
+    """
+    uri, state = _capture_target(provider, block, state)
+    call = Call(address, [get_output_decoder(function_sig).signature, *args])
+    transaction = {"from": _CALLER, "to": call.target, "data": f"0x{call.data.hex()}"}
+    trace = rpc_batch(uri, [("debug_traceCall", [transaction, hex(state.block), {"tracer": "prestateTracer"}])])[0]
+    state.merge(trace)
+    return state
+
+
+def capture_storage(
+    provider: Any,
+    address: str,
+    slots: Iterable[int],
+    block: Optional[int] = None,
+    state: Optional[ForkState] = None,
+) -> ForkState:
+    """
+    Captures storage slots of a contract with `eth_getStorageAt` batches, for nodes that do not trace calls too.
+
+    Args:
+        provider (Any): The connected provider.
+        address (str): The address of the smart contract.
+        slots (Iterable[int]): The slots to capture.
+        block (Optional[int]): The block to capture at, the block of `state` or else the latest block by default.
+        state (Optional[ForkState]): A state to add the slots to.
+
+    Returns:
+        ForkState: The state holding the slots.
+    """
+    uri, state = _capture_target(provider, block, state)
+    slots = list(slots)
+    requests = [("eth_getStorageAt", [address, hex(slot), hex(state.block)]) for slot in slots]
+    values = rpc_batch(uri, requests)
+    state.merge({address: {"storage": dict(zip(slots, values))}})
+    return state
+
+
+class LocalFork:
+    """
+    A local py-evm chain seeded with a `ForkState`, answering view calls and storage reads without any network.
+
+    The captured accounts are the genesis state of an in-memory chain, so calls run the real
+    contract code against the captured storage. Slots that were not captured read as zero in
+    the EVM, so calls should be captured with the same arguments they are replayed with, while
+    storage reads of slots that were not captured raise `MissingStateError`. The EVM runs with
+    the captured chain id, so `block.chainid` reads as on the node, but the chain starts at
+    block 0 with the timestamp of the captured block: `block.number` reads 0, not the captured block.
+
+    Example:
+        >>> fork = LocalFork.open("token.fork.json")
+        >>> fork.call_view_function("balanceOf(address)(uint256)", token, [holder])
+        >>> fork.read_storage(token, 2)
+    """
+
+    def __init__(self, state: ForkState) -> None:
+        # * Loading py-evm takes about a second, so it is only imported when a fork is started
+        from eth_tester import PyEVMBackend  # noqa: PLC0415
+
+        self.state = state
+        genesis: dict[bytes, dict[str, Any]] = {
+            to_canonical_address(address): {
+                "balance": account["balance"],
+                "nonce": account["nonce"],
+                "code": account["code"],
+                "storage": {slot: int.from_bytes(value, "big") for slot, value in account["storage"].items()},
+            }
+            for address, account in state.accounts.items()
+        }
+        caller = genesis.setdefault(
+            to_canonical_address(_CALLER), {"balance": 0, "nonce": 0, "code": b"", "storage": {}}
+        )
+        caller["balance"] += _CALLER_FUNDS
+        parameters = None
+        if state.timestamp is not None:
+            parameters = PyEVMBackend.generate_genesis_params({"timestamp": state.timestamp})
+        self.backend = PyEVMBackend(genesis_parameters=parameters, genesis_state=genesis)
+        # * The tester chain class hardcodes its own chain id, which `CHAINID` would return otherwise
+        self.backend.chain.chain_id = state.chain_id
+
+    @classmethod
+    def open(cls, path: Union[str, Path]) -> "LocalFork":
+        """
+        Starts a fork from a state file.
+        """
+        return cls(ForkState.load(path))
+
+    def call(self, address: str, data: bytes) -> bytes:
+        """
+        Runs an `eth_call` of `data` to `address` and returns the return data.
+
+        Raises:
+            eth_tester.exceptions.TransactionFailed: If the call reverts.
+        """
+        transaction = {
+            "from": to_canonical_address(_CALLER),
+            "to": to_canonical_address(address),
+            "data": data,
+            "gas": _CALL_GAS,
+            "value": 0,
+        }
+        return bytes(self.backend.call(transaction, "latest"))
+
+    def call_view_function(
+        self,
+        function_sig: str,
+        address: str,
+        args: Sequence[Any],
+        *,
+        raw_output: bool = False,
+        handlers: Optional[ReturnHandlers] = None,
+    ) -> Any:
+        """
+        Calls a view function on the fork, decoding the output like `ape_utils.utils.call_view_function` does.
+        """
+        decoder = get_output_decoder(function_sig)
+        call = Call(address, [decoder.signature, *args])
+        raw = self.call(call.target, call.data)
+        return raw if raw_output else decoder.decode(raw, handlers)
+
+    def read_storage_many(self, address: str, slots: Iterable[int]) -> list[bytes]:
+        """
+        Returns the captured 32-byte values of storage slots as `HexBytes`, in input order.
+
+        Raises:
+            MissingStateError: If a slot was not captured.
+        """
+        values = []
+        for slot in slots:
+            value = self.state.storage(address, slot)
+            if value is None:
+                raise MissingStateError(address, slot)
+            values.append(HexBytes(value))
+        return values
+
+    def read_storage(self, address: str, slot: int) -> bytes:
+        """
+        Returns the captured 32-byte value of a storage slot, see `read_storage_many`.
+        """
+        return self.read_storage_many(address, [slot])[0]
+
+    def handle(self, request: dict) -> dict:
+        """
+        Answers a `call` or `read` request of the `ape_utils serve` protocol from the fork, never raising.
+
+        Args:
+            request (dict): The request object. Its `block` and `chain_id`, if given, must be those of the state,
+                and with `typed` the result is sent as typed values like a worker does.
+
+        Returns:
+            dict: The response object, `{"ok": true, "result": ...}` or `{"ok": false, "error": "..."}`.
+        """
+        chain_id = request.get("chain_id")
+        if chain_id is not None and chain_id != self.state.chain_id:
+            return {"ok": False, "error": f"The fork state is of chain {self.state.chain_id}, not {chain_id}"}
+        block = request.get("block")
+        if block is not None and block != self.state.block:
+            return {"ok": False, "error": f"The fork state is at block {self.state.block}, not {block}"}
+        try:
+            if request.get("op") == "call":
+                result = self.call_view_function(
+                    request["function_sig"],
+                    request["address"],
+                    list(request.get("args", [])),
+                    raw_output=request.get("raw_output", False),
+                )
+            elif request.get("op") == "read":
+                result = self.read_storage_many(request["address"], request["slots"])
+            else:
+                return {"ok": False, "error": f"Unknown op {request.get('op')!r}"}
+        except Exception as e:
+            return {"ok": False, "error": str(e)}
+        return result_response(request, result)
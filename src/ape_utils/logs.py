@@ -0,0 +1,298 @@
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Optional, Union
+
+from eth_abi import decode
+from eth_utils import to_checksum_address
+from ethpm_types import EventABI
+
+from ape_utils.abi import get_event_abi, get_topic
+from ape_utils.constants import DEFAULT_LOG_CHUNK_SIZE, DEFAULT_SWEEP_WORKERS
+from ape_utils.rpc import RPCError, provider_http_uri, rpc_batch, rpc_batch_results
+from ape_utils.streaming import DecodedRow
+
+# * Lowercase fragments of the errors nodes answer `eth_getLogs` with when a range holds too many logs, e.g.
+# * "query returned more than 10000 results", "Log response size exceeded" or "block range is too wide"
+_TOO_MANY_RESULTS = (
+    "query returned more than",
+    "response size",
+    "block range",
+    "blocks range",
+    "too many logs",
+    "max results",
+)
+# * Rate limit errors may mention the same words, e.g. "daily request count exceeded, request rate limited",
+# * smaller ranges only mean more requests for them
+_THROTTLED = ("rate", "capacity", "compute units", "request count")
+
+
+class UnknownTopicError(ValueError):
+    """
+    Raised when a log starts with a topic 0 that is not in the index.
+    """
+
+    def __init__(self, topic: bytes) -> None:
+        self.topic = topic
+        super().__init__(f"Unknown topic 0x{topic.hex()}")
+
+
+def too_many_results(error: RPCError) -> bool:
+    """
+    Whether a node rejected an `eth_getLogs` request because its block range holds too many logs.
+    """
+    message = error.error_message.lower()
+    if any(fragment in message for fragment in _THROTTLED):
+        return False
+    return any(fragment in message for fragment in _TOO_MANY_RESULTS)
+
+
+def _to_bytes(value: Union[str, bytes]) -> bytes:
+    return bytes.fromhex(value[2:]) if isinstance(value, str) else bytes(value)
+
+
+def _to_int(value: Union[str, int]) -> int:
+    return int(value, 16) if isinstance(value, str) else value
+
+
+def _is_hashed(abi_type: str) -> bool:
+    # * Indexed strings, bytes, arrays and tuples are stored as the keccak hash of their encoding
+    return abi_type in {"string", "bytes"} or abi_type.endswith("]") or abi_type.startswith("(")
+
+
+def _checksum(abi_type: str, value: Any) -> Any:
+    if abi_type == "address":
+        return to_checksum_address(value)
+    if abi_type.startswith("address[") and isinstance(value, (list, tuple)):
+        return [_checksum(abi_type[: abi_type.rindex("[")], item) for item in value]
+    return value
+
+
+class EventDecoder:
+    """
+    Decodes logs of many different events by dispatching on topic 0.
+
+    The topic of every registered event is computed once through the cached `get_topic` and
+    stored in a hash index, so each log is matched to its `EventABI` with a single dictionary
+    lookup, like `SelectorDecoder` does for calldata. Indexed strings, bytes, arrays and tuples
+    are only stored as their hash in the log, so they are decoded as the `0x` prefixed topic.
+
+    Example:
+        >>> decoder = EventDecoder(["Transfer(address indexed from, address indexed to, uint256 value)"])
+        >>> decoder.decode(log)
+        {'block': 6000000, 'transaction': '0x...', 'log_index': 3, 'address': '0x...', 'event': 'Transfer',
+        'args': {'from': '0x...', 'to': '0x...', 'value': 1000}}
+    """
+
+    def __init__(self, signatures: Iterable[str] = ()) -> None:
+        self.index: dict[bytes, EventABI] = {}
+        for signature in signatures:
+            self.index[get_topic(signature)] = get_event_abi(signature)
+
+    @property
+    def topics(self) -> list[str]:
+        """
+        The `0x` prefixed topic 0 of every registered event, as used in an `eth_getLogs` filter.
+        """
+        return [f"0x{topic.hex()}" for topic in self.index]
+
+    def decode(self, log: dict) -> dict:
+        """
+        Decodes a log, as answered by `eth_getLogs` or Web3, with the matching event of the index.
+
+        Args:
+            log (dict): The log, with hex strings or bytes and ints for its fields.
+
+        Returns:
+            dict: The `block`, `transaction` hash, `log_index`, contract `address`, `event` name and decoded `args`.
+
+        Raises:
+            UnknownTopicError: If the log has no topics or its topic 0 is not in the index.
+        """
+        topics = [_to_bytes(topic) for topic in log["topics"]]
+        event_abi = self.index.get(topics[0]) if topics else None
+        if event_abi is None:
+            raise UnknownTopicError(topics[0] if topics else b"")
+
+        indexed = [param for param in event_abi.inputs if param.indexed]
+        if len(indexed) != len(topics) - 1:
+            msg = f"{event_abi.name} has {len(indexed)} indexed inputs, the log has {len(topics) - 1} topics"
+            raise ValueError(msg)
+        values = iter(topics[1:])
+        data_types = [param.canonical_type for param in event_abi.inputs if not param.indexed]
+        data = iter(decode(data_types, _to_bytes(log["data"])))
+
+        args = {}
+        for position, param in enumerate(event_abi.inputs):
+            abi_type = param.canonical_type
+            if not param.indexed:
+                value = next(data)
+            elif _is_hashed(abi_type):
+                value = next(values)
+            else:
+                value = decode([abi_type], next(values))[0]
+            args[param.name or str(position)] = _checksum(abi_type, value)
+        return {
+            "block": _to_int(log["blockNumber"]),
+            "transaction": f"0x{_to_bytes(log['transactionHash']).hex()}",
+            "log_index": _to_int(log["logIndex"]),
+            "address": to_checksum_address(log["address"]),
+            "event": event_abi.name,
+            "args": args,
+        }
+
+    def decode_stream(self, logs: Iterable[dict]) -> Iterator[DecodedRow]:
+        """
+        Decodes a stream of logs, yielding the exception of every log that fails.
+
+        Args:
+            logs (Iterable[dict]): The raw logs, e.g. from `fetch_logs`.
+
+        Yields:
+            DecodedRow: The decoded logs, in input order.
+        """
+        for log in logs:
+            try:
+                yield self.decode(log)
+            except Exception as e:
+                yield e
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+
+def fetch_logs(  # noqa: PLR0914, PLR0917
+    provider: Any,
+    addresses: Sequence[str],
+    topics: Sequence[str],
+    from_block: int,
+    to_block: int,
+    chunk_size: int = DEFAULT_LOG_CHUNK_SIZE,
+    workers: int = DEFAULT_SWEEP_WORKERS,
+) -> Iterator[dict]:
+    """
+    Fetches the logs of a block range with parallel `eth_getLogs` requests, yielding them in block order.
+
+    The range is cut into chunks of `chunk_size` blocks, `workers` of which are requested at
+    once. When a node answers that a chunk holds too many logs, the chunk is split in half and
+    both halves are requested again, and the remaining chunks are cut to the smaller size.
+    Logs are yielded as soon as every chunk before theirs has been answered, so the output
+    streams in block order while later chunks are still in flight. No new chunk is cut while
+    `2 * workers` chunks are in flight or waiting on an earlier one, which bounds the logs held
+    in memory when the earliest chunk is slow.
+    Providers without an HTTP node, such as Ape's `test` provider, are asked through Web3.
+
+    Args:
+        provider (Any): The connected provider.
+        addresses (Sequence[str]): The contracts to fetch the logs of, every contract if empty.
+        topics (Sequence[str]): The `0x` prefixed topics 0 to match, e.g. from `EventDecoder.topics`.
+        from_block (int): The first block of the range.
+        to_block (int): The last block of the range, included.
+        chunk_size (int): The number of blocks of the first `eth_getLogs` requests.
+        workers (int): The maximum number of requests in flight.
+
+    Yields:
+        dict: The raw logs, in block order.
+
+    Raises:
+        RPCError: If the node rejects a request for another reason, or a single block holds too many logs.
+
+    Example:
+        >>> decoder = EventDecoder(["Transfer(address indexed from, address indexed to, uint256 value)"])
+        >>> for row in decoder.decode_stream(fetch_logs(provider, [token], decoder.topics, 6_000_000, 6_100_000)):
+        ...     print(row)
+    """
+    uri = provider_http_uri(provider)
+    log_filter: dict[str, Any] = {"topics": [list(topics)]}
+    if addresses:
+        log_filter["address"] = list(addresses)
+
+    def fetch(start: int, end: int) -> Union[list[dict], RPCError]:
+        params = {**log_filter, "fromBlock": hex(start), "toBlock": hex(end)}
+        if uri is None:
+            try:
+                return [dict(log) for log in provider.web3.eth.get_logs(params)]
+            except Exception as e:
+                return RPCError("eth_getLogs", {"message": str(e)})
+        return rpc_batch_results(uri, [("eth_getLogs", [params])])[0]
+
+    size = max(1, chunk_size)
+    next_start = from_block
+    # * Halves of split chunks, requested before cutting new chunks, the lower half last so it is popped first
+    split: list[tuple[int, int]] = []
+    answered: dict[int, tuple[int, list[dict]]] = {}
+    frontier = from_block
+    pool = ThreadPoolExecutor(max_workers=workers)
+    pending: dict[Future, tuple[int, int]] = {}
+    try:
+        while True:
+            # * Split halves are always requested, one of them may hold the frontier the buffered chunks wait on
+            while len(pending) < workers and (
+                split or (next_start <= to_block and len(pending) + len(answered) < 2 * workers)
+            ):
+                if split:
+                    start, end = split.pop()
+                else:
+                    start, end = next_start, min(to_block, next_start + size - 1)
+                    next_start = end + 1
+                pending[pool.submit(fetch, start, end)] = (start, end)
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                start, end = pending.pop(future)
+                result = future.result()
+                if isinstance(result, RPCError):
+                    if start == end or not too_many_results(result):
+                        raise result
+                    middle = (start + end) // 2
+                    size = max(1, min(size, middle - start + 1))
+                    split += [(middle + 1, end), (start, middle)]
+                    continue
+                answered[start] = (end, result)
+
+            while frontier in answered:
+                end, logs = answered.pop(frontier)
+                yield from logs
+                frontier = end + 1
+    finally:
+        # * A consumer that stops early, e.g. piped into `head`, must not wait for the requests in flight
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def latest_block(provider: Any) -> int:
+    """
+    Returns the number of the latest block of the connected provider.
+    """
+    uri = provider_http_uri(provider)
+    if uri is None:
+        return int(provider.web3.eth.block_number)
+    return int(rpc_batch(uri, [("eth_blockNumber", [])])[0], 16)
+
+
+def decode_logs(
+    provider: Any,
+    events: Sequence[str],
+    addresses: Sequence[str] = (),
+    from_block: int = 0,
+    to_block: Optional[int] = None,
+    **kwargs: Any,
+) -> Iterator[DecodedRow]:
+    """
+    Fetches and decodes the logs of some events over a block range, see `fetch_logs` and `EventDecoder`.
+
+    Args:
+        provider (Any): The connected provider.
+        events (Sequence[str]): The event signatures, marking the indexed inputs.
+        addresses (Sequence[str]): The contracts to fetch the logs of, every contract if empty.
+        from_block (int): The first block of the range.
+        to_block (Optional[int]): The last block of the range, included, the latest block by default.
+        **kwargs: The `chunk_size` and `workers` of `fetch_logs`.
+
+    Yields:
+        DecodedRow: The decoded logs in block order, or the exception of a log that failed to decode.
+    """
+    decoder = EventDecoder(events)
+    if to_block is None:
+        to_block = latest_block(provider)
+    yield from decoder.decode_stream(fetch_logs(provider, addresses, decoder.topics, from_block, to_block, **kwargs))
@@ -0,0 +1,181 @@
+import re
+from collections.abc import Mapping, Sequence
+from functools import lru_cache
+from itertools import accumulate
+from typing import Any, Callable, Optional, Union
+
+from multicall.signature import Signature, parse_signature, parse_typestring
+
+from ape_utils.abi import ABI_CACHE_SIZE, get_method_abi
+
+# * A handler converts the decoded value of one output field, keyed by the field name or its position
+ReturnHandlers = Mapping[Union[str, int], Callable[[Any], Any]]
+# * Converts a decoded tuple, or array of tuples, into its named shape
+_Shaper = Callable[[Any], Any]
+
+_ARRAY_DIMENSION = re.compile(r"\[\d*\]")
+# * The array dimensions after the closing parenthesis of a tuple, then the rest of the output
+_SUFFIX = re.compile(r"((?:\[\d*\])*)(.*)", re.DOTALL)
+_BARE_INT = re.compile(r"^(u?int)(?=$|\[)")
+# * Words that may follow a type in a Solidity signature without being the name of the field
+_DATA_LOCATIONS = {"memory", "calldata", "storage", "payable"}
+
+
+def _array_shaper(shaper: _Shaper) -> _Shaper:
+    return lambda values: [shaper(value) for value in values]
+
+
+def _tuple_shaper(fields: list[tuple[str, str, Optional[_Shaper]]]) -> Optional[_Shaper]:
+    shapers = [shaper for _, _, shaper in fields]
+    if any(name for name, _, _ in fields):
+        keys = [name or str(position) for position, (name, _, _) in enumerate(fields)]
+        return lambda values: {
+            key: value if shaper is None else shaper(value) for key, shaper, value in zip(keys, shapers, values)
+        }
+    if any(shapers):
+        return lambda values: tuple(
+            value if shaper is None else shaper(value) for shaper, value in zip(shapers, values)
+        )
+    return None
+
+
+def parse_output(text: str) -> tuple[str, str, Optional[_Shaper]]:
+    """
+    Parses one output of a signature, such as `uint256 amount` or `(address token, uint256 value)[] holdings`.
+
+    Returns:
+        tuple[str, str, Optional[_Shaper]]: The name of the field, empty when unnamed, its canonical ABI type and
+            the function turning its decoded tuples into dicts keyed by the component names, `None` when the
+            decoded value is already in its final shape.
+    """
+    text = text.strip()
+    if text.startswith("tuple("):
+        text = text[len("tuple") :]
+    if not text.startswith("("):
+        type_str, *words = text.split()
+        words = [word for word in words if word not in _DATA_LOCATIONS]
+        return (words[-1] if words else ""), _BARE_INT.sub(r"\g<1>256", type_str), None
+
+    depths = accumulate({"(": 1, ")": -1}.get(character, 0) for character in text)
+    end = next(index for index, depth in enumerate(depths) if not depth)
+    fields = [parse_output(component) for component in parse_typestring(text[: end + 1]) if component.strip()]
+    suffix, rest = _SUFFIX.match(text[end + 1 :]).groups()  # type: ignore[union-attr]
+    words = [word for word in rest.split() if word not in _DATA_LOCATIONS]
+
+    shaper = _tuple_shaper(fields)
+    if shaper is not None:
+        for _ in _ARRAY_DIMENSION.findall(suffix):
+            shaper = _array_shaper(shaper)
+    canonical = f"({','.join(type_str for _, type_str, _ in fields)}){suffix}"
+    return (words[-1] if words else ""), canonical, shaper
+
+
+class OutputDecoder:
+    """
+    Decodes the return data of a function from the output types of its signature, in a single pass.
+
+    The outputs may be named, as in `getReserves()(uint112 reserve0, uint112 reserve1, uint32 timestamp)`,
+    and so may the components of tuples. Functions with a named output return a dict keyed by the names,
+    unnamed outputs being keyed by their position, and tuples with named components are returned as
+    dicts too. Without any names the values are returned like `multicall.Call` does: the value of a
+    single output, or a tuple of the values.
+
+    The types are parsed once, and `signature` is the canonical signature without names that
+    `multicall.Call` and the JSON-RPC helpers encode the calldata with. Use `get_output_decoder`
+    to share decoders between calls.
+
+    Example:
+        >>> decoder = get_output_decoder("getReserves()(uint112 reserve0, uint112 reserve1, uint32 timestamp)")
+        >>> decoder.signature
+        'getReserves()(uint112,uint112,uint32)'
+        >>> decoder.decode(data)
+        {'reserve0': 1000, 'reserve1': 2000, 'timestamp': 1700000000}
+    """
+
+    def __init__(self, signature: str) -> None:
+        function, _, outputs = parse_signature(signature)
+        fields = [parse_output(output) for output in outputs if output.strip()]
+        self.names: list[str] = [name or str(position) for position, (name, _, _) in enumerate(fields)]
+        self.types: list[str] = [type_str for _, type_str, _ in fields]
+        self.named: bool = any(name for name, _, _ in fields)
+        self.signature: str = f"{get_method_abi(function).selector}({','.join(self.types)})"
+        self._shapers = [shaper for _, _, shaper in fields]
+        self._signature = Signature(self.signature)
+
+    @property
+    def width(self) -> int:
+        """
+        The number of outputs of the function.
+        """
+        return len(self.types)
+
+    def shape(self, values: Sequence[Any], handlers: Optional[ReturnHandlers] = None) -> Any:
+        """
+        Turns the decoded values of the outputs into the named result, applying the `handlers` of their fields.
+
+        Args:
+            values (Sequence[Any]): One decoded value per output, e.g. from `Signature.decode_data`.
+            handlers (Optional[ReturnHandlers]): Converters of the output fields, keyed by name or position.
+
+        Returns:
+            Any: A dict with named outputs, else the single value or a tuple of the values.
+        """
+        shaped = []
+        for position, (name, shaper, value) in enumerate(zip(self.names, self._shapers, values)):
+            if shaper is not None and value is not None:
+                value = shaper(value)
+            if handlers:
+                handler = handlers.get(name, handlers.get(position))
+                if handler is not None:
+                    value = handler(value)
+            shaped.append(value)
+        if self.named:
+            return dict(zip(self.names, shaped))
+        if len(shaped) == 1:
+            return shaped[0]
+        return tuple(shaped) if shaped else None
+
+    def decode(self, data: Union[bytes, str], handlers: Optional[ReturnHandlers] = None) -> Any:
+        """
+        Decodes return data and shapes it with `shape`.
+
+        Data that cannot be decoded, such as the empty output of an address without code,
+        gives `None` like `multicall.Call` does.
+
+        Args:
+            data (Union[bytes, str]): The return data, as bytes or a `0x` prefixed hex string.
+            handlers (Optional[ReturnHandlers]): Converters of the output fields, keyed by name or position.
+
+        Returns:
+            Any: The decoded result, see `shape`.
+        """
+        return self.try_decode(data, handlers)[1]
+
+    def try_decode(self, data: Union[bytes, str], handlers: Optional[ReturnHandlers] = None) -> tuple[bool, Any]:
+        """
+        Like `decode`, but tells undecodable data apart from a function that returns `None`.
+
+        Returns:
+            tuple[bool, Any]: Whether the data decoded, and the decoded result or `None`.
+        """
+        if isinstance(data, str):
+            data = bytes.fromhex(data[2:])
+        try:
+            values = self._signature.decode_data(data)
+        except Exception:
+            return False, None
+        return True, self.shape(values, handlers)
+
+
+@lru_cache(maxsize=ABI_CACHE_SIZE)
+def get_output_decoder(signature: str) -> OutputDecoder:
+    """
+    Returns the `OutputDecoder` of a signature with its output types, caching the result.
+
+    Args:
+        signature (str): The function signature, including the output types, e.g. "balanceOf(address)(uint256 balance)".
+
+    Returns:
+        OutputDecoder: The decoder, shared between callers.
+    """
+    return OutputDecoder(signature)
@@ -0,0 +1,207 @@
+import os
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from io import StringIO
+from pathlib import Path
+from typing import Any, Optional, TextIO, Union
+
+from ape_utils.abi import get_method_abi
+from ape_utils.constants import DEFAULT_DECODE_CHUNK_BYTES
+from ape_utils.dispatch import SelectorDecoder
+from ape_utils.streaming import (
+    DecodedRow,
+    decode_stream,
+    input_columns,
+    iter_calldata,
+    write_csv,
+    write_json,
+    write_ndjson,
+)
+
+# * Keys of the rows decoded by a `SelectorDecoder`, used as CSV columns
+SELECTOR_COLUMNS = ["selector", "function", "args"]
+
+# * Smallest byte range worth shipping to a worker, below it the chunks cost more to schedule than to decode
+_MIN_CHUNK_BYTES = 64 * 1024
+
+# * The decoder of the current worker process, set once by `_init_worker`
+_worker: dict[str, Any] = {}
+
+
+def byte_ranges(path: Union[str, Path], chunk_bytes: int) -> list[tuple[int, int]]:
+    """
+    Splits a file into consecutive `[start, end)` byte ranges of at most `chunk_bytes` bytes.
+
+    The ranges ignore line boundaries, `iter_range_lines` assigns every line to the range holding its first byte.
+
+    Example:
+        >>> byte_ranges("calldata.txt", 4096)
+        [(0, 4096), (4096, 8192), (8192, 9000)]
+    """
+    size = Path(path).stat().st_size
+    chunk_bytes = max(1, chunk_bytes)
+    return [(start, min(start + chunk_bytes, size)) for start in range(0, size, chunk_bytes)]
+
+
+def iter_range_lines(path: Union[str, Path], start: int, end: int) -> Iterator[str]:
+    """
+    Yields the lines of a file that start within the byte range `[start, end)`.
+
+    A line crossing the end of the range is read to its end, and the line crossing its start
+    is skipped, since it belongs to the previous range. Every line of the file is therefore
+    yielded by exactly one of the ranges of `byte_ranges`, without scanning the file first.
+    """
+    with Path(path).open("rb") as file:
+        if start > 0:
+            file.seek(start - 1)
+            file.readline()
+        position = file.tell()
+        while position < end:
+            line = file.readline()
+            if not line:
+                break
+            position += len(line)
+            yield line.decode("utf-8")
+
+
+def _init_worker(signature: Optional[str], abi_file: Optional[str], with_selector: bool) -> None:  # noqa: FBT001
+    # * Parsed once per process, so every chunk the worker decodes hits a warm ABI cache
+    if abi_file is not None:
+        _worker["decoder"] = SelectorDecoder.from_file(abi_file)
+        _worker["columns"] = SELECTOR_COLUMNS
+    else:
+        get_method_abi(signature)
+        _worker["decoder"] = None
+        _worker["columns"] = input_columns(signature)  # type: ignore[arg-type]
+    _worker["signature"] = signature
+    _worker["with_selector"] = with_selector
+
+
+def _write_chunk(
+    rows: Iterable[DecodedRow], output: TextIO, output_format: str, columns: list[str], *, whole: bool
+) -> int:
+    if output_format == "csv":
+        return write_csv(rows, output, columns, header=whole)
+    if output_format == "json" and whole:
+        return write_json(rows, output)
+    return write_ndjson(rows, output)
+
+
+def _decode_range(path: str, start: int, end: int, output_format: str, shard: Optional[str]) -> tuple[int, str]:
+    calldata = iter_calldata(iter_range_lines(path, start, end))
+    decoder: Optional[SelectorDecoder] = _worker["decoder"]
+    if decoder is not None:
+        rows = decoder.decode_stream(calldata)
+    else:
+        rows = decode_stream(_worker["signature"], calldata, with_selector=_worker["with_selector"])
+    # * Rows are rendered in the worker, so the parent process only concatenates text
+    if shard is not None:
+        with Path(shard).open("w", encoding="utf-8") as output:
+            return _write_chunk(rows, output, output_format, _worker["columns"], whole=True), ""
+    buffer = StringIO()
+    count = _write_chunk(rows, buffer, output_format, _worker["columns"], whole=False)
+    return count, buffer.getvalue()
+
+
+def shard_path(directory: Union[str, Path], index: int, output_format: str) -> Path:
+    """
+    Returns the file the rows of the `index`-th byte range are written to, e.g. `part-00003.ndjson`.
+    """
+    return Path(directory) / f"part-{index:05d}.{output_format}"
+
+
+def parallel_decode(
+    path: Union[str, Path],
+    signature: Optional[str] = None,
+    abi_file: Optional[Union[str, Path]] = None,
+    *,
+    with_selector: bool = True,
+    output: Optional[TextIO] = None,
+    output_format: str = "ndjson",
+    shard_dir: Optional[Union[str, Path]] = None,
+    workers: Optional[int] = None,
+    chunk_bytes: Optional[int] = None,
+) -> int:
+    """
+    Decodes a file of calldata, one per line, in a pool of worker processes.
+
+    The file is split into byte ranges that the workers open and decode on their own, so the
+    parent process never reads the input. Every worker parses the signature or ABI file once
+    when it starts and renders its rows as text, which the parent writes to `output` in input
+    order, at most two ranges per worker ahead of the writer. With `shard_dir`, every range is
+    written by its worker to its own `shard_path` file instead, and nothing passes through the
+    parent. A calldata that fails to decode is written as `{"error": "..."}` like `decode_stream` does.
+
+    Args:
+        path (Union[str, Path]): The file with one hex calldata per line.
+        signature (Optional[str]): The function signature of every calldata.
+        abi_file (Optional[Union[str, Path]]): A JSON ABI or signatures file to dispatch on the selector instead.
+        with_selector (bool): Whether the calldata starts with the 4-byte function selector.
+        output (Optional[TextIO]): The text stream to write the rows to in input order.
+        output_format (str): One of `ndjson`, `json` or `csv`.
+        shard_dir (Optional[Union[str, Path]]): The directory to write one file per byte range to instead.
+        workers (Optional[int]): The number of worker processes, one per CPU by default.
+        chunk_bytes (Optional[int]): The size of the byte ranges, four ranges per worker up to 8 MiB by default.
+
+    Returns:
+        int: The number of rows decoded.
+
+    Raises:
+        ValueError: If not exactly one of `signature` and `abi_file`, or of `output` and `shard_dir`, is given.
+
+    Example:
+        >>> with open("decoded.ndjson", "w") as output:
+        ...     parallel_decode("calldata.txt", "transfer(address to, uint256 amount)", output=output, workers=8)
+        50000000
+    """
+    if (signature is None) == (abi_file is None):
+        msg = "Exactly one of signature or abi_file is required"
+        raise ValueError(msg)
+    if (output is None) == (shard_dir is None):
+        msg = "Exactly one of output or shard_dir is required"
+        raise ValueError(msg)
+
+    workers = max(1, workers or os.cpu_count() or 1)
+    if chunk_bytes is None:
+        size = Path(path).stat().st_size
+        chunk_bytes = max(_MIN_CHUNK_BYTES, min(DEFAULT_DECODE_CHUNK_BYTES, size // (4 * workers) + 1))
+    ranges = byte_ranges(path, chunk_bytes)
+    shards: list[Optional[str]] = [None] * len(ranges)
+    if shard_dir is not None:
+        Path(shard_dir).mkdir(parents=True, exist_ok=True)
+        shards = [str(shard_path(shard_dir, index, output_format)) for index in range(len(ranges))]
+
+    columns = SELECTOR_COLUMNS if abi_file is not None else input_columns(signature)  # type: ignore[arg-type]
+    if output is not None and output_format == "csv":
+        write_csv([], output, columns)
+    elif output is not None and output_format == "json":
+        output.write("[")
+
+    count = 0
+    with ProcessPoolExecutor(
+        max_workers=min(workers, max(1, len(ranges))),
+        initializer=_init_worker,
+        initargs=(signature, None if abi_file is None else str(abi_file), with_selector),
+    ) as pool:
+        pending: deque[Future] = deque()
+
+        def results() -> Iterator[tuple[int, str]]:
+            for (start, end), shard in zip(ranges, shards):
+                pending.append(pool.submit(_decode_range, str(path), start, end, output_format, shard))
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+        for rows, text in results():
+            if output is not None and text:
+                if output_format == "json":
+                    # * NDJSON lines never hold a raw newline, so they become array elements by swapping the separator
+                    text = ("," if count else "") + text.rstrip("\n").replace("\n", ",")
+                output.write(text)
+            count += rows
+
+    if output is not None and output_format == "json":
+        output.write("]\n")
+    return count
@@ -0,0 +1,214 @@
+import json
+import threading
+import time
+from collections.abc import Generator
+from contextlib import contextmanager
+from typing import Any, Optional
+
+# * Taken when `ape_utils` is first imported, the `startup` stage is measured from here
+STARTED_AT: float = time.perf_counter()
+
+# * Counters recorded by the HTTP clients and their retries, with their OpenMetrics help text
+COUNTERS: dict[str, str] = {
+    "http_requests": "HTTP requests sent to nodes.",
+    "rpc_requests": "JSON-RPC requests sent to nodes, counting every request of a batch.",
+    "rpc_bytes_sent": "Bytes of JSON-RPC request bodies sent.",
+    "rpc_bytes_received": "Bytes of JSON-RPC response bodies received.",
+    "rpc_retries": "HTTP requests sent again after a timeout, connection error or throttled answer.",
+    "rpc_throttled": "HTTP requests a node answered with a rate limit error.",
+    "rpc_failovers": "HTTP requests moved on to the next fallback node after running out of retries.",
+}
+
+
+class Profiler:
+    """
+    Records per-stage wall times, RPC counters and cache hit rates of a single run.
+
+    Disabled by default, in which case every method returns at once, so the instrumented code
+    paths cost next to nothing. The CLI enables the global `PROFILER` with `--profile`.
+
+    Stages are named phases such as `network`, `abi` or `rpc`; a stage entered several times
+    accumulates its wall time and count. Concurrent requests each add their own time, so the
+    `rpc` stage can exceed the wall time of the run.
+
+    Example:
+        >>> PROFILER.enable()
+        >>> with PROFILER.stage("rpc"):
+        ...     response = session.post(uri, json=payload)
+        >>> PROFILER.add("rpc_requests", len(payload))
+        >>> print(PROFILER.to_openmetrics())
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.stages: dict[str, list[float]] = {}
+        self.counters: dict[str, int] = dict.fromkeys(COUNTERS, 0)
+        self.caches: dict[str, list[int]] = {}
+        self._lock = threading.Lock()
+        self._mark = STARTED_AT
+
+    def enable(self) -> None:
+        """
+        Starts recording, keeping what was recorded before.
+        """
+        self.enabled = True
+
+    def reset(self) -> None:
+        """
+        Stops recording and forgets everything recorded.
+        """
+        self.enabled = False
+        with self._lock:
+            self.stages.clear()
+            self.counters = dict.fromkeys(COUNTERS, 0)
+            self.caches.clear()
+            self._mark = time.perf_counter()
+
+    def record(self, name: str, seconds: float) -> None:
+        """
+        Adds `seconds` of wall time to the stage `name`.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            stage = self.stages.setdefault(name, [0, 0.0])
+            stage[0] += 1
+            stage[1] += seconds
+
+    @contextmanager
+    def stage(self, name: str) -> Generator[None, None, None]:
+        """
+        Records the wall time of the `with` block under the stage `name`.
+        """
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def mark(self) -> None:
+        """
+        Starts the clock of the next `lap`.
+        """
+        self._mark = time.perf_counter()
+
+    def lap(self, name: str) -> None:
+        """
+        Records the time since the last `mark` or `lap` under the stage `name`, for phases without a single scope.
+        """
+        now = time.perf_counter()
+        self.record(name, now - self._mark)
+        self._mark = now
+
+    def add(self, name: str, value: int = 1) -> None:
+        """
+        Adds `value` to the counter `name`.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def cache(self, name: str, hits: int, misses: int) -> None:
+        """
+        Adds lookups of the cache `name` that were found (`hits`) or not (`misses`).
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            counts = self.caches.setdefault(name, [0, 0])
+            counts[0] += hits
+            counts[1] += misses
+
+    def report(self, extra_caches: Optional[dict[str, dict[str, int]]] = None) -> dict[str, Any]:
+        """
+        Returns everything recorded as plain values.
+
+        Args:
+            extra_caches (Optional[dict[str, dict[str, int]]]): Statistics of caches that keep their
+                own `hits` and `misses`, e.g. from `ape_utils.abi.abi_cache_info`.
+
+        Returns:
+            dict[str, Any]: The `stages` with their `count` and `seconds`, the `counters`, and the
+            `caches` with their `hits`, `misses` and `hit_rate`.
+        """
+        with self._lock:
+            caches: dict[str, dict[str, float]] = {
+                name: {"hits": hits, "misses": misses} for name, (hits, misses) in self.caches.items()
+            }
+            caches.update(
+                (name, {"hits": stats["hits"], "misses": stats["misses"]})
+                for name, stats in (extra_caches or {}).items()
+            )
+            for stats in caches.values():
+                lookups = stats["hits"] + stats["misses"]
+                stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+            return {
+                "stages": {
+                    name: {"count": int(count), "seconds": seconds} for name, (count, seconds) in self.stages.items()
+                },
+                "counters": dict(self.counters),
+                "caches": caches,
+            }
+
+    def to_json(self, extra_caches: Optional[dict[str, dict[str, int]]] = None) -> str:
+        """
+        Returns the `report` as a JSON document.
+        """
+        return json.dumps(self.report(extra_caches), indent=2)
+
+    def to_openmetrics(self, extra_caches: Optional[dict[str, dict[str, int]]] = None) -> str:
+        """
+        Returns the `report` in the OpenMetrics text format, ending with `# EOF`.
+
+        Example:
+            >>> print(PROFILER.to_openmetrics())
+            # TYPE ape_utils_stage_seconds counter
+            # UNIT ape_utils_stage_seconds seconds
+            # HELP ape_utils_stage_seconds Wall time spent in each stage.
+            ape_utils_stage_seconds_total{stage="network"} 1.92
+            ...
+            # EOF
+        """
+        report = self.report(extra_caches)
+        lines = [
+            "# TYPE ape_utils_stage_seconds counter",
+            "# UNIT ape_utils_stage_seconds seconds",
+            "# HELP ape_utils_stage_seconds Wall time spent in each stage.",
+        ]
+        lines.extend(
+            f'ape_utils_stage_seconds_total{{stage="{name}"}} {stage["seconds"]}'
+            for name, stage in report["stages"].items()
+        )
+        lines += [
+            "# TYPE ape_utils_stage_entries counter",
+            "# HELP ape_utils_stage_entries Times each stage was entered.",
+        ]
+        lines.extend(
+            f'ape_utils_stage_entries_total{{stage="{name}"}} {stage["count"]}'
+            for name, stage in report["stages"].items()
+        )
+        for name, value in report["counters"].items():
+            lines += [
+                f"# TYPE ape_utils_{name} counter",
+                f"# HELP ape_utils_{name} {COUNTERS.get(name, name)}",
+                f"ape_utils_{name}_total {value}",
+            ]
+        for kind, verb in (("hits", "were found"), ("misses", "missed")):
+            lines += [
+                f"# TYPE ape_utils_cache_{kind} counter",
+                f"# HELP ape_utils_cache_{kind} Cache lookups that {verb}.",
+            ]
+            lines.extend(
+                f'ape_utils_cache_{kind}_total{{cache="{name}"}} {stats[kind]}'
+                for name, stats in report["caches"].items()
+            )
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+# * The profiler every instrumented code path records to
+PROFILER = Profiler()
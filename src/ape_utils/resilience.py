@@ -0,0 +1,335 @@
+import asyncio
+import random
+import threading
+import time
+from collections.abc import Sequence
+from typing import Any, Callable, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from ape_utils.constants import (
+    DEFAULT_BACKOFF,
+    DEFAULT_FAILOVER_COOLDOWN,
+    DEFAULT_MAX_BACKOFF,
+    DEFAULT_MIN_RPC_RATE,
+    DEFAULT_RETRIES,
+)
+from ape_utils.profiling import PROFILER
+
+# * HTTP statuses worth sending the same request again for, 429 being the one providers throttle with
+RETRY_STATUSES: frozenset[int] = frozenset({408, 429, 502, 503, 504})
+THROTTLED_STATUS: int = 429
+# * Infura and others answer `200 OK` with this JSON-RPC error code once a rate limit is exceeded
+THROTTLED_RPC_CODE: bytes = b"-32005"
+
+# * Requests per second won back by every successful request once throttled, about 5% of the rate a second
+_RECOVERY: float = 0.05
+
+
+def endpoint_label(uri: str) -> str:
+    """
+    Returns the scheme, host and port of a node URI, leaving out API keys in the path or credentials.
+
+    Example:
+        >>> endpoint_label("https://mainnet.infura.io/v3/<key>")
+        'https://mainnet.infura.io'
+    """
+    parts = urlsplit(uri)
+    host = parts.hostname or ""
+    return f"{parts.scheme}://{host}" + (f":{parts.port}" if parts.port else "")
+
+
+class RateLimiter:
+    """
+    Token bucket limiting the requests sent to a single node, adapting its rate to throttling.
+
+    Without a `rate` the bucket lets every request through until the node throttles for the first
+    time. Every throttled response halves the rate, starting from the rate actually observed, down
+    to `min_rate`, and every successful request wins back a little of it, up to the configured
+    `rate`. The limiter also keeps the counters of the requests it saw, see `stats`.
+
+    It is shared by threads and event loops: `reserve` takes a token under a lock and returns how
+    long to wait for it, which `acquire` sleeps and `aacquire` awaits.
+
+    Example:
+        >>> limiter = RateLimiter(rate=25)
+        >>> limiter.acquire()
+        >>> response = session.post(uri, json=payload)
+        >>> limiter.throttled() if response.status_code == 429 else limiter.succeeded()
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        min_rate: float = DEFAULT_MIN_RPC_RATE,
+        cooldown: float = DEFAULT_FAILOVER_COOLDOWN,
+    ) -> None:
+        self.rate = rate
+        self.max_rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.cooldown = cooldown
+        self.counters: dict[str, float] = dict.fromkeys(
+            ("requests", "retries", "throttled", "failures", "failovers", "wait_seconds"), 0
+        )
+        self._lock = threading.Lock()
+        self._tokens = self._capacity()
+        self._updated = time.monotonic()
+        self._window_start = self._updated
+        self._window_requests = 0
+        self._observed: Optional[float] = None
+        self._down_until = 0.0
+
+    def _capacity(self) -> float:
+        if self.burst is not None:
+            return self.burst
+        return max(1.0, self.rate or 1.0)
+
+    def _observe(self, now: float) -> None:
+        elapsed = now - self._window_start
+        if elapsed >= 1.0:
+            self._observed = self._window_requests / elapsed
+            self._window_start = now
+            self._window_requests = 0
+        self._window_requests += 1
+
+    def reserve(self) -> float:
+        """
+        Takes a token and returns the seconds to wait before the request may be sent.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._observe(now)
+            self.counters["requests"] += 1
+            if self.rate is None:
+                return 0.0
+            self._tokens = min(self._capacity(), self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = max(0.0, -self._tokens / self.rate)
+            self.counters["wait_seconds"] += wait
+            return wait
+
+    def acquire(self) -> None:
+        """
+        Blocks the thread until the next request may be sent.
+        """
+        wait = self.reserve()
+        if wait:
+            time.sleep(wait)
+
+    async def aacquire(self) -> None:
+        """
+        Waits in the event loop until the next request may be sent.
+        """
+        wait = self.reserve()
+        if wait:
+            await asyncio.sleep(wait)
+
+    def throttled(self) -> None:
+        """
+        Halves the rate after the node answered that requests come too fast.
+        """
+        with self._lock:
+            self.counters["throttled"] += 1
+            now = time.monotonic()
+            # * Requests still in the current window count when the first throttling comes before a full one
+            observed = self._observed or self._window_requests / max(now - self._window_start, 1.0)
+            current = observed if self.rate is None else min(self.rate, observed or self.rate)
+            self.rate = max(self.min_rate, current / 2)
+            # * Requests already queued on the bucket are spread out at the new rate
+            self._tokens = min(self._tokens, 0.0)
+            self._updated = now
+        PROFILER.add("rpc_throttled")
+
+    def succeeded(self) -> None:
+        """
+        Wins back some of the rate after a successful request.
+        """
+        if self.rate is None:
+            return
+        with self._lock:
+            rate = self.rate + _RECOVERY
+            self.rate = rate if self.max_rate is None else min(self.max_rate, rate)
+
+    def retried(self) -> None:
+        """
+        Counts a request sent again after a retryable error.
+        """
+        with self._lock:
+            self.counters["retries"] += 1
+        PROFILER.add("rpc_retries")
+
+    def failed(self) -> None:
+        """
+        Marks the node as down for `cooldown` seconds after a request ran out of retries on it.
+        """
+        with self._lock:
+            self.counters["failures"] += 1
+            self._down_until = time.monotonic() + self.cooldown
+
+    def failed_over(self) -> None:
+        """
+        Counts a request moved on to the next node after failing on this one.
+        """
+        with self._lock:
+            self.counters["failovers"] += 1
+        PROFILER.add("rpc_failovers")
+
+    @property
+    def available(self) -> bool:
+        """
+        Whether the node did not run out of retries within the last `cooldown` seconds.
+        """
+        return time.monotonic() >= self._down_until
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Returns the counters, the current `rate` (`None` while unlimited) and whether the node is `available`.
+        """
+        with self._lock:
+            stats: dict[str, Any] = dict(self.counters)
+            stats["rate"] = self.rate
+        stats["available"] = self.available
+        return stats
+
+
+class RetryPolicy:
+    """
+    How often and how long to wait before a failed request is sent again.
+
+    The delays grow exponentially from `backoff` seconds and are drawn at random below that bound
+    ("full jitter"), so clients throttled together do not retry in lockstep. A `Retry-After` given
+    by the node is waited at least, as long as it stays within `max_backoff`.
+
+    Example:
+        >>> policy = RetryPolicy(retries=3, backoff=0.5)
+        >>> [policy.delay(attempt) <= 0.5 * 2**attempt for attempt in range(3)]
+        [True, True, True]
+    """
+
+    def __init__(
+        self, retries: int = DEFAULT_RETRIES, backoff: float = DEFAULT_BACKOFF, max_backoff: float = DEFAULT_MAX_BACKOFF
+    ) -> None:
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Returns the seconds to wait after the failed `attempt`, counted from 0.
+        """
+        delay = random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))  # noqa: S311
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_backoff))
+        return delay
+
+
+def retry_after(headers: Any) -> Optional[float]:
+    """
+    Returns the seconds of a `Retry-After` header, or `None` if there is none or it holds a date.
+    """
+    value = headers.get("Retry-After") if headers is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def is_throttled(response: requests.Response) -> bool:
+    """
+    Whether a node answered that requests come too fast, with a 429 status or a JSON-RPC rate limit error.
+    """
+    if response.status_code == THROTTLED_STATUS:
+        return True
+    if response.status_code != 200 or THROTTLED_RPC_CODE not in response.content:  # noqa: PLR2004
+        return False
+    # * The code is shared with "query returned more than 10000 results", which no retry helps with
+    return b"rate" in response.content.lower()
+
+
+def is_throttled_error(error: Any) -> bool:
+    """
+    Whether a JSON-RPC error object is a rate limit error, by the same rule as `is_throttled`.
+    """
+    if not isinstance(error, dict) or str(error.get("code")) != THROTTLED_RPC_CODE.decode():
+        return False
+    return "rate" in str(error.get("message", "")).lower()
+
+
+class ResilientAdapter(HTTPAdapter):
+    """
+    Requests transport adapter that rate limits, retries and fails over every request it sends.
+
+    Each request goes through the `RateLimiter` of its node first. Timeouts, connection errors,
+    throttled answers and the statuses in `RETRY_STATUSES` are retried following the `RetryPolicy`.
+    Once a node runs out of retries the request moves on to the next of its `fallbacks`, in order,
+    and the node is tried last for a while. The last response, or the last error, is returned
+    when every node failed.
+
+    Since it works below `requests`, it covers Web3 clients and JSON-RPC batches alike.
+
+    Args:
+        uri (str): The HTTP URI of the node the session of the adapter talks to.
+        limiter_for (Callable[[str], RateLimiter]): Returns the limiter of a node URI.
+        policy (RetryPolicy): The retries and backoff of every node.
+        endpoints (Callable[[str], Sequence[str]]): Returns the node URIs to try for `uri`, in order.
+        **kwargs: Passed on to `HTTPAdapter`, e.g. `pool_maxsize`.
+    """
+
+    def __init__(
+        self,
+        uri: str,
+        limiter_for: Callable[[str], RateLimiter],
+        policy: RetryPolicy,
+        endpoints: Callable[[str], Sequence[str]],
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        self.uri = uri
+        self.limiter_for = limiter_for
+        self.policy = policy
+        self.endpoints = endpoints
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:  # type: ignore[override]
+        error: Optional[Exception] = None
+        response: Optional[requests.Response] = None
+        original = request
+        uris = self.endpoints(self.uri)
+        for index, uri in enumerate(uris):
+            if index:
+                self.limiter_for(uris[index - 1]).failed_over()
+            request = original
+            if uri != self.uri:
+                request = original.copy()
+                request.url = uri
+            limiter = self.limiter_for(uri)
+            for attempt in range(self.policy.retries + 1):
+                if attempt:
+                    limiter.retried()
+                if response is not None:
+                    # * Releases the connection of the answer that is thrown away
+                    response.close()
+                limiter.acquire()
+                wait = None
+                try:
+                    response = super().send(request, **kwargs)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    error, response = e, None
+                else:
+                    error = None
+                    if is_throttled(response):
+                        limiter.throttled()
+                        wait = retry_after(response.headers)
+                    elif response.status_code not in RETRY_STATUSES:
+                        limiter.succeeded()
+                        return response
+                if attempt < self.policy.retries:
+                    time.sleep(self.policy.delay(attempt, wait))
+            limiter.failed()
+        if error is not None:
+            raise error
+        return response  # type: ignore[return-value]
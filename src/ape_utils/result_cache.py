@@ -0,0 +1,178 @@
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Optional, Union
+
+from ape_utils.profiling import PROFILER
+
+# * Where block-pinned results are stored unless a path is given
+DEFAULT_CACHE_PATH: Path = Path(
+    os.environ.get("APE_UTILS_CACHE", Path.home() / ".cache" / "ape_utils" / "results.sqlite")
+)
+DEFAULT_CACHE_SIZE: int = 256 * 1024 * 1024
+
+# * Kinds of cached results
+CALL = "call"
+STORAGE = "storage"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    chain_id INTEGER NOT NULL,
+    block INTEGER NOT NULL,
+    address TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    key BLOB NOT NULL,
+    value BLOB NOT NULL,
+    accessed REAL NOT NULL,
+    PRIMARY KEY (chain_id, block, address, kind, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed);
+"""
+_SELECT = "SELECT key, value FROM results WHERE chain_id = ? AND block = ? AND address = ? AND kind = ?"
+_SIZE = "SELECT COALESCE(SUM(LENGTH(value)), 0) FROM results"
+
+
+class ResultCache:
+    """
+    Persistent SQLite cache of raw `eth_call` outputs and storage values at fixed blocks.
+
+    Results at a fixed block never change, so they are keyed by chain id, block, address
+    and the calldata or slot, and served from disk on later runs. When the stored values
+    exceed `max_bytes`, the least recently used entries are evicted.
+
+    Example:
+        >>> cache = ResultCache()
+        >>> read_storage(address, 0, block_identifier=19_000_000, cache=cache)
+    """
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_CACHE_PATH, max_bytes: int = DEFAULT_CACHE_SIZE) -> None:
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.executescript(_SCHEMA)
+        self._size: int = self._stored_size()
+
+    def _stored_size(self, where: str = "", parameters: tuple = ()) -> int:
+        return int(self._connection.execute(f"{_SIZE} {where}", parameters).fetchone()[0])
+
+    def get_many(self, chain_id: int, block: int, address: str, kind: str, keys: Iterable[bytes]) -> dict[bytes, bytes]:
+        """
+        Returns the cached values of the given keys, leaving out the keys that are not cached.
+
+        Args:
+            chain_id (int): The chain id of the network.
+            block (int): The block number the values were read at.
+            address (str): The address of the contract.
+            kind (str): `CALL` for calldata keys or `STORAGE` for slot keys.
+            keys (Iterable[bytes]): The calldata or the 32-byte slots to look up.
+
+        Returns:
+            dict[bytes, bytes]: The cached value of every key found.
+        """
+        keys = list(keys)
+        if not keys:
+            return {}
+        address = address.lower()
+        found: dict[bytes, bytes] = {}
+        with self._lock:
+            # * Stay below SQLite's limit on the number of bound parameters
+            for start in range(0, len(keys), 500):
+                chunk = keys[start : start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                query = f"{_SELECT} AND key IN ({placeholders})"
+                rows = self._connection.execute(query, (chain_id, block, address, kind, *chunk))
+                found.update((bytes(key), bytes(value)) for key, value in rows)
+            if found:
+                self._connection.executemany(
+                    "UPDATE results SET accessed = ? "
+                    "WHERE chain_id = ? AND block = ? AND address = ? AND kind = ? AND key = ?",
+                    ((time.time(), chain_id, block, address, kind, key) for key in found),
+                )
+                self._connection.commit()
+        PROFILER.cache("results", len(found), len(keys) - len(found))
+        return found
+
+    def get(self, chain_id: int, block: int, address: str, kind: str, key: bytes) -> Optional[bytes]:
+        """
+        Returns the cached value of a single key, or `None` if it is not cached.
+        """
+        return self.get_many(chain_id, block, address, kind, [key]).get(key)
+
+    def set_many(
+        self, chain_id: int, block: int, address: str, kind: str, items: Iterable[tuple[bytes, bytes]]
+    ) -> None:
+        """
+        Stores values in the cache, evicting the least recently used entries if it grows past `max_bytes`.
+
+        Args:
+            chain_id (int): The chain id of the network.
+            block (int): The block number the values were read at.
+            address (str): The address of the contract.
+            kind (str): `CALL` for calldata keys or `STORAGE` for slot keys.
+            items (Iterable[tuple[bytes, bytes]]): The `(key, value)` pairs to store.
+        """
+        address = address.lower()
+        now = time.time()
+        rows = [(chain_id, block, address, kind, key, value, now) for key, value in items]
+        with self._lock:
+            # * Values of keys stored again are replaced, so their old size is no longer part of the cache
+            for start in range(0, len(rows), 500):
+                keys = [row[4] for row in rows[start : start + 500]]
+                placeholders = ",".join("?" * len(keys))
+                where = f"WHERE chain_id = ? AND block = ? AND address = ? AND kind = ? AND key IN ({placeholders})"
+                self._size -= self._stored_size(where, (chain_id, block, address, kind, *keys))
+            self._connection.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            self._connection.commit()
+            self._size += sum(len(row[5]) for row in rows)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def set(self, chain_id: int, block: int, address: str, kind: str, key: bytes, value: bytes) -> None:  # noqa: PLR0917
+        """
+        Stores a single value in the cache.
+        """
+        self.set_many(chain_id, block, address, kind, [(key, value)])
+
+    def _evict(self) -> None:
+        # * Drop the least recently used entries until the cache is back to 90% of its budget
+        target = self.max_bytes * 9 // 10
+        excess = self._size - target
+        cursor = self._connection.execute("SELECT accessed, LENGTH(value) FROM results ORDER BY accessed")
+        cutoff = None
+        for accessed, size in cursor:
+            excess -= size
+            cutoff = accessed
+            if excess <= 0:
+                break
+        if cutoff is not None:
+            self._connection.execute("DELETE FROM results WHERE accessed <= ?", (cutoff,))
+            self._connection.commit()
+        self._size = self._stored_size()
+
+    @property
+    def size(self) -> int:
+        """
+        The total size in bytes of the cached values.
+        """
+        return self._size
+
+    def clear(self) -> None:
+        """
+        Removes every cached value.
+        """
+        with self._lock:
+            self._connection.execute("DELETE FROM results")
+            self._connection.commit()
+            self._size = 0
+
+    def close(self) -> None:
+        """
+        Closes the underlying SQLite connection.
+        """
+        with self._lock:
+            self._connection.close()
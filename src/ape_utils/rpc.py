@@ -0,0 +1,98 @@
+from collections.abc import Sequence
+from typing import Any, Optional, Union
+
+from web3 import HTTPProvider
+
+from ape_utils.clients import get_session, get_timeout
+from ape_utils.constants import DEFAULT_RPC_BATCH_SIZE
+
+
+class RPCError(RuntimeError):
+    """
+    Raised when a node answers a JSON-RPC request with an error object.
+    """
+
+    def __init__(self, method: str, error: dict) -> None:
+        self.method = method
+        self.code = error.get("code")
+        self.error_message = error.get("message", "")
+        super().__init__(f"{method} failed with {self.code}: {self.error_message}")
+
+
+def provider_http_uri(provider: Any) -> Optional[str]:
+    """
+    Returns the HTTP URI behind a connected Ape provider, or `None` if it does not talk JSON-RPC over HTTP.
+
+    In-process providers such as Ape's `test` provider have no node to batch requests to.
+    """
+    try:
+        web3_provider = provider.web3.provider
+    except Exception:
+        return None
+    if isinstance(web3_provider, HTTPProvider):
+        return str(web3_provider.endpoint_uri)
+    return None
+
+
+def rpc_batch(
+    uri: str, requests: Sequence[tuple[str, list[Any]]], batch_size: int = DEFAULT_RPC_BATCH_SIZE
+) -> list[Any]:
+    """
+    Sends JSON-RPC requests to a node as batch payloads and returns their results in order.
+
+    The requests are split into payloads of at most `batch_size` requests, each sent in one
+    HTTP round-trip over the pooled session of `ape_utils.clients`.
+
+    Args:
+        uri (str): The HTTP URI of the node.
+        requests (Sequence[tuple[str, list[Any]]]): The `(method, params)` of every request.
+        batch_size (int): The maximum number of requests per payload.
+
+    Returns:
+        list[Any]: The `result` of every request, in input order.
+
+    Raises:
+        RPCError: If any request is answered with an error.
+
+    Example:
+        >>> rpc_batch(provider.uri, [("eth_getStorageAt", [address, hex(slot), "latest"]) for slot in range(4)])
+        ['0x00...01', '0x00...00', '0x00...00', '0x00...00']
+    """
+    results = rpc_batch_results(uri, requests, batch_size)
+    for result in results:
+        if isinstance(result, RPCError):
+            raise result
+    return results
+
+
+def rpc_batch_results(
+    uri: str, requests: Sequence[tuple[str, list[Any]]], batch_size: int = DEFAULT_RPC_BATCH_SIZE
+) -> list[Union[Any, RPCError]]:
+    """
+    Like `rpc_batch`, but returns the `RPCError` of every failed request in its place instead of raising.
+
+    Useful when requests fail independently, e.g. an `eth_call` that reverts at some blocks only.
+
+    Raises:
+        RPCError: If the node rejects a whole payload.
+    """
+    session = get_session(uri)
+    results: list[Any] = []
+    for start in range(0, len(requests), batch_size):
+        chunk = requests[start : start + batch_size]
+        payload = [
+            {"jsonrpc": "2.0", "id": index, "method": method, "params": params}
+            for index, (method, params) in enumerate(chunk)
+        ]
+        response = session.post(uri, json=payload, timeout=get_timeout())
+        response.raise_for_status()
+        answers = response.json()
+        if isinstance(answers, dict):
+            # * Nodes answer with a single error object when they reject the whole batch
+            raise RPCError(chunk[0][0], answers.get("error", {}))
+
+        by_id = {answer.get("id"): answer for answer in answers}
+        for index, (method, _) in enumerate(chunk):
+            answer = by_id.get(index, {"error": {"message": "missing from the batch response"}})
+            results.append(RPCError(method, answer["error"]) if "error" in answer else answer["result"])
+    return results
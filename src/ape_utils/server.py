@@ -0,0 +1,264 @@
+import json
+import os
+import socket
+import socketserver
+import sys
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any, Callable, Optional, TextIO, Union
+
+from ape_utils.codec import abi_decode_calldata, abi_encode_calldata, decode_calldata, encode_calldata
+from ape_utils.streaming import from_typed_value, to_json_value, to_typed_value
+
+# * Where `ape_utils serve` listens unless a path is given, the CLI forwards to it when it exists
+DEFAULT_SOCKET_PATH: Path = Path(
+    os.environ.get("APE_UTILS_SOCKET", Path.home() / ".cache" / "ape_utils" / "serve.sock")
+)
+# * How long the CLI waits for the worker to accept a forwarded request, and then to answer it,
+# * before it gives up on the worker and runs the request itself
+DEFAULT_CONNECT_TIMEOUT: float = 1.0
+DEFAULT_FORWARD_TIMEOUT: float = 10.0
+
+
+class Worker:
+    """
+    Answers JSON requests with a warm Ape process, a connected provider and the parsed-ABI caches.
+
+    A request is a JSON object with an `op` and its parameters, plus an optional `id` echoed back:
+
+    - `{"op": "encode" | "abi_encode", "signature": ..., "args": [...]}`
+    - `{"op": "decode" | "abi_decode", "signature": ..., "calldata": "0x..."}`
+    - `{"op": "call", "function_sig": ..., "address": ..., "args": [...], "block": null, "network": ...}`
+    - `{"op": "read", "address": ..., "slots": [...], "block": null, "network": ...}`
+    - `{"op": "ping"}`
+
+    The response is `{"ok": true, "result": ...}` with the result as JSON values, or
+    `{"ok": false, "error": "..."}`. Requests for another network than the connected one are
+    answered with `"fallback": true` so the client runs them itself. A request with `"typed": true`
+    gets its result as `to_typed_value` values instead, which the client rebuilds with the exact
+    types the command prints when it runs locally.
+
+    Example:
+        >>> worker = Worker(provider)
+        >>> worker.handle({"op": "encode", "signature": "transfer(address,uint256)", "args": [to, 1]})
+        {'ok': True, 'result': '0xa9059cbb...'}
+    """
+
+    def __init__(self, provider: Any, cache: Optional[Any] = None) -> None:
+        self.provider = provider
+        self.cache = cache
+        # * Whether each `--network` choice resolves to the connected provider, resolved once per choice
+        self._serves: dict[str, bool] = {}
+        self.operations: dict[str, Callable[[dict], Any]] = {
+            "ping": self.ping,
+            "encode": lambda request: encode_calldata(request["signature"], *request.get("args", [])),
+            "abi_encode": lambda request: abi_encode_calldata(request["signature"], *request.get("args", [])),
+            "decode": lambda request: decode_calldata(request["signature"], request["calldata"]),
+            "abi_decode": lambda request: abi_decode_calldata(request["signature"], request["calldata"]),
+            "call": self.call,
+            "read": self.read,
+        }
+
+    def serves(self, network: Optional[str]) -> bool:
+        """
+        Returns whether `network`, a choice such as ":sepolia:infura", resolves to the connected provider.
+
+        Resolving a choice loads the network, so the answer is kept for the later requests of the same choice.
+        """
+        if network is None or self.provider is None:
+            return network is None
+        if network not in self._serves:
+            import ape  # noqa: PLC0415
+
+            try:
+                requested = ape.networks.get_provider_from_choice(network)
+            except Exception:
+                self._serves[network] = False
+            else:
+                self._serves[network] = bool(requested.network_choice == self.provider.network_choice)
+        return self._serves[network]
+
+    def ping(self, _: dict) -> dict:
+        return {"pid": os.getpid(), "network": None if self.provider is None else self.provider.network_choice}
+
+    def call(self, request: dict) -> Any:
+        from ape_utils.utils import call_view_function  # noqa: PLC0415
+
+        block = request.get("block")
+        return call_view_function(
+            request["function_sig"],
+            request["address"],
+            list(request.get("args", [])),
+            self.provider,
+            block_identifier=block,
+            cache=self.cache if request.get("cache", True) else None,
+            raw_output=request.get("raw_output", False),
+        )
+
+    def read(self, request: dict) -> list[bytes]:
+        from ape_utils.utils import read_storage_many  # noqa: PLC0415
+
+        block = request.get("block")
+        return read_storage_many(
+            request["address"],
+            request["slots"],
+            block_identifier="latest" if block is None else block,
+            cache=self.cache if request.get("cache", True) else None,
+        )
+
+    def handle(self, request: dict) -> dict:
+        """
+        Answers a single request, never raising.
+
+        Args:
+            request (dict): The request object.
+
+        Returns:
+            dict: The response object, with the `id` of the request if it has one.
+        """
+        response: dict[str, Any]
+        operation = self.operations.get(request.get("op", ""))
+        if operation is None:
+            response = {"ok": False, "error": f"Unknown op {request.get('op')!r}"}
+        elif request.get("op") in {"call", "read"} and not self.serves(request.get("network")):
+            response = {"ok": False, "error": "The worker is connected to another network", "fallback": True}
+        else:
+            try:
+                result = operation(request)
+            except Exception as e:
+                response = {"ok": False, "error": str(e)}
+            else:
+                response = result_response(request, result)
+        if "id" in request:
+            response["id"] = request["id"]
+        return response
+
+    def serve_lines(self, lines: Iterable[Union[str, bytes]], output: TextIO) -> int:
+        """
+        Answers JSON-lines requests, writing one response line per request line.
+
+        Args:
+            lines (Iterable[Union[str, bytes]]): The request lines, e.g. `sys.stdin`. Blank lines are skipped.
+            output (TextIO): The text stream to write the responses to.
+
+        Returns:
+            int: The number of requests answered.
+        """
+        count = 0
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                response = self.handle(json.loads(line))
+            except json.JSONDecodeError as e:
+                response = {"ok": False, "error": f"Invalid JSON: {e}"}
+            output.write(json.dumps(response, separators=(",", ":")))
+            output.write("\n")
+            output.flush()
+            count += 1
+        return count
+
+    def serve_socket(self, path: Union[str, Path] = DEFAULT_SOCKET_PATH) -> None:
+        """
+        Answers JSON-lines requests on a Unix socket until interrupted, one thread per connection.
+
+        The socket file is removed when the worker stops.
+
+        Args:
+            path (Union[str, Path]): The path of the Unix socket.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.unlink(missing_ok=True)
+        worker = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                output = self.wfile
+                for line in self.rfile:
+                    if not line.strip():
+                        continue
+                    try:
+                        response = worker.handle(json.loads(line))
+                    except json.JSONDecodeError as e:
+                        response = {"ok": False, "error": f"Invalid JSON: {e}"}
+                    output.write(json.dumps(response, separators=(",", ":")).encode() + b"\n")
+                    output.flush()
+
+        server = socketserver.ThreadingUnixStreamServer(str(path), Handler)
+        server.daemon_threads = True
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+            path.unlink(missing_ok=True)
+
+
+def result_response(request: dict, result: Any) -> dict:
+    """
+    Returns the response to a request that succeeded, with typed values if the request asks for them.
+
+    A result that cannot be sent with its types is answered with `"fallback": true`, so the client runs
+    the request itself rather than print different values.
+    """
+    if not request.get("typed"):
+        return {"ok": True, "result": to_json_value(result)}
+    try:
+        return {"ok": True, "result": to_typed_value(result)}
+    except TypeError as e:
+        return {"ok": False, "error": str(e), "fallback": True}
+
+
+def from_typed_response(response: dict) -> dict:
+    """
+    Rebuilds the result of a response to a typed request, see `result_response`.
+    """
+    return {**response, "result": from_typed_value(response["result"])} if response.get("ok") else response
+
+
+def forward(
+    request: dict,
+    path: Union[str, Path] = DEFAULT_SOCKET_PATH,
+    timeout: float = DEFAULT_FORWARD_TIMEOUT,
+    connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+) -> Optional[dict]:
+    """
+    Sends a request to a running `ape_utils serve` worker.
+
+    The request is sent as a typed request, so the result has the types the command would compute
+    itself. If the worker does not accept the request or answer it in time, a notice is printed to
+    stderr and `None` is returned.
+
+    Args:
+        request (dict): The request object, see `Worker`.
+        path (Union[str, Path]): The path of the worker's Unix socket.
+        timeout (float): Seconds to wait for the response.
+        connect_timeout (float): Seconds to wait for the worker to accept the connection.
+
+    Returns:
+        Optional[dict]: The response, or `None` if no worker is running or it cannot serve the
+        request, in which case the caller runs it itself.
+
+    Example:
+        >>> forward({"op": "decode", "signature": "f(uint256 a)", "calldata": "0x..."})
+        {'ok': True, 'result': {'a': 1234}}
+    """
+    path = Path(path)
+    if not path.exists():
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(connect_timeout)
+            client.connect(str(path))
+            client.settimeout(timeout)
+            client.sendall(json.dumps({**request, "typed": True}).encode() + b"\n")
+            with client.makefile("rb") as responses:
+                line = responses.readline()
+    except OSError as e:
+        sys.stderr.write(f"The ape_utils serve worker at {path} did not answer ({e}), running locally.\n")
+        return None
+    if not line:
+        sys.stderr.write(f"The ape_utils serve worker at {path} closed the connection, running locally.\n")
+        return None
+    response = json.loads(line)
+    return None if response.get("fallback") else from_typed_response(response)
@@ -0,0 +1,280 @@
+import mmap
+import os
+from collections.abc import Iterable, Iterator, Sequence
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from ape import networks
+from eth_hash.auto import keccak
+from eth_utils import to_canonical_address
+
+from ape_utils.rpc import DEFAULT_RPC_BATCH_SIZE
+from ape_utils.storage import SLOT_SIZE, mapping_slots
+from ape_utils.utils import read_storage_many
+
+# * Where snapshots of block-pinned storage are kept unless a directory is given
+DEFAULT_SNAPSHOT_DIR: Path = Path(
+    os.environ.get("APE_UTILS_SNAPSHOTS", Path.home() / ".cache" / "ape_utils" / "snapshots")
+)
+
+# * A snapshot is a header of two 32-byte records, then the sorted slots, then their values, 32 bytes each
+MAGIC = b"APESNAP\x01"
+_HEADER_SIZE = 2 * SLOT_SIZE
+# * Values are compared a page at a time, unchanged pages cost a single comparison
+_PAGE_SIZE = 4096
+
+# * A changed slot is the slot, its value at the first block and its value at the second block
+SlotChange = tuple[int, bytes, bytes]
+
+
+class Snapshot:
+    """
+    Values of a set of storage slots of a contract at a block, as fixed 32-byte records in a memory map.
+
+    The map holds a header with the chain id, block, address and number of slots, then the
+    slots in ascending order, then their values in the same order. A snapshot written to a file
+    is mapped again on later runs instead of being read from the node, since storage at a fixed
+    block never changes, and only the pages that are touched are loaded.
+
+    Example:
+        >>> with snapshot_storage(token, range(64), 19_000_000) as snapshot:
+        ...     snapshot.get(5)
+    """
+
+    def __init__(self, buffer: mmap.mmap) -> None:
+        if buffer[: len(MAGIC)] != MAGIC:
+            msg = "Not an ape_utils storage snapshot"
+            raise ValueError(msg)
+        self.buffer = buffer
+        self.chain_id = int.from_bytes(buffer[8:16], "big")
+        self.block = int.from_bytes(buffer[16:24], "big")
+        self.count = int.from_bytes(buffer[24:32], "big")
+        self.address = f"0x{buffer[32:52].hex()}"
+        self._values_at = _HEADER_SIZE + self.count * SLOT_SIZE
+
+    @classmethod
+    def open(cls, path: Union[str, Path]) -> "Snapshot":
+        """
+        Maps a snapshot file read-only.
+        """
+        with Path(path).open("rb") as file:
+            return cls(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    @classmethod
+    def build(  # noqa: PLR0917
+        cls,
+        chain_id: int,
+        address: str,
+        block: int,
+        slots: Sequence[int],
+        values: Sequence[bytes],
+        path: Optional[Union[str, Path]] = None,
+    ) -> "Snapshot":
+        """
+        Writes a snapshot of `values` at ascending `slots`, to `path` or to anonymous memory without one.
+
+        The file is written next to `path` first and moved in place, so a reader never maps a partial snapshot.
+        """
+        size = _HEADER_SIZE + 2 * len(slots) * SLOT_SIZE
+        if path is None:
+            buffer = mmap.mmap(-1, size)
+            _write(buffer, chain_id, address, block, slots, values)
+            return cls(buffer)
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = path.with_name(f"{path.name}.{os.getpid()}.partial")
+        with partial.open("wb") as file:
+            _write(file, chain_id, address, block, slots, values)
+        partial.replace(path)
+        return cls.open(path)
+
+    @property
+    def slots(self) -> bytes:
+        """
+        The slots of the snapshot as consecutive 32-byte big-endian records.
+        """
+        return self.buffer[_HEADER_SIZE : self._values_at]
+
+    def slot(self, index: int) -> int:
+        """
+        Returns the `index`-th slot of the snapshot, in ascending order.
+        """
+        start = _HEADER_SIZE + index * SLOT_SIZE
+        return int.from_bytes(self.buffer[start : start + SLOT_SIZE], "big")
+
+    def value(self, index: int) -> bytes:
+        """
+        Returns the value of the `index`-th slot of the snapshot.
+        """
+        start = self._values_at + index * SLOT_SIZE
+        return self.buffer[start : start + SLOT_SIZE]
+
+    def get(self, slot: int) -> Optional[bytes]:
+        """
+        Returns the value of a slot with a binary search over the slot records, or `None` if it is not in the snapshot.
+        """
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            current = self.slot(middle)
+            if current == slot:
+                return self.value(middle)
+            if current < slot:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[tuple[int, bytes]]:
+        for index in range(self.count):
+            yield self.slot(index), self.value(index)
+
+    def close(self) -> None:
+        """
+        Unmaps the snapshot.
+        """
+        self.buffer.close()
+
+    def __enter__(self) -> "Snapshot":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+
+def _write(  # noqa: PLR0917
+    output: Any, chain_id: int, address: str, block: int, slots: Sequence[int], values: Sequence[bytes]
+) -> None:
+    output.write(MAGIC + chain_id.to_bytes(8, "big") + block.to_bytes(8, "big") + len(slots).to_bytes(8, "big"))
+    output.write(to_canonical_address(address).rjust(SLOT_SIZE - 12, b"\x00") + bytes(12))
+    output.write(b"".join(slot.to_bytes(SLOT_SIZE, "big") for slot in slots))
+    output.write(b"".join(bytes(value).rjust(SLOT_SIZE, b"\x00") for value in values))
+
+
+def slot_set(
+    slots: Iterable[int] = (),
+    mappings: Iterable[tuple[int, Iterable[Any]]] = (),
+    key_type: str = "address",
+) -> list[int]:
+    """
+    Returns the ascending, distinct slots of plain slots and of the keys of mappings.
+
+    Args:
+        slots (Iterable[int]): Plain slots, e.g. from `range` or `parse_slots`.
+        mappings (Iterable[tuple[int, Iterable[Any]]]): The declaration slot and the keys of every mapping.
+        key_type (str): The Solidity type of the mapping keys.
+
+    Returns:
+        list[int]: The slots to snapshot.
+
+    Example:
+        >>> # * the first 16 slots and the balances of two holders of an ERC20 with `_balances` at slot 0
+        >>> slot_set(range(16), [(0, [alice, bob])])
+    """
+    selected = set(slots)
+    for slot, keys in mappings:
+        selected.update(mapping_slots(keys, slot, key_type))
+    return sorted(selected)
+
+
+def snapshot_path(directory: Union[str, Path], chain_id: int, address: str, block: int, slots: Sequence[int]) -> Path:
+    """
+    Returns the file of the snapshot of `slots`, named after the chain, contract, block and a hash of the slots.
+    """
+    digest = keccak(b"".join(slot.to_bytes(SLOT_SIZE, "big") for slot in slots))[:8].hex()
+    return Path(directory) / f"{chain_id}-{address.lower()}-{block}-{digest}.snap"
+
+
+def snapshot_storage(
+    address: str,
+    slots: Iterable[int],
+    block: int,
+    *,
+    batch_size: int = DEFAULT_RPC_BATCH_SIZE,
+    directory: Optional[Union[str, Path]] = DEFAULT_SNAPSHOT_DIR,
+) -> Snapshot:
+    """
+    Snapshots storage slots of a contract at a block, reusing the snapshot file of an earlier run.
+
+    The slots are read with `read_storage_many`, so they cost one JSON-RPC batch payload per `batch_size` slots.
+
+    Args:
+        address (str): The address of the smart contract.
+        slots (Iterable[int]): The slots to snapshot, e.g. from `slot_set`.
+        block (int): The block number to read the storage at.
+        batch_size (int): The maximum number of requests sent in a single JSON-RPC payload.
+        directory (Optional[Union[str, Path]]): Where snapshot files are kept, `None` to keep the snapshot in memory.
+
+    Returns:
+        Snapshot: The values of the slots at `block`.
+    """
+    slots = sorted(set(slots))
+    chain_id = networks.provider.chain_id
+    path = None
+    if directory is not None:
+        path = snapshot_path(directory, chain_id, str(address), block, slots)
+        if path.exists():
+            return Snapshot.open(path)
+    values = read_storage_many(address, slots, batch_size, block)
+    return Snapshot.build(chain_id, str(address), block, slots, values, path)
+
+
+def diff_snapshots(before: Snapshot, after: Snapshot) -> Iterator[SlotChange]:
+    """
+    Yields the slots whose values differ between two snapshots of the same slots, in ascending order.
+
+    Raises:
+        ValueError: If the snapshots are not of the same slots.
+    """
+    if before.count != after.count or before.slots != after.slots:
+        msg = "Only snapshots of the same slots can be compared"
+        raise ValueError(msg)
+    start, end = before._values_at, before._values_at + before.count * SLOT_SIZE
+    for page in range(start, end, _PAGE_SIZE):
+        page_end = min(page + _PAGE_SIZE, end)
+        if before.buffer[page:page_end] == after.buffer[page:page_end]:
+            continue
+        for offset in range(page, page_end, SLOT_SIZE):
+            old, new = before.buffer[offset : offset + SLOT_SIZE], after.buffer[offset : offset + SLOT_SIZE]
+            if old != new:
+                yield before.slot((offset - start) // SLOT_SIZE), old, new
+
+
+def diff_storage(
+    address: str,
+    slots: Iterable[int],
+    from_block: int,
+    to_block: int,
+    *,
+    batch_size: int = DEFAULT_RPC_BATCH_SIZE,
+    directory: Optional[Union[str, Path]] = DEFAULT_SNAPSHOT_DIR,
+) -> Iterator[SlotChange]:
+    """
+    Yields the storage slots of a contract that changed between two blocks, with their old and new values.
+
+    Both blocks are snapshotted with `snapshot_storage`, so comparing more blocks, or comparing again,
+    reuses the snapshots already taken.
+
+    Args:
+        address (str): The address of the smart contract.
+        slots (Iterable[int]): The slots to compare, e.g. from `slot_set`.
+        from_block (int): The block of the old values.
+        to_block (int): The block of the new values.
+        batch_size (int): The maximum number of requests sent in a single JSON-RPC payload.
+        directory (Optional[Union[str, Path]]): Where snapshot files are kept, `None` to keep them in memory.
+
+    Yields:
+        SlotChange: The slot, its value at `from_block` and its value at `to_block`.
+
+    Example:
+        >>> for slot, old, new in diff_storage(proxy, slot_set(range(256)), 19_000_000, 19_100_000):
+        ...     print(hex(slot), old.hex(), new.hex())
+    """
+    slots = sorted(set(slots))
+    before = snapshot_storage(address, slots, from_block, batch_size=batch_size, directory=directory)
+    with before, snapshot_storage(address, slots, to_block, batch_size=batch_size, directory=directory) as after:
+        yield from diff_snapshots(before, after)
@@ -0,0 +1,218 @@
+import re
+from collections.abc import Sequence
+from functools import lru_cache
+from typing import Any, Callable, Optional
+
+from ape.types import HexBytes
+from eth_utils import is_checksum_address, keccak, to_checksum_address
+
+from ape_utils.abi import ABI_CACHE_SIZE, get_method_abi
+
+# * Every static value takes exactly one 32-byte word
+WORD_SIZE: int = 32
+
+INT_TYPE = re.compile(r"^(u?)int(\d*)$")
+_BYTES_TYPE = re.compile(r"^bytes(\d+)$")
+# * Matched with `fullmatch`, as `$` would let a trailing newline through where Ape rejects it
+_HEX_ADDRESS = re.compile(r"0x[0-9a-fA-F]{40}")
+_HEX_NUMBER = re.compile(r"0x[0-9a-fA-F]+")
+_HEX_BYTES = re.compile(r"0x(?:[0-9a-fA-F]{2})*")
+_EMPTY_WORD = bytes(WORD_SIZE)
+
+# * Writes a value into a 32-byte word of the buffer, returning False when Ape must convert it instead
+_Encoder = Callable[[memoryview, Any], bool]
+# * Reads a value from a 32-byte word, returning `_INVALID` when Ape must decode it to raise the right error
+_Decoder = Callable[[bytes], Any]
+_INVALID = object()
+
+
+def _int_codec(signed: bool, bits: int) -> tuple[_Encoder, _Decoder]:  # noqa: FBT001
+    low, high = (-(1 << (bits - 1)), (1 << (bits - 1)) - 1) if signed else (0, (1 << bits) - 1)
+
+    def encode(word: memoryview, value: Any) -> bool:
+        if isinstance(value, str) and value.isascii() and value.isdigit():
+            value = int(value)
+        elif isinstance(value, str) and _HEX_NUMBER.fullmatch(value):
+            # * `int(value, 16)` alone would also take the whitespace and underscores Ape rejects
+            value = int(value, 16)
+        elif type(value) is not int:
+            return False
+        if not low <= value <= high:
+            return False
+        word[:] = value.to_bytes(WORD_SIZE, "big", signed=signed)
+        return True
+
+    def decode(word: bytes) -> Any:
+        value = int.from_bytes(word, "big", signed=signed)
+        return value if low <= value <= high else _INVALID
+
+    return encode, decode
+
+
+def _encode_address(word: memoryview, value: Any) -> bool:
+    # * Ape only converts `bytes`, a `bytearray` or `memoryview` must raise its `ConversionError`
+    if type(value) is bytes and len(value) == 20:  # noqa: PLR2004
+        word[12:] = value
+        return True
+    if not isinstance(value, str) or not _HEX_ADDRESS.fullmatch(value):
+        return False
+    digits = value[2:]
+    if not (digits.islower() or digits.isupper() or digits.isdigit() or is_checksum_address(value)):
+        return False
+    word[12:] = bytes.fromhex(digits)
+    return True
+
+
+def _decode_address(word: bytes) -> Any:
+    return to_checksum_address(word[12:]) if word[:12] == _EMPTY_WORD[:12] else _INVALID
+
+
+def _encode_bool(word: memoryview, value: Any) -> bool:
+    if type(value) is not bool:
+        return False
+    word[-1] = value
+    return True
+
+
+def _decode_bool(word: bytes) -> Any:
+    if word[:-1] != _EMPTY_WORD[:-1] or word[-1] > 1:
+        return _INVALID
+    return word[-1] == 1
+
+
+def _bytes_codec(size: int) -> tuple[_Encoder, _Decoder]:
+    def encode(word: memoryview, value: Any) -> bool:
+        if isinstance(value, str) and _HEX_BYTES.fullmatch(value):
+            value = bytes.fromhex(value[2:])
+        elif type(value) is not bytes:
+            return False
+        if len(value) > size:
+            return False
+        word[: len(value)] = value
+        return True
+
+    def decode(word: bytes) -> Any:
+        return HexBytes(word[:size]) if word[size:] == _EMPTY_WORD[size:] else _INVALID
+
+    return encode, decode
+
+
+def _static_field(abi_type: str) -> Optional[tuple[_Encoder, _Decoder]]:
+    if abi_type == "address":
+        return _encode_address, _decode_address
+    if abi_type == "bool":
+        return _encode_bool, _decode_bool
+    if match := INT_TYPE.match(abi_type):
+        return _int_codec(match[1] != "u", int(match[2] or 256))
+    if match := _BYTES_TYPE.match(abi_type):
+        return _bytes_codec(int(match[1]))
+    return None
+
+
+class StaticCodec:
+    """
+    Precompiled encoder and decoder for a function whose inputs are all static value types.
+
+    Every input of `uint`, `int`, `address`, `bool` or `bytesN` type takes exactly one 32-byte
+    word, so the calldata size is known up front: values are written straight into a
+    preallocated buffer behind the selector bytes and read back by slicing fixed offsets.
+
+    Values that need Ape's conversion rules, such as `"1 ether"` or an out of range integer,
+    make `encode` return `None`, and calldata that does not decode cleanly makes `decode`
+    return `None`, so the caller can fall back to Ape and get the same result or error.
+
+    Example:
+        >>> codec = get_static_codec("transfer(address to, uint256 amount)")
+        >>> codec.encode(["0xDbB18e367E4A2A36A9F2AF7af8b3c743938deCF2", 1000]).hex()
+        'a9059cbb000000000000000000000000dbb18e36...00000000000003e8'
+    """
+
+    def __init__(
+        self,
+        selector: bytes,
+        names: Sequence[str],
+        types: Sequence[str],
+        fields: Sequence[tuple[_Encoder, _Decoder]],
+    ) -> None:
+        self.selector = selector
+        self.names = list(names)
+        self.types = list(types)
+        self.encoders = [encoder for encoder, _ in fields]
+        self.decoders = [decoder for _, decoder in fields]
+        self.size = WORD_SIZE * len(fields)
+
+    def encode(self, args: Sequence[Any], *, with_selector: bool = True) -> Optional[bytearray]:
+        """
+        Encodes the arguments, returning `None` if any of them needs Ape's conversion.
+
+        Args:
+            args (Sequence[Any]): One argument per input, already checked to be of the right count.
+            with_selector (bool): Whether to prefix the 4-byte selector.
+
+        Returns:
+            Optional[bytearray]: The encoded calldata, or `None` to fall back to Ape.
+        """
+        offset = len(self.selector) if with_selector else 0
+        buffer = bytearray(offset + self.size)
+        if with_selector:
+            buffer[:offset] = self.selector
+        view = memoryview(buffer)
+        for encoder, value in zip(self.encoders, args):
+            if not encoder(view[offset : offset + WORD_SIZE], value):
+                return None
+            offset += WORD_SIZE
+        return buffer
+
+    def decode(self, data: bytes) -> Optional[dict]:
+        """
+        Decodes calldata without the selector, returning `None` if Ape must decode it to raise the right error.
+
+        Args:
+            data (bytes): The encoded arguments. Trailing bytes are ignored, as Ape does.
+
+        Returns:
+            Optional[dict]: The decoded arguments by input name, or `None` to fall back to Ape.
+        """
+        if len(data) < self.size:
+            return None
+        decoded = {}
+        for index, (name, decoder) in enumerate(zip(self.names, self.decoders)):
+            value = decoder(data[index * WORD_SIZE : (index + 1) * WORD_SIZE])
+            if value is _INVALID:
+                return None
+            decoded[name] = value
+        return decoded
+
+    def __len__(self) -> int:
+        return len(self.encoders)
+
+
+@lru_cache(maxsize=ABI_CACHE_SIZE)
+def get_static_codec(signature: str) -> Optional[StaticCodec]:
+    """
+    Returns the precompiled `StaticCodec` of a function signature, or `None` if any input is dynamic.
+
+    Signatures with `string`, `bytes`, arrays or tuples are left to Ape's generic encoder.
+
+    Args:
+        signature (str): The function signature in the format "function_name(input1_type,input2_type,...)".
+
+    Returns:
+        Optional[StaticCodec]: The cached codec, or `None` for signatures with dynamic inputs.
+    """
+    method_abi = get_method_abi(signature)
+    types: list[str] = []
+    fields = []
+    for abi_input in method_abi.inputs:
+        # * Tuple inputs carry their components as an `ABIType`, they are left to Ape like other dynamic inputs
+        if not isinstance(abi_input.type, str):
+            return None
+        field = _static_field(abi_input.type)
+        if field is None:
+            return None
+        types.append(abi_input.type)
+        fields.append(field)
+    # * Hashed from the ABI at hand rather than through `get_selector`, keeping its cache statistics per call
+    selector = keccak(text=method_abi.selector)[:4]
+    names = [abi_input.name or str(index) for index, abi_input in enumerate(method_abi.inputs)]
+    return StaticCodec(selector, names, types, fields)
@@ -0,0 +1,208 @@
+import re
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+from ape.types import HexBytes
+from eth_abi import encode
+from eth_hash.auto import keccak
+from eth_utils import to_canonical_address
+
+from ape_utils.rpc import DEFAULT_RPC_BATCH_SIZE
+from ape_utils.static_codec import INT_TYPE
+from ape_utils.utils import read_storage_many
+
+# * Solidity storage slots are 32 bytes wide
+SLOT_SIZE: int = 32
+_DYNAMIC_KEY_TYPES = ("string", "bytes")
+_INT_SIZES = range(8, 257, 8)
+_FIXED_BYTES_TYPE = re.compile(r"bytes([1-9]|[12]\d|3[0-2])")
+
+
+def _encode_key(key: Any, key_type: str) -> bytes:
+    """
+    Encodes a mapping key the way Solidity hashes it: value types padded to 32 bytes, `string` and `bytes` as is.
+    """
+    if key_type == "address":
+        return bytes(12) + to_canonical_address(key)
+    if key_type.startswith("uint"):
+        return int(key).to_bytes(SLOT_SIZE, "big")
+    if key_type in _DYNAMIC_KEY_TYPES:
+        return key.encode() if isinstance(key, str) else bytes(key)
+    return encode([key_type], [key])
+
+
+def parse_mapping_key(text: str, key_type: str) -> Any:
+    """
+    Parses a mapping key written as text, e.g. a line of a keys file, into a value of its Solidity type.
+
+    Integers are decimal or `0x` hexadecimal, `bytesN` and `bytes` keys are hexadecimal, booleans are
+    `true` or `false`, and `string` keys are taken as is.
+
+    Args:
+        text (str): The key as written.
+        key_type (str): The Solidity type of the key, e.g. "address", "uint256", "bytes32" or "string".
+
+    Returns:
+        Any: The key, ready for `mapping_slot`.
+
+    Raises:
+        ValueError: If the text is not a valid key of that type, or the type cannot key a mapping.
+    """
+    if key_type == "string":
+        return text
+    if key_type == "address":
+        return to_canonical_address(text)
+    if key_type == "bool":
+        if text.lower() not in {"true", "false"}:
+            msg = f"Expected true or false, got {text!r}"
+            raise ValueError(msg)
+        return text.lower() == "true"
+    if (match := INT_TYPE.fullmatch(key_type)) and int(match[2] or 256) in _INT_SIZES:
+        value = int(text, 0)
+        bits = int(match[2] or 256)
+        low, high = (-(1 << (bits - 1)), (1 << (bits - 1)) - 1) if match[1] != "u" else (0, (1 << bits) - 1)
+        if not low <= value <= high:
+            msg = f"{text} is out of range for {key_type}"
+            raise ValueError(msg)
+        return value
+    if key_type == "bytes" or (match := _FIXED_BYTES_TYPE.fullmatch(key_type)):
+        data = bytes(HexBytes(text))
+        if match and len(data) > int(match[1]):
+            msg = f"{text} is longer than {match[1]} bytes"
+            raise ValueError(msg)
+        return data
+    msg = f"Unsupported mapping key type {key_type}"
+    raise ValueError(msg)
+
+
+def mapping_slot(key: Any, slot: int, key_type: str = "address") -> int:
+    """
+    Returns the storage slot of `mapping[key]` for a mapping declared at `slot`.
+
+    Args:
+        key (Any): The mapping key, e.g. an address string or an integer.
+        slot (int): The slot the mapping is declared at.
+        key_type (str): The Solidity type of the key, e.g. "address", "uint256", "bytes32" or "string".
+
+    Returns:
+        int: `keccak(pad(key) ++ pad(slot))` as an integer.
+
+    Example:
+        >>> # * balanceOf of an ERC20 whose `_balances` mapping is declared at slot 0
+        >>> mapping_slot("0xDbB18e367E4A2A36A9F2AF7af8b3c743938deCF2", 0)
+    """
+    return int.from_bytes(keccak(_encode_key(key, key_type) + slot.to_bytes(SLOT_SIZE, "big")), "big")
+
+
+def nested_mapping_slot(keys: Sequence[tuple[Any, str]], slot: int) -> int:
+    """
+    Returns the storage slot of `mapping[key0][key1]...` for nested mappings declared at `slot`.
+
+    Args:
+        keys (Sequence[tuple[Any, str]]): The `(key, key_type)` of every level, outermost first.
+        slot (int): The slot the outermost mapping is declared at.
+
+    Returns:
+        int: The storage slot of the innermost value.
+
+    Example:
+        >>> # * allowance[owner][spender] of an ERC20 whose `_allowances` mapping is declared at slot 1
+        >>> nested_mapping_slot([(owner, "address"), (spender, "address")], 1)
+    """
+    for key, key_type in keys:
+        slot = mapping_slot(key, slot, key_type)
+    return slot
+
+
+def array_slot(slot: int, index: int, element_size: int = SLOT_SIZE) -> tuple[int, int]:
+    """
+    Returns the storage slot and byte offset of `array[index]` for a dynamic array declared at `slot`.
+
+    The elements of a dynamic array start at `keccak(pad(slot))`. Elements smaller than 32 bytes are
+    packed, several per slot, while larger ones such as structs take `ceil(element_size / 32)` slots each.
+    The length of the array is stored at `slot` itself.
+
+    Args:
+        slot (int): The slot the array is declared at.
+        index (int): The index of the element.
+        element_size (int): The size of an element in bytes, e.g. 20 for `address[]` or 64 for a two slot struct.
+
+    Returns:
+        tuple[int, int]: The slot of the element and its byte offset from the right of that slot.
+    """
+    start = int.from_bytes(keccak(slot.to_bytes(SLOT_SIZE, "big")), "big")
+    if element_size > SLOT_SIZE:
+        return start + index * -(-element_size // SLOT_SIZE), 0
+    per_slot = SLOT_SIZE // element_size
+    return start + index // per_slot, (index % per_slot) * element_size
+
+
+def unpack_slot(value: bytes, offset: int, size: int) -> bytes:
+    """
+    Extracts a packed variable from a 32-byte slot value.
+
+    Solidity packs variables smaller than 32 bytes, such as struct members, from the right of the slot.
+
+    Args:
+        value (bytes): The 32-byte slot value, e.g. from `read_storage`.
+        offset (int): The byte offset of the variable from the right of the slot.
+        size (int): The size of the variable in bytes.
+
+    Returns:
+        bytes: The `size` bytes of the variable.
+
+    Example:
+        >>> # * `uint64 b` declared right after `address a` in the same slot
+        >>> int.from_bytes(unpack_slot(value, 20, 8), "big")
+    """
+    end = SLOT_SIZE - offset
+    return bytes(value[end - size : end])
+
+
+def mapping_slots(keys: Iterable[Any], slot: int, key_type: str = "address") -> list[int]:
+    """
+    Returns the storage slots of `mapping[key]` for many keys of a mapping declared at `slot`.
+
+    This is the batched form of `mapping_slot`: the padded slot is encoded once and
+    appended to every encoded key, which keeps large key lists, such as every holder
+    of a token, cheap to hash.
+
+    Args:
+        keys (Iterable[Any]): The mapping keys.
+        slot (int): The slot the mapping is declared at.
+        key_type (str): The Solidity type of the keys.
+
+    Returns:
+        list[int]: The storage slot of every key, in input order.
+    """
+    padded_slot = slot.to_bytes(SLOT_SIZE, "big")
+    return [int.from_bytes(keccak(_encode_key(key, key_type) + padded_slot), "big") for key in keys]
+
+
+def read_mapping(
+    address: str,
+    slot: int,
+    keys: Iterable[Any],
+    key_type: str = "address",
+    batch_size: int = DEFAULT_RPC_BATCH_SIZE,
+) -> list[bytes]:
+    """
+    Reads `mapping[key]` of a contract for many keys in bulk.
+
+    The slots are derived with `mapping_slots` and read with `read_storage_many`.
+
+    Args:
+        address (str): The address of the smart contract.
+        slot (int): The slot the mapping is declared at.
+        keys (Iterable[Any]): The mapping keys.
+        key_type (str): The Solidity type of the keys.
+        batch_size (int): The maximum number of requests sent in a single JSON-RPC payload.
+
+    Returns:
+        list[bytes]: The 32-byte value of every key as `HexBytes`, in input order.
+
+    Example:
+        >>> balances = read_mapping(token, 0, holders)
+        >>> snapshot = {holder: int.from_bytes(value, "big") for holder, value in zip(holders, balances)}
+    """
+    return read_storage_many(address, mapping_slots(keys, slot, key_type), batch_size)
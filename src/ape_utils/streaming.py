@@ -0,0 +1,310 @@
+import csv
+import io
+import json
+from collections.abc import Generator, Iterable, Iterator
+from contextlib import contextmanager
+from typing import Any, Callable, Optional, TextIO, Union
+
+import hexbytes
+from ape.types import HexBytes
+
+from ape_utils.abi import get_method_abi
+from ape_utils.codec import abi_decode_calldata, decode_calldata
+
+# * A decoded row is either the decoded arguments or the error raised while decoding them
+DecodedRow = Union[dict, Exception]
+
+# * Machine-readable formats written by `write_rows`
+OUTPUT_FORMATS = ["json", "ndjson", "csv", "hex"]
+# * The bytes types `to_typed_value` keeps apart, by their tag
+_BYTES_TAGS: dict[str, type] = {"$bytes": bytes, "$hexbytes": hexbytes.HexBytes, "$HexBytes": HexBytes}
+
+
+def iter_calldata(stream: Iterable[str]) -> Iterator[str]:
+    """
+    Yields hex calldata strings from a text stream, one per non-empty line.
+
+    Lines are read lazily so arbitrarily large files are processed in constant memory.
+    A missing `0x` prefix is added.
+
+    Args:
+        stream (Iterable[str]): A text stream, e.g. an open file or `sys.stdin`.
+
+    Yields:
+        str: The `0x` prefixed calldata of every non-empty line.
+    """
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        yield line if line.startswith(("0x", "0X")) else f"0x{line}"
+
+
+def decode_stream(signature: str, calldata: Iterable[str], *, with_selector: bool = True) -> Iterator[DecodedRow]:
+    """
+    Decodes a stream of calldata strings for the same function signature.
+
+    The signature is parsed once through the ABI cache and every calldata is decoded
+    with `decode_calldata`, or `abi_decode_calldata` when `with_selector` is false.
+    A calldata that fails to decode yields its exception instead of stopping the stream.
+
+    Args:
+        signature (str): The function signature in the format "function_name(input1_type,input2_type,...)".
+        calldata (Iterable[str]): The hex calldata strings, e.g. from `iter_calldata`.
+        with_selector (bool): Whether the calldata starts with the 4-byte function selector.
+
+    Yields:
+        DecodedRow: The decoded arguments of every calldata, in input order.
+
+    Example:
+        >>> with open("calldata.txt") as file:
+        ...     for row in decode_stream("transfer(address to, uint256 amount)", iter_calldata(file)):
+        ...         print(row)
+    """
+    decode: Callable[[str, str], Any] = decode_calldata if with_selector else abi_decode_calldata
+    get_method_abi(signature)
+    for data in calldata:
+        try:
+            yield decode(signature, data)
+        except Exception as e:
+            yield e
+
+
+def to_json_value(value: Any) -> Any:
+    """
+    Converts a decoded ABI value into a JSON serializable value, bytes become `0x` prefixed hex strings.
+    """
+    if isinstance(value, (bytes, bytearray)):
+        return f"0x{bytes(value).hex()}"
+    if isinstance(value, dict):
+        return {str(key): to_json_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_json_value(item) for item in value]
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+def to_typed_value(value: Any) -> Any:
+    """
+    Converts a value into a JSON value that `from_typed_value` rebuilds with the same types.
+
+    JSON has no bytes, tuples or non-string keys, so bytes, tuples and dicts become single-key
+    tagged objects such as `{"$bytes": "0x01"}`. Values of any other type raise a `TypeError`.
+    """
+    kind = type(value)
+    if value is None or kind in {str, int, float, bool}:
+        return value
+    if kind is list:
+        return [to_typed_value(item) for item in value]
+    if kind is tuple:
+        return {"$tuple": [to_typed_value(item) for item in value]}
+    if kind is dict:
+        return {"$dict": [[to_typed_value(key), to_typed_value(item)] for key, item in value.items()]}
+    for tag, bytes_type in _BYTES_TAGS.items():
+        if kind is bytes_type:
+            return {tag: f"0x{bytes(value).hex()}"}
+    msg = f"Cannot send a value of type {kind.__name__}"
+    raise TypeError(msg)
+
+
+def from_typed_value(value: Any) -> Any:
+    """
+    Rebuilds a value converted by `to_typed_value`.
+    """
+    if isinstance(value, list):
+        return [from_typed_value(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    ((tag, item),) = value.items()
+    if tag == "$tuple":
+        return tuple(from_typed_value(element) for element in item)
+    if tag == "$dict":
+        return {from_typed_value(key): from_typed_value(element) for key, element in item}
+    return _BYTES_TAGS[tag](bytes.fromhex(item[2:]))
+
+
+def _json_record(row: Any) -> Any:
+    return {"error": str(row)} if isinstance(row, Exception) else to_json_value(row)
+
+
+def write_ndjson(rows: Iterable[DecodedRow], output: TextIO) -> int:
+    """
+    Writes decoded rows as newline-delimited JSON, one object per row.
+
+    Errors are written as `{"error": "..."}` so the output keeps one line per input line.
+
+    Args:
+        rows (Iterable[DecodedRow]): The decoded rows, e.g. from `decode_stream`.
+        output (TextIO): The text stream to write to.
+
+    Returns:
+        int: The number of rows written.
+    """
+    count = 0
+    for row in rows:
+        output.write(json.dumps(_json_record(row), separators=(",", ":")))
+        output.write("\n")
+        count += 1
+    return count
+
+
+def write_json(rows: Iterable[Any], output: TextIO) -> int:
+    """
+    Writes rows as a single JSON array, streamed one element at a time.
+
+    Errors are written as `{"error": "..."}` like `write_ndjson` does.
+
+    Args:
+        rows (Iterable[Any]): The rows, e.g. decoded arguments or call outputs.
+        output (TextIO): The text stream to write to.
+
+    Returns:
+        int: The number of rows written.
+    """
+    count = 0
+    output.write("[")
+    for row in rows:
+        output.write("," if count else "")
+        output.write(json.dumps(_json_record(row), separators=(",", ":")))
+        count += 1
+    output.write("]\n")
+    return count
+
+
+def write_hex(values: Iterable[Any], output: TextIO) -> int:
+    """
+    Writes byte values as `0x` prefixed hex strings, one per line.
+
+    Args:
+        values (Iterable[Any]): The `bytes` values, or hex strings which are written as they are.
+        output (TextIO): The text stream to write to.
+
+    Returns:
+        int: The number of values written.
+
+    Raises:
+        ValueError: If a value is not bytes or a hex string.
+    """
+    count = 0
+    for value in values:
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            value = f"0x{bytes(value).hex()}"
+        elif not (isinstance(value, str) and value.startswith("0x")):
+            msg = f"Row {count}: {value!r} is not bytes, use another output format"
+            raise ValueError(msg)
+        output.write(value)
+        output.write("\n")
+        count += 1
+    return count
+
+
+def input_columns(signature: str) -> list[str]:
+    """
+    Returns the keys of the decoded arguments of a function, used as CSV columns.
+    """
+    # * Unnamed inputs are keyed by their position when decoded
+    return [param.name or str(index) for index, param in enumerate(get_method_abi(signature).inputs)]
+
+
+def write_csv(rows: Iterable[DecodedRow], output: TextIO, columns: list[str], *, header: bool = True) -> int:
+    """
+    Writes decoded rows as CSV with the given columns and a trailing `error` column.
+
+    Nested values such as arrays, tuples and mappings are written as JSON.
+
+    Args:
+        rows (Iterable[DecodedRow]): The decoded rows, e.g. from `decode_stream`.
+        output (TextIO): The text stream to write to.
+        columns (list[str]): The keys of the rows to write, e.g. from `input_columns`.
+        header (bool): Whether to start with the header row, off when appending to an existing CSV.
+
+    Returns:
+        int: The number of rows written, excluding the header.
+    """
+    writer = csv.writer(output, lineterminator="\n")
+    if header:
+        writer.writerow([*columns, "error"])
+    count = 0
+    for row in rows:
+        if isinstance(row, Exception):
+            writer.writerow([*("" for _ in columns), str(row)])
+        else:
+            values = [to_json_value(row.get(column)) for column in columns]
+            writer.writerow(
+                [
+                    *(json.dumps(value) if isinstance(value, (list, dict)) else value for value in values),
+                    "",
+                ]
+            )
+        count += 1
+    return count
+
+
+def write_rows(
+    rows: Iterable[Any],
+    output: TextIO,
+    output_format: str,
+    columns: Optional[list[str]] = None,
+    hex_key: Optional[str] = None,
+) -> int:
+    """
+    Writes rows in one of the machine-readable `OUTPUT_FORMATS`, without any terminal rendering.
+
+    Args:
+        rows (Iterable[Any]): The rows. For `csv` they are dicts, or single values written in one column.
+        output (TextIO): The text stream to write to, e.g. from `buffered`.
+        output_format (str): One of `json`, `ndjson`, `csv` or `hex`.
+        columns (Optional[list[str]]): The CSV columns, `["value"]` by default.
+        hex_key (Optional[str]): The key of the bytes value of dict rows written as `hex`.
+
+    Returns:
+        int: The number of rows written.
+
+    Example:
+        >>> write_rows([{"slot": 0, "value": b"\\x01" * 32}], sys.stdout, "csv", ["slot", "value"])
+        slot,value,error
+        0,0x0101...01,
+    """
+    if output_format == "json":
+        return write_json(rows, output)
+    if output_format == "ndjson":
+        return write_ndjson(rows, output)
+    if output_format == "hex":
+        return write_hex((row[hex_key] if hex_key is not None else row for row in rows), output)
+    if output_format == "csv":
+        columns = columns or ["value"]
+        records = (row if isinstance(row, (dict, Exception)) else {columns[0]: row} for row in rows)
+        return write_csv(records, output, columns)
+    msg = f"Unknown output format {output_format!r}, expected one of {', '.join(OUTPUT_FORMATS)}"
+    raise ValueError(msg)
+
+
+@contextmanager
+def buffered(stream: TextIO) -> Generator[TextIO, None, None]:
+    """
+    Yields a block buffered text stream writing to `stream`, flushed when the block exits.
+
+    Terminals make stdout line buffered, costing a write per row; writing thousands of rows
+    goes through a block buffered wrapper of the same underlying binary stream instead.
+    Streams that are not line buffered are already block buffered and yielded as they are.
+
+    Example:
+        >>> with buffered(sys.stdout) as output:
+        ...     write_rows(rows, output, "ndjson")
+    """
+    binary = getattr(stream, "buffer", None)
+    if binary is None or not getattr(stream, "line_buffering", False):
+        try:
+            yield stream
+        finally:
+            stream.flush()
+        return
+    stream.flush()
+    wrapper = io.TextIOWrapper(binary, encoding=stream.encoding, errors=stream.errors, newline="\n")
+    try:
+        yield wrapper
+    finally:
+        wrapper.flush()
+        # * Detached so closing the wrapper never closes stdout
+        wrapper.detach()
@@ -0,0 +1,179 @@
+import json
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Optional, TextIO, Union
+
+from ape_node.provider import Node
+from multicall import Call
+
+from ape_utils.constants import DEFAULT_RPC_BATCH_SIZE, DEFAULT_SWEEP_WORKERS
+from ape_utils.outputs import OutputDecoder, get_output_decoder
+from ape_utils.result_cache import CALL, ResultCache
+from ape_utils.rpc import RPCError, provider_http_uri, rpc_batch_results
+from ape_utils.streaming import to_json_value
+
+# * A swept row is the block, whether the call succeeded, and its decoded output or error message
+SweepRow = tuple[int, bool, Any]
+
+
+def block_range(from_block: int, to_block: int, step: int = 1) -> list[int]:
+    """
+    Returns the blocks from `from_block` to `to_block`, both included, every `step` blocks.
+
+    The last block is always included, even when it is not a multiple of `step` away.
+
+    Example:
+        >>> block_range(100, 120, 8)
+        [100, 108, 116, 120]
+    """
+    if step < 1:
+        msg = f"The step must be at least 1, got {step}"
+        raise ValueError(msg)
+    blocks = list(range(from_block, to_block + 1, step))
+    if blocks and blocks[-1] != to_block:
+        blocks.append(to_block)
+    return blocks
+
+
+def _decode(decoder: OutputDecoder, raw: Union[str, bytes, RPCError]) -> tuple[bool, Any]:
+    if isinstance(raw, RPCError):
+        return False, raw.error_message or str(raw)
+    try:
+        return True, decoder.decode(raw)
+    except Exception as e:
+        return False, str(e)
+
+
+def sweep_call(  # noqa: PLR0917
+    function_sig: str,
+    address: str,
+    args: list[Any],
+    provider: Node,
+    blocks: Iterable[int],
+    batch_size: int = DEFAULT_RPC_BATCH_SIZE,
+    workers: int = DEFAULT_SWEEP_WORKERS,
+    cache: Optional[ResultCache] = None,
+) -> Iterator[SweepRow]:
+    """
+    Evaluates the same view call at many blocks, yielding `(block, success, output)` rows as they complete.
+
+    The blocks are split into JSON-RPC batch payloads of `batch_size` `eth_call` requests, and at
+    most `workers` payloads are in flight at once. Rows are yielded as soon as their payload is
+    answered, so they are not in block order. Blocks found in the `cache` are yielded first without
+    touching the node, and every fetched output is stored there. A call that reverts at a block,
+    e.g. before the contract was deployed, yields a failed row instead of stopping the sweep.
+    Providers without an HTTP node, such as Ape's `test` provider, are called one block at a time.
+
+    Args:
+        function_sig (str): The function signature, including the output types, e.g. "totalSupply()(uint256)".
+        address (str): The address of the smart contract.
+        args (list[Any]): The arguments for the function call.
+        provider (Node): The connected provider.
+        blocks (Iterable[int]): The block numbers to call the function at, e.g. from `block_range`.
+        batch_size (int): The maximum number of `eth_call` requests per JSON-RPC payload.
+        workers (int): The maximum number of payloads in flight.
+        cache (Optional[ResultCache]): A persistent cache of the raw outputs.
+
+    Yields:
+        SweepRow: The block, whether the call succeeded, and the decoded output or the error message.
+
+    Example:
+        >>> for block, success, supply in sweep_call("totalSupply()(uint256)", token, [], provider, block_range(A, B, 100)):
+        ...     print(block, supply)
+    """  # noqa: E501
+    decoder = get_output_decoder(function_sig)
+    call = Call(address, [decoder.signature, *args])
+    blocks = list(blocks)
+    chain_id = provider.chain_id if cache is not None else 0
+    missing = []
+    for block in blocks:
+        cached = None if cache is None else cache.get(chain_id, block, call.target, CALL, call.data)
+        if cached is None:
+            missing.append(block)
+        else:
+            yield (block, *_decode(decoder, cached))
+
+    uri = provider_http_uri(provider)
+
+    def fetch(chunk: list[int]) -> list[Union[str, bytes, RPCError]]:
+        if uri is None:
+            results: list[Union[str, bytes, RPCError]] = []
+            for block in chunk:
+                try:
+                    results.append(bytes(provider.web3.eth.call({"to": call.target, "data": call.data}, block)))
+                except Exception as e:
+                    results.append(RPCError("eth_call", {"message": str(e)}))
+            return results
+        requests = [("eth_call", [{"to": call.target, "data": f"0x{call.data.hex()}"}, hex(block)]) for block in chunk]
+        return rpc_batch_results(uri, requests, batch_size)
+
+    size = batch_size if uri is not None else 1
+    chunks = [missing[start : start + size] for start in range(0, len(missing), size)]
+    pool = ThreadPoolExecutor(max_workers=workers)
+    try:
+        futures = {pool.submit(fetch, chunk): chunk for chunk in chunks}
+        for future in as_completed(futures):
+            stored = []
+            for block, output in zip(futures[future], future.result()):
+                if not isinstance(output, RPCError):
+                    stored.append((block, bytes.fromhex(output[2:]) if isinstance(output, str) else output))
+                yield (block, *_decode(decoder, output))
+            if cache is not None:
+                for block, data in stored:
+                    cache.set(chain_id, block, call.target, CALL, call.data, data)
+    finally:
+        # * A consumer that stops early, or Ctrl-C, must not wait for the batches still queued
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def read_checkpoint(path: Union[str, Path]) -> set[int]:
+    """
+    Returns the blocks already swept successfully according to a checkpoint file, or an empty set if it does not exist.
+
+    Failed blocks and a line cut short by an interruption are ignored, so those blocks are called again.
+    """
+    path = Path(path)
+    if not path.exists():
+        return set()
+    done = set()
+    with path.open(encoding="utf-8") as file:
+        for line in file:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get("success"):
+                done.add(record["block"])
+    return done
+
+
+def open_checkpoint(path: Union[str, Path]) -> TextIO:
+    """
+    Opens a checkpoint file for appending, ending a line cut short by an interruption first.
+    """
+    path = Path(path)
+    checkpoint = path.open("a+", encoding="utf-8")
+    if checkpoint.tell() > 0:
+        checkpoint.seek(checkpoint.tell() - 1)
+        if checkpoint.read(1) != "\n":
+            checkpoint.write("\n")
+    return checkpoint
+
+
+def write_checkpoint(rows: Iterable[SweepRow], checkpoint: TextIO) -> Iterator[SweepRow]:
+    """
+    Appends every row to a checkpoint file as a JSON line, flushed at once, and passes the rows on.
+
+    Args:
+        rows (Iterable[SweepRow]): The swept rows, e.g. from `sweep_call`.
+        checkpoint (TextIO): The checkpoint file, opened for appending.
+
+    Yields:
+        SweepRow: The rows, unchanged.
+    """
+    for block, success, output in rows:
+        record = {"block": block, "success": success, "output": to_json_value(output)}
+        checkpoint.write(json.dumps(record, separators=(",", ":")) + "\n")
+        checkpoint.flush()
+        yield block, success, output
@@ -1,35 +1,84 @@
-from typing import Any, Union
+import asyncio
+import contextlib
+import threading
+from collections.abc import Iterable, Iterator, Sequence
+from typing import Any, Optional, Union
 
-import ape
-import ethpm_types
+import aiohttp
 from ape import networks
 from ape.types import AddressType, HexBytes
 from ape_node.provider import Node
-from eth_utils import keccak
-from ethpm_types import MethodABI
+from eth_abi import decode, encode
 from multicall import Call
+from multicall.constants import MULTICALL3_ADDRESSES, MULTICALL3_BYTECODE, NO_STATE_OVERRIDE
 from rich.console import Console
 from rich.traceback import install
-from web3 import Web3
+from web3.exceptions import Web3RPCError
+
+from ape_utils.clients import failover_uris, get_async_web3, get_limiter, get_web3
+
+# * The codec helpers live in `ape_utils.codec` so offline commands skip the network stack, re-exported here
+from ape_utils.codec import (  # noqa: F401
+    abi_decode_calldata,
+    abi_encode_calldata,
+    decode_calldata,
+    encode_calldata,
+)
+from ape_utils.constants import (
+    DEFAULT_BACKOFF,
+    DEFAULT_BATCH_CALLDATA_LIMIT,
+    DEFAULT_BATCH_GAS_LIMIT,
+    DEFAULT_CALL_TIMEOUT,
+    DEFAULT_CONCURRENCY,
+    DEFAULT_RETRIES,
+    DEFAULT_RPC_BATCH_SIZE,
+)
+from ape_utils.outputs import OutputDecoder, ReturnHandlers, get_output_decoder
+from ape_utils.resilience import RETRY_STATUSES, THROTTLED_STATUS, RetryPolicy, is_throttled_error, retry_after
+from ape_utils.result_cache import CALL, STORAGE, ResultCache
+from ape_utils.rpc import provider_http_uri, rpc_batch
 
 # install rich traceback
 install()
 console = Console()
 
-
-def call_view_function(function_sig: str, address: str, args: list[str], provider: Node) -> Any:
+_RETRYABLE_ERRORS = (asyncio.TimeoutError, aiohttp.ClientError, ConnectionError)
+# * Multicall3 is deployed at the same address on most chains, its code is also sent as a state override
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+# * aggregate3((address,bool,bytes)[])
+_AGGREGATE3_SELECTOR = bytes.fromhex("82ad56cb")
+# * Ape's network manager is not thread-safe, network choices are resolved one at a time
+_RESOLVE_LOCK = threading.Lock()
+
+
+def call_view_function(
+    function_sig: str,
+    address: str,
+    args: list[str],
+    provider: Node,
+    *,
+    block_identifier: Optional[int] = None,
+    cache: Optional[ResultCache] = None,
+    raw_output: bool = False,
+    handlers: Optional[ReturnHandlers] = None,
+) -> Any:
     """
     Calls a view function on the blockchain given a function signature and address.
 
-    This function connects to the blockchain using a Web3 HTTP provider, constructs a
+    This function connects to the blockchain using a pooled Web3 HTTP client, constructs a
     call to the specified contract address and function signature with the given arguments,
-    and returns the result of the call.
+    and returns the result of the call. The return data is decoded once by the cached
+    `OutputDecoder` of the signature, so named outputs come back as a dict of named fields.
 
     Parameters:
     - function_sig (str): The function signature, including the input and output types, e.g., "some_func(uint256)(string)".
     - address (str): The address of the smart contract.
     - args (list[str]): The arguments for the function call.
     - provider (SubprocessProvider): The subprocess provider i.e. alchemy, infura, foundry, ganache etc.
+    - block_identifier (Optional[int]): The block number to call the function at, defaults to the latest block.
+    - cache (Optional[ResultCache]): A persistent cache for the raw output, only used with a `block_identifier`.
+    - raw_output (bool): Return the undecoded return data as bytes, e.g. to pass it on without decoding it.
+    - handlers (Optional[ReturnHandlers]): Converters of the output fields, keyed by name or position.
 
     Returns:
     - Any: The result of the function call.
@@ -41,155 +90,418 @@ def call_view_function(function_sig: str, address: str, args: list[str], provide
     ```py
     >>> result = call_view_function("call_this_view_function(uint256)(string)", "0x80E097a70cacA11EB71B6401FB12D48A1A61Ef54", 6147190)
     >>> print(result)
+    >>> call_view_function("getReserves()(uint112 reserve0, uint112 reserve1, uint32 timestamp)", pair, [], provider)
+    {'reserve0': 1000, 'reserve1': 2000, 'timestamp': 1700000000}
     ```
     """  # noqa: E501
-    w3 = Web3(Web3.HTTPProvider(provider.uri))
-
-    # get_signature(address, function_sig)
-
-    output = Call(address, [function_sig, *args])(_w3=w3)
+    w3 = get_web3(provider.uri)
+    decoder = get_output_decoder(function_sig)
+    call = Call(address, [decoder.signature, *args])
+
+    # * Outputs at a fixed block never change, so the raw bytes are served from the cache
+    if block_identifier is not None and cache is not None:
+        chain_id = provider.chain_id
+        raw = cache.get(chain_id, block_identifier, call.target, CALL, call.data)
+        if raw is None:
+            raw = bytes(w3.eth.call({"to": call.target, "data": call.data}, block_identifier))
+            cache.set(chain_id, block_identifier, call.target, CALL, call.data, raw)
+    else:
+        raw = bytes(w3.eth.call({"to": call.target, "data": call.data}, block_identifier))
+    return raw if raw_output else decoder.decode(raw, handlers)
+
+
+def _aggregate_size(call: Call) -> int:
+    """
+    Returns the number of bytes a call adds to the `(address,bool,bytes)[]` argument of an `aggregate3` call.
+    """
+    # * head offset + address word + allowFailure word + bytes offset + bytes length + right padded data
+    return 32 * 5 + -(-len(call.data) // 32) * 32
 
-    # console.print(f"[blue]Output: [green bold]{output}")
-    return output
 
+def _batch_calls(calls: Sequence[Call], calldata_limit: int) -> Iterator[list[Call]]:
+    """
+    Groups calls into consecutive batches whose aggregate calldata stays within `calldata_limit` bytes.
 
-def abi_encode_calldata(signature: str, *args: Any) -> Union[HexBytes, Any]:
+    A single call larger than the limit is still sent, alone in its own batch.
+    """
+    batch: list[Call] = []
+    size = 0
+    for call in calls:
+        call_size = _aggregate_size(call)
+        if batch and size + call_size > calldata_limit:
+            yield batch
+            batch, size = [], 0
+        batch.append(call)
+        size += call_size
+    if batch:
+        yield batch
+
+
+def _aggregate3(
+    uri: str, chain_id: int, calls: Sequence[Call], gas_limit: int, block_identifier: Optional[int]
+) -> list[tuple[bool, bytes]]:
+    """
+    Sends calls as one Multicall3 `aggregate3` `eth_call` allowing each to fail, returning their `(success, data)`.
+    """
+    target = MULTICALL3_ADDRESSES.get(chain_id, MULTICALL3_ADDRESS)
+    aggregated = [(call.target, True, call.data) for call in calls]
+    data = _AGGREGATE3_SELECTOR + encode(["(address,bool,bytes)[]"], [aggregated])
+    params: list[Any] = [
+        {"to": target, "data": f"0x{data.hex()}", "gas": hex(gas_limit)},
+        "latest" if block_identifier is None else hex(block_identifier),
+    ]
+    # * With the code as a state override, the aggregate also works at blocks before Multicall3 was deployed
+    if chain_id not in NO_STATE_OVERRIDE:
+        params.append({target: {"code": MULTICALL3_BYTECODE}})
+    output = rpc_batch(uri, [("eth_call", params)])[0]
+    results: list[tuple[bool, bytes]] = decode(["(bool,bytes)[]"], bytes.fromhex(output[2:]))[0]
+    return results
+
+
+def call_view_functions(
+    calls: Iterable[tuple[str, str, Sequence[Any]]],
+    provider: Node,
+    calldata_limit: int = DEFAULT_BATCH_CALLDATA_LIMIT,
+    gas_limit: int = DEFAULT_BATCH_GAS_LIMIT,
+    block_identifier: Optional[int] = None,
+    *,
+    handlers: Optional[ReturnHandlers] = None,
+) -> list[tuple[bool, Any]]:
     """
-    Encodes calldata for a function given its signature and arguments using Ape.
+    Calls many view functions on the blockchain through Multicall3 `aggregate3` calls.
 
-    This function takes a function signature and a variable number of arguments,
-    parses the function's ABI (Application Binary Interface), and encodes the
-    calldata for making a blockchain transaction or call.
+    Every call is wrapped in a `multicall.Call` and the calls are grouped into aggregate
+    calls sized to the calldata and gas budgets, so thousands of view calls cost a handful
+    of `eth_call` round-trips instead of one each. A failing call does not abort the batch.
+    The aggregate calls go through the pooled session of `ape_utils.clients`, so they are rate
+    limited, retried and failed over like any other request, and every output is decoded
+    by the `OutputDecoder` of its signature. Providers without an HTTP node, such as Ape's
+    `test` provider, are called one call at a time.
 
-    Args:
-        signature (str): The function signature in the format "function_name(input1_type,input2_type,...)".
-        *args (Any): The arguments to be encoded for the function call. The number and types of arguments must match the function signature.
+    Parameters:
+    - calls (Iterable[tuple[str, str, Sequence[Any]]]): The `(address, function_sig, args)` tuples to call.
+    - provider (SubprocessProvider): The subprocess provider i.e. alchemy, infura, foundry, ganache etc.
+    - calldata_limit (int): The maximum calldata in bytes sent in a single aggregate call.
+    - gas_limit (int): The gas limit used for each aggregate call.
+    - block_identifier (Optional[int]): The block number to call the functions at, defaults to the latest block.
+    - handlers (Optional[ReturnHandlers]): Converters of the output fields of every call, keyed by name or position.
 
     Returns:
-        Union[HexBytes, Any]: The encoded calldata in hex bytes format, which can be used for making a blockchain transaction or call.
-
-    Raises:
-        ValueError: If the number of provided arguments does not match the expected number of inputs according to the
-                    function signature.
+    - list[tuple[bool, Any]]: One `(success, output)` pair per call, in input order. Functions with several
+      return values give a tuple as output, or a dict with named outputs, and failed calls give `None`.
 
     Example:
-        >>> abi_encode_calldata("call_this_view_function(uint256 arg1)", "0xRecipientAddress", 1000)
-        HexBytes('0xa9059cbb000000000000000000000000RecipientAddress0000000000000000000000000000000000000000000000000000000000000000000000000000000000003e8')
-
-    Notes:
-        - The function signature should match the Solidity function format.
-        - The arguments should be provided in the correct order and of the correct type as specified in the function signature.
-
+    ```py
+    >>> results = call_view_functions(
+    ...     [
+    ...         ("0x80E097a70cacA11EB71B6401FB12D48A1A61Ef54", "call_this_view_function(uint256)(string)", [6147190]),
+    ...         ("0x894A02d4574318a9da4EEc7884a7D0c095E65507", "couple_param_function(uint256,string)(string)", [1, "a"]),
+    ...     ],
+    ...     provider,
+    ... )
+    >>> print(results)
+    ```
     """  # noqa: E501
-    method_abi: MethodABI = ethpm_types.abi.MethodABI.from_signature(signature)
-    if len(method_abi.inputs) != len(args):
-        msg = f"Wrong number of parameters passed. Expected: {len(method_abi.inputs)} got: {len(args)}"
-        raise ValueError(msg)
-    return ape.networks.ethereum.encode_calldata(method_abi, *args)
-
-
-def abi_decode_calldata(signature: str, encoded_data: str) -> Union[dict, Any]:
+    prepared: list[Call] = []
+    decoders: list[OutputDecoder] = []
+    for address, function_sig, args in calls:
+        decoder = get_output_decoder(function_sig)
+        prepared.append(Call(address, [decoder.signature, *args]))
+        decoders.append(decoder)
+
+    outputs: list[tuple[bool, bytes]] = []
+    uri = provider_http_uri(provider)
+    if uri is None:
+        for call in prepared:
+            try:
+                output = provider.web3.eth.call({"to": call.target, "data": call.data}, block_identifier)
+            except Exception:
+                outputs.append((False, b""))
+            else:
+                outputs.append((True, bytes(output)))
+    else:
+        chain_id = provider.chain_id
+        for batch in _batch_calls(prepared, calldata_limit):
+            outputs.extend(_aggregate3(uri, chain_id, batch, gas_limit, block_identifier))
+
+    return [
+        decoder.try_decode(data, handlers) if success else (False, None)
+        for decoder, (success, data) in zip(decoders, outputs)
+    ]
+
+
+async def acall_view_function(
+    function_sig: str,
+    address: str,
+    args: list[Any],
+    provider: Node,
+    *,
+    timeout: float = DEFAULT_CALL_TIMEOUT,
+    retries: int = DEFAULT_RETRIES,
+    backoff: float = DEFAULT_BACKOFF,
+    block_identifier: Optional[int] = None,
+) -> Any:
     """
-    Decodes calldata for a function given its signature and calldata string using Ape.
+    Calls a view function on the blockchain asynchronously, given a function signature and address.
 
-    This function takes a function signature and a calldata string,
-    parses the function's ABI (Application Binary Interface), and decodes the
-    calldata to its original arguments.
+    This is the asyncio counterpart of `call_view_function`. The `eth_call` goes through
+    the async Web3 client of the running event loop, each attempt is bounded by `timeout`
+    and network errors and timeouts are retried with exponential backoff.
 
-    Args:
-        signature (str): The function signature in the format "function_name(input1_type,input2_type,...)".
-        encoded_data (str): The encoded_data string to be decoded.
+    Parameters:
+    - function_sig (str): The function signature, including the input and output types, e.g., "some_func(uint256)(string)".
+    - address (str): The address of the smart contract.
+    - args (list[Any]): The arguments for the function call.
+    - provider (SubprocessProvider): The subprocess provider i.e. alchemy, infura, foundry, ganache etc.
+    - timeout (float): The timeout in seconds for a single attempt.
+    - retries (int): How many times a timed out or failed request is retried.
+    - backoff (float): The delay in seconds before the first retry, doubled after every attempt.
+    - block_identifier (Optional[int]): The block number to call the function at, defaults to the latest block.
 
     Returns:
-        Union[dict, Any]: The decoded arguments as a dictionary or any appropriate type based on the function signature.
-
-    Raises:
-        ValueError: If the calldata is not properly formatted or if the signature is incorrect.
+    - Any: The result of the function call.
 
     Example:
-        >>> abi_decode_calldata("call_this_view_function(uint256 arg1, string addr)"), "0x00000000000000000000000000000000000000000000000000000000000004d20000000000000000000000000000000000000000000000000000000000000040000000000000000000000000000000000000000000000000000000000000000a3078646561646265656600000000000000000000000000000000000000000000")
-        Decoded Data: {'arg1': 1234, 'addr': '0xdeadbeef'}
-
-
-    Notes:
-        - The function signature should match the Solidity function format.
-        - The calldata string should be in hex format.
-
+    ```py
+    >>> result = await acall_view_function("call_this_view_function(uint256)(string)", "0x80E097a70cacA11EB71B6401FB12D48A1A61Ef54", [6147190], provider)
+    >>> print(result)
+    ```
     """  # noqa: E501
-    method_abi: MethodABI = ethpm_types.abi.MethodABI.from_signature(signature)
-    encoded_data_bytes: bytes = bytes.fromhex(encoded_data[2:])
-    return ape.networks.ethereum.decode_calldata(method_abi, encoded_data_bytes)
-
+    return await _acall_uri(
+        provider.uri,
+        function_sig,
+        address,
+        args,
+        timeout=timeout,
+        retries=retries,
+        backoff=backoff,
+        block_identifier=block_identifier,
+    )
+
+
+async def _acall_uri(
+    uri: str,
+    function_sig: str,
+    address: str,
+    args: list[Any],
+    *,
+    timeout: float,
+    retries: int,
+    backoff: float,
+    block_identifier: Optional[int],
+) -> Any:
+    """
+    Runs `acall_view_function` against the node at `uri`, failing over to the fallback nodes of `ape_utils.clients`.
 
-def encode_calldata(signature: str, *args: Any) -> Union[HexBytes, Any]:
+    Every request waits for the rate limiter of its node, and retryable errors are sent again after
+    a jittered exponential backoff, the same way the sync clients do in `ResilientAdapter`: timeouts,
+    connection errors, the statuses in `RETRY_STATUSES` and JSON-RPC rate limit errors. Other HTTP
+    statuses, such as 400 or 401, are raised at once.
     """
-    Encodes calldata for a function given its signature and arguments using the Ape framework.
+    decoder = get_output_decoder(function_sig)
+    call = Call(address, [decoder.signature, *args])
+    transaction = {"to": call.target, "data": call.data}
+    policy = RetryPolicy(retries, backoff)
+
+    error: Optional[BaseException] = None
+    uris = failover_uris(uri)
+    for index, target in enumerate(uris):
+        if index:
+            get_limiter(uris[index - 1]).failed_over()
+        w3 = await get_async_web3(target)
+        limiter = get_limiter(target)
+        for attempt in range(retries + 1):
+            if attempt:
+                limiter.retried()
+            await limiter.aacquire()
+            try:
+                output = await asyncio.wait_for(w3.eth.call(transaction, block_identifier), timeout)  # type: ignore[arg-type]
+            except _RETRYABLE_ERRORS as e:
+                error, wait = e, None
+                if isinstance(e, aiohttp.ClientResponseError):
+                    if e.status not in RETRY_STATUSES:
+                        raise
+                    if e.status == THROTTLED_STATUS:
+                        limiter.throttled()
+                        wait = retry_after(e.headers)
+            except Web3RPCError as e:
+                # * Nodes such as Infura throttle with a `-32005` error in a `200 OK` answer
+                if not is_throttled_error((e.rpc_response or {}).get("error")):
+                    raise
+                limiter.throttled()
+                error, wait = e, None
+            else:
+                limiter.succeeded()
+                return decoder.decode(output)
+            if attempt < retries:
+                await asyncio.sleep(policy.delay(attempt, wait))
+        limiter.failed()
+    raise error  # type: ignore[misc]
+
+
+async def async_call_many(
+    calls: Iterable[tuple[str, str, Sequence[Any]]],
+    provider: Node,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    *,
+    timeout: float = DEFAULT_CALL_TIMEOUT,
+    retries: int = DEFAULT_RETRIES,
+    backoff: float = DEFAULT_BACKOFF,
+    block_identifier: Optional[int] = None,
+) -> list[tuple[bool, Any]]:
+    """
+    Calls many view functions concurrently with at most `concurrency` requests in flight.
 
-    This function parses the function's ABI (Application Binary Interface) from its signature,
-    verifies the number of arguments, and encodes the calldata including the function selector.
+    Every call goes through `acall_view_function`, so it has its own timeout and retries.
+    A failing call does not cancel the others.
 
-    Args:
-        signature (str): The function signature in the format "function_name(input1_type,input2_type,...)".
-        *args (Any): The arguments for the function call. The number of arguments must match the function's inputs.
+    Parameters:
+    - calls (Iterable[tuple[str, str, Sequence[Any]]]): The `(address, function_sig, args)` tuples to call.
+    - provider (SubprocessProvider): The subprocess provider i.e. alchemy, infura, foundry, ganache etc.
+    - concurrency (int): The maximum number of requests in flight at once.
+    - timeout (float): The timeout in seconds for a single attempt.
+    - retries (int): How many times a timed out or failed request is retried.
+    - backoff (float): The delay in seconds before the first retry, doubled after every attempt.
+    - block_identifier (Optional[int]): The block number to call the functions at, defaults to the latest block.
 
     Returns:
-        Union[HexBytes, Any]: The encoded calldata as a HexBytes object.
-
-    Raises:
-        ValueError: If the number of arguments does not match the function's inputs.
+    - list[tuple[bool, Any]]: One `(success, output)` pair per call, in input order. Failed calls give `None`.
 
     Example:
-        >>> encode_calldata("call_this_view_function(uint256 arg1)", "0xRecipientAddress", 1000)
-        HexBytes('0xa9059cbb000000000000000000000000RecipientAddress0000000000000000000000000000000000000000000000000000000000000000000000000000000000003e8')
+    ```py
+    >>> results = asyncio.run(async_call_many(calls, provider, concurrency=32))
+    ```
 
     Notes:
-        - The function signature should match the Solidity function format.
-        - The encoded calldata includes the function selector (first 4 bytes).
+    - The async clients are cached per event loop, call `ape_utils.clients.aclose_clients` before the loop ends.
     """
-    method_abi: MethodABI = ethpm_types.abi.MethodABI.from_signature(signature)
-    if len(method_abi.inputs) != len(args):
-        msg = f"Wrong number of parameters passed. Expected: {len(method_abi.inputs)} got: {len(args)}"
-        raise ValueError(msg)
-    # * The selector is of 4 bytes
-    call_data = ape.networks.ethereum.encode_calldata(method_abi, *args)
-    return HexBytes(keccak(text=method_abi.selector)[:4].hex() + call_data.hex()[2:])
-
-
-def decode_calldata(signature: str, encoded_data: str) -> Union[dict, Any]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _call(address: str, function_sig: str, args: Sequence[Any]) -> tuple[bool, Any]:
+        async with semaphore:
+            try:
+                output = await acall_view_function(
+                    function_sig,
+                    address,
+                    list(args),
+                    provider,
+                    timeout=timeout,
+                    retries=retries,
+                    backoff=backoff,
+                    block_identifier=block_identifier,
+                )
+            except Exception:
+                return False, None
+            return True, output
+
+    return list(await asyncio.gather(*(_call(*call) for call in calls)))
+
+
+async def acall_on_networks(
+    function_sig: str,
+    address: str,
+    args: list[Any],
+    network_choices: Iterable[str],
+    *,
+    timeout: float = DEFAULT_CALL_TIMEOUT,
+    retries: int = DEFAULT_RETRIES,
+    backoff: float = DEFAULT_BACKOFF,
+    block_identifier: Optional[int] = None,
+) -> dict[str, tuple[bool, Any]]:
     """
-    Decodes calldata for a function given its signature and encoded data string using the Ape framework.
+    Runs the same view call on several networks concurrently.
 
-    This function parses the function's ABI (Application Binary Interface) from its signature,
-    extracts the encoded data bytes (excluding the selector), and decodes it to its original arguments.
+    Every network choice is resolved to its node URI without connecting the provider through Ape,
+    and the call goes straight to that node like `acall_view_function`. Each network has its own
+    `timeout` deadline, retries included, so a slow or unreachable chain only fails its own entry.
 
-    Args:
-        signature (str): The function signature in the format "function_name(input1_type,input2_type,...)".
-        encoded_data (str): The encoded calldata string in hex format, including the function selector.
+    Parameters:
+    - function_sig (str): The function signature, including the input and output types, e.g., "some_func(uint256)(string)".
+    - address (str): The address of the smart contract, the same on every network.
+    - args (list[Any]): The arguments for the function call.
+    - network_choices (Iterable[str]): The network choices, e.g. ["ethereum:mainnet:node", ":sepolia:infura"].
+    - timeout (float): The deadline in seconds for each network.
+    - retries (int): How many times a failed request is retried within the deadline.
+    - backoff (float): The delay in seconds before the first retry, doubled after every attempt.
+    - block_identifier (Optional[int]): The block number to call the function at, defaults to the latest block.
 
     Returns:
-        Union[dict, Any]: The decoded arguments as a dictionary or any appropriate type based on the function signature.
+    - dict[str, tuple[bool, Any]]: The `(success, output)` of every network choice, in input order.
+      Failed networks give the error message as output.
 
     Example:
-        >>> decode_calldata("call_this_view_function(uint256 arg1)", "0x1e4f420d00000000000000000000000000000000000000000000000000000000000004d2")
-        Decoded Data: {'arg1': 1234}
+    ```py
+    >>> asyncio.run(acall_on_networks("totalSupply()(uint256)", token, [], ["ethereum:mainnet", "arbitrum:mainnet"]))
+    {'ethereum:mainnet': (True, 1000), 'arbitrum:mainnet': (False, 'timed out after 30.0s')}
+    ```
 
     Notes:
-        - The function signature should match the Solidity function format.
-        - The encoded calldata string should be in hex format, including the function selector.
-        - The function extracts the encoded data bytes (excluding the first 4 bytes of the selector) before decoding.
+    - The async clients are cached per event loop, call `ape_utils.clients.aclose_clients` before the loop ends.
     """  # noqa: E501
-    method_abi: MethodABI = ethpm_types.abi.MethodABI.from_signature(signature)
-    encoded_data_bytes: bytes = bytes.fromhex(encoded_data[2 + 8 :])
-    return ape.networks.ethereum.decode_calldata(method_abi, encoded_data_bytes)
-
 
-def read_storage(address: Union[AddressType, str], slot: int) -> Any:
+    loop = asyncio.get_running_loop()
+
+    def _resolve(choice: str, resolved: asyncio.Future) -> None:
+        # * Resolving the URI may probe public RPCs for a long time, so it runs on a daemon thread
+        # * that neither blocks the event loop nor the exit of the process once the deadline passed
+        result: tuple[Optional[str], Optional[Exception]]
+        try:
+            with _RESOLVE_LOCK:
+                result = (networks.get_provider_from_choice(choice).uri, None)
+        except Exception as e:
+            result = (None, e)
+
+        def _set_result() -> None:
+            # * The deadline may have cancelled the future in the meantime
+            if not resolved.done():
+                resolved.set_result(result)
+
+        with contextlib.suppress(RuntimeError):
+            loop.call_soon_threadsafe(_set_result)
+
+    async def _call(choice: str) -> Any:
+        resolved: asyncio.Future = loop.create_future()
+        threading.Thread(target=_resolve, args=(choice, resolved), daemon=True).start()
+        uri, error = await resolved
+        if error is not None:
+            raise error
+        return await _acall_uri(
+            uri,
+            function_sig,
+            address,
+            args,
+            timeout=timeout,
+            retries=retries,
+            backoff=backoff,
+            block_identifier=block_identifier,
+        )
+
+    async def _deadline(choice: str) -> tuple[bool, Any]:
+        try:
+            return True, await asyncio.wait_for(_call(choice), timeout)
+        except asyncio.TimeoutError:
+            return False, f"timed out after {timeout}s"
+        except Exception as e:
+            return False, str(e) or type(e).__name__
+
+    choices = list(dict.fromkeys(network_choices))
+    return dict(zip(choices, await asyncio.gather(*(_deadline(choice) for choice in choices))))
+
+
+def read_storage(
+    address: Union[AddressType, str],
+    slot: int,
+    *,
+    block_identifier: Optional[int] = None,
+    cache: Optional[ResultCache] = None,
+) -> Any:
     """
     Gets the raw value of a storage slot of a contract.
 
     This function interacts with the blockchain to read the storage data of a
-    specified contract address at a given storage slot. It uses the provider
-    from the Ape framework to fetch the storage data.
+    specified contract address at a given storage slot. It uses the node of the
+    provider from the Ape framework to fetch the storage data, with the retries,
+    rate limit and fallback nodes of `ape_utils.clients`.
 
     Args:
         address (Union[AddressType, str]): The address of the smart contract whose storage
@@ -197,6 +509,8 @@ def read_storage(address: Union[AddressType, str], slot: int) -> Any:
         slot (int): The storage slot number from which to read the data. This
             should be a non-negative integer representing the position in the
             contract's storage.
+        block_identifier (Optional[int]): The block number to read the storage at, defaults to the latest block.
+        cache (Optional[ResultCache]): A persistent cache for the value, only used with a `block_identifier`.
 
     Returns:
         Any: The data stored at the specified storage slot of the given address.
@@ -219,11 +533,91 @@ def read_storage(address: Union[AddressType, str], slot: int) -> Any:
         ConnectionError: If there is an issue connecting to the Ethereum network.
 
     """
-    data = networks.provider.get_storage(address, slot)
-
+    provider = networks.provider
+    if provider_http_uri(provider) is not None:
+        # * Nodes behind HTTP are read through the pooled session, which retries and fails over
+        block = "latest" if block_identifier is None else block_identifier
+        return read_storage_many(address, [slot], block_identifier=block, cache=cache)[0]
+
+    if block_identifier is None:
+        data = provider.get_storage(address, slot)
+
+        return data
+
+    key = slot.to_bytes(32, "big")
+    if cache is not None:
+        cached = cache.get(provider.chain_id, block_identifier, str(address), STORAGE, key)
+        if cached is not None:
+            return HexBytes(cached)
+    data = provider.get_storage(address, slot, block_id=block_identifier)
+    if cache is not None:
+        cache.set(provider.chain_id, block_identifier, str(address), STORAGE, key, bytes(data))
     return data
 
 
+def read_storage_many(
+    address: str,
+    slots: Iterable[int],
+    batch_size: int = DEFAULT_RPC_BATCH_SIZE,
+    block_identifier: Union[int, str] = "latest",
+    cache: Optional[ResultCache] = None,
+) -> list[bytes]:
+    """
+    Gets the raw values of many storage slots of a contract.
+
+    The `eth_getStorageAt` requests are sent to the node of the connected provider as JSON-RPC
+    batch payloads of `batch_size` requests, so hundreds of slots cost a few round-trips.
+    Providers without an HTTP node, such as Ape's `test` provider, are read one slot at a time.
+
+    Args:
+        address (str): The address of the smart contract whose storage
+            data is to be read. This should be a valid Ethereum address.
+        slots (Iterable[int]): The storage slot numbers to read.
+        batch_size (int): The maximum number of requests sent in a single JSON-RPC payload.
+        block_identifier (Union[int, str]): The block number or tag to read the storage at.
+        cache (Optional[ResultCache]): A persistent cache for the values, only used with a block number.
+
+    Returns:
+        list[bytes]: The 32-byte value of every slot as `HexBytes`, in input order.
+
+    Example:
+        >>> data = read_storage_many("0x1234567890abcdef1234567890abcdef12345678", range(256))
+        >>> print(data[5])
+
+    Raises:
+        ape_utils.rpc.RPCError: If the node answers any request with an error.
+    """
+    slots = list(slots)
+    provider = networks.provider
+    keys = [slot.to_bytes(32, "big") for slot in slots]
+    cached: dict[bytes, bytes] = {}
+    if cache is not None and isinstance(block_identifier, int):
+        cached = cache.get_many(provider.chain_id, block_identifier, str(address), STORAGE, keys)
+    missing = [slot for slot, key in zip(slots, keys) if key not in cached]
+
+    uri = provider_http_uri(provider)
+    if not missing:
+        fetched = []
+    elif uri is None:
+        block_id = None if block_identifier == "latest" else block_identifier
+        fetched = [HexBytes(provider.get_storage(address, slot, block_id=block_id)) for slot in missing]
+    else:
+        block = hex(block_identifier) if isinstance(block_identifier, int) else block_identifier
+        requests = [("eth_getStorageAt", [str(address), hex(slot), block]) for slot in missing]
+        fetched = [HexBytes(result) for result in rpc_batch(uri, requests, batch_size)]
+
+    fetched_by_key = {slot.to_bytes(32, "big"): value for slot, value in zip(missing, fetched)}
+    if cache is not None and isinstance(block_identifier, int) and fetched_by_key:
+        cache.set_many(
+            provider.chain_id,
+            block_identifier,
+            str(address),
+            STORAGE,
+            ((k, bytes(v)) for k, v in fetched_by_key.items()),
+        )
+    return [HexBytes(cached[key]) if key in cached else fetched_by_key[key] for key in keys]
+
+
 if __name__ == "__main__":
     function_sig: str = "call_this_view_function(uint256)(string)"
     address: str = "0x80E097a70cacA11EB71B6401FB12D48A1A61Ef54"
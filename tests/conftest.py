@@ -3,6 +3,8 @@ from ape_utils._cli import cli as _cli
 import pytest
 import ape
 
+from tests.rpc_node import RPCNode
+
 
 @pytest.fixture(scope="session")
 def networks():
@@ -21,3 +23,10 @@ def runner():
 @pytest.fixture(scope="session")
 def cli():
     return _cli
+
+
+@pytest.fixture
+def rpc_node():
+    node = RPCNode().start()
+    yield node
+    node.stop()
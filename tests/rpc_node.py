@@ -0,0 +1,112 @@
+"""
+A small in-process JSON-RPC node used to test the RPC code paths without network access.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable
+
+
+class RPCNode:
+    def __init__(self, latency: float = 0.0) -> None:
+        # * Seconds every HTTP request is held before it is answered, standing in for the network round-trip
+        self.latency = latency
+        self.storage: dict[tuple[str, int], int] = {}
+        # * Answers `eth_call` given the transaction and the block tag, raising to answer with an error
+        self.call_handler: Callable[[dict, str], str] = lambda transaction, block: "0x"
+        self.methods: dict[str, Callable[..., Any]] = {
+            "eth_chainId": lambda: hex(1337),
+            "eth_blockNumber": lambda: hex(100),
+            "eth_getStorageAt": self.get_storage_at,
+            # * The state override of a Multicall3 aggregate call is accepted and ignored
+            "eth_call": lambda transaction, block, overrides=None: self.call_handler(transaction, block),
+            "eth_getLogs": self.get_logs,
+        }
+        self.logs: list[dict] = []
+        # * Most logs a single `eth_getLogs` request answers, larger ranges are rejected the way Infura does
+        self.max_logs = 10_000
+        # * HTTP statuses the next requests are answered with, one each, before the node answers normally again
+        self.fail_with: list[int] = []
+        self.http_requests = 0
+        self.rpc_requests = 0
+        node = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                if node.latency:
+                    time.sleep(node.latency)
+                if node.fail_with:
+                    node.http_requests += 1
+                    self.send_response(node.fail_with.pop(0))
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                response = json.dumps(node.handle(json.loads(body))).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(response)))
+                self.end_headers()
+                try:
+                    self.wfile.write(response)
+                except (BrokenPipeError, ConnectionResetError):
+                    # * The client gave up waiting on a slow node, printing the traceback would land in a later test's output
+                    pass
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def uri(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def get_storage_at(self, address: str, slot: str, block: str) -> str:
+        value = self.storage.get((address.lower(), int(slot, 16)), 0)
+        return "0x" + value.to_bytes(32, "big").hex()
+
+    def get_logs(self, log_filter: dict) -> list[dict]:
+        start, end = int(log_filter["fromBlock"], 16), int(log_filter["toBlock"], 16)
+        topics = log_filter.get("topics", [[]])[0]
+        addresses = [address.lower() for address in log_filter.get("address", [])]
+        logs = [
+            log
+            for log in self.logs
+            if start <= int(log["blockNumber"], 16) <= end
+            and (not topics or log["topics"][0] in topics)
+            and (not addresses or log["address"].lower() in addresses)
+        ]
+        if len(logs) > self.max_logs:
+            msg = f"query returned more than {self.max_logs} results"
+            raise ValueError(msg)
+        return logs
+
+    def handle(self, payload: Any) -> Any:
+        self.http_requests += 1
+        if isinstance(payload, list):
+            return [self.handle_one(request) for request in payload]
+        return self.handle_one(payload)
+
+    def handle_one(self, request: dict) -> dict:
+        self.rpc_requests += 1
+        method = self.methods.get(request["method"])
+        if method is None:
+            return {"jsonrpc": "2.0", "id": request["id"], "error": {"code": -32601, "message": "method not found"}}
+        try:
+            result = method(*request.get("params", []))
+        except Exception as e:
+            # * Exceptions may carry the JSON-RPC error code to answer with, e.g. -32005 for rate limits
+            code = getattr(e, "code", 3)
+            return {"jsonrpc": "2.0", "id": request["id"], "error": {"code": code, "message": str(e)}}
+        return {"jsonrpc": "2.0", "id": request["id"], "result": result}
+
+    def start(self) -> "RPCNode":
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
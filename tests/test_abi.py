@@ -0,0 +1,24 @@
+from ape_utils.abi import abi_cache_info, clear_abi_cache, get_method_abi, get_selector
+from ape_utils.utils import decode_calldata, encode_calldata
+
+
+def test_signature_is_parsed_once() -> None:
+    clear_abi_cache()
+    signature = "call_this_view_function(uint256 arg1)"
+    assert get_method_abi(signature) is get_method_abi(signature)
+    assert get_selector(signature).hex() == "1e4f420d"
+
+    stats = abi_cache_info()
+    assert stats["method_abi"]["misses"] == 1
+    assert stats["method_abi"]["hits"] >= 1
+    assert stats["selector"] == {"hits": 0, "misses": 1, "size": 1, "maxsize": 1024}
+
+
+def test_encode_and_decode_share_the_cache() -> None:
+    clear_abi_cache()
+    signature = "call_this_view_function(uint256 arg1)"
+    calldata = encode_calldata(signature, 1234)
+    assert bytes(calldata).hex() == "1e4f420d" + "00" * 30 + "04d2"
+    assert decode_calldata(signature, "0x" + bytes(calldata).hex()) == {"arg1": 1234}
+    # * encode parses the signature and the selector reuses it, decode is a second hit
+    assert abi_cache_info()["method_abi"] == {"hits": 2, "misses": 1, "size": 1, "maxsize": 1024}
@@ -1,9 +1,103 @@
 # import pytest
+import asyncio
+import io
+from types import SimpleNamespace
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
 from click.testing import CliRunner
+from eth_abi import decode, encode
+from multicall import Call
 import rich_click as rclick
 
+import ape_utils.utils
+from ape_utils._cli import read_batch_file
+from ape_utils.clients import aclose_clients
+from ape_utils.fork import ForkState
+from ape_utils.utils import _batch_calls, async_call_many
+
 
-def test_call_a_view_contract(runner: CliRunner, cli: rclick.RichGroup) -> None:
-    result = runner.invoke(cli, ["call", "--function-sig", "call_this_view_function(uint256)(string)", "--address","0x80E097a70CACA11EB71B6401FB12D48A1A61Ef54", "--args", "[6147190]", "--network", ":sepolia"])
+def test_call_a_view_contract(runner: CliRunner, cli: rclick.RichGroup, tmp_path) -> None:
+    # * A stand-in for the Sepolia contract: runtime code returning the ABI encoded string appended to it
+    output = encode(["string"], ["ape-utils"])
+    code = "0x6060600c60003960606000f3" + output.hex()
+    state = ForkState(11155111, 6147190, accounts={"0x80E097a70CACA11EB71B6401FB12D48A1A61Ef54": {"code": code}})
+    state.save(tmp_path / "sepolia.fork.json")
+
+    result = runner.invoke(cli, ["call", "--function-sig", "call_this_view_function(uint256)(string)", "--address","0x80E097a70CACA11EB71B6401FB12D48A1A61Ef54", "--args", "[6147190]", "--network", ":sepolia", "--fork-state", str(tmp_path / "sepolia.fork.json")])
     # print(result)
-    assert result.exit_code == 0
+    assert result.exit_code == 0, result.output
+    assert "ape-utils" in result.output
+
+
+def test_read_batch_file() -> None:
+    batch = io.StringIO(
+        "# address, function signature, args\n"
+        "('0x80E097a70CACA11EB71B6401FB12D48A1A61Ef54', 'call_this_view_function(uint256)(string)', [6147190])\n"
+        "\n"
+        "['0x894A02d4574318a9da4EEc7884a7D0c095E65507', 'couple_param_function(uint256,string)(string)', [1, 'a']]\n"
+    )
+    calls = read_batch_file(batch)
+    assert [call[1] for call in calls] == ["call_this_view_function(uint256)(string)", "couple_param_function(uint256,string)(string)"]
+    assert calls[1][2] == [1, "a"]
+
+
+def test_batch_calls_respect_calldata_limit() -> None:
+    calls = [Call("0x80E097a70CACA11EB71B6401FB12D48A1A61Ef54", ["call_this_view_function(uint256)(string)", i]) for i in range(10)]
+    # * Each call is 4 bytes selector + 32 bytes argument, which takes 5 + 2 words in the aggregate
+    batches = list(_batch_calls(calls, 3 * 224))
+    assert [len(batch) for batch in batches] == [3, 3, 3, 1]
+    assert [call for batch in batches for call in batch] == calls
+
+
+def test_async_call_many_retries_and_keeps_order() -> None:
+    attempts: list[str] = []
+
+    async def handler(request: web.Request) -> web.Response:
+        payload = await request.json()
+        data = payload["params"][0]["data"]
+        attempts.append(data)
+        # * fail the first attempt of every call once to exercise the retries
+        if attempts.count(data) == 1:
+            return web.Response(status=503)
+        value = int(data[10:], 16)
+        result = "0x" + encode(["uint256"], [value * 2]).hex()
+        return web.json_response({"jsonrpc": "2.0", "id": payload["id"], "result": result})
+
+    async def run() -> list:
+        app = web.Application()
+        app.router.add_post("/", handler)
+        server = TestServer(app)
+        await server.start_server()
+        try:
+            provider = SimpleNamespace(uri=str(server.make_url("/")))
+            calls = [("0x80E097a70CACA11EB71B6401FB12D48A1A61Ef54", "double(uint256)(uint256)", [i]) for i in range(5)]
+            return await async_call_many(calls, provider, concurrency=2, backoff=0)
+        finally:
+            await aclose_clients()
+            await server.close()
+
+    assert asyncio.run(run()) == [(True, i * 2) for i in range(5)]
+
+
+def test_batch_survives_throttling(runner: CliRunner, cli: rclick.RichGroup, rpc_node, monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(ape_utils.utils, "provider_http_uri", lambda _: rpc_node.uri)
+
+    def aggregate3(transaction: dict, block: str) -> str:
+        calls = decode(["(address,bool,bytes)[]"], bytes.fromhex(transaction["data"][10:]))[0]
+        # * Doubles the argument of every call, the second call fails
+        results = [(index != 1, encode(["uint256"], [int(data[4:].hex(), 16) * 2])) for index, (_, _, data) in enumerate(calls)]
+        return "0x" + encode(["(bool,bytes)[]"], [results]).hex()
+
+    rpc_node.call_handler = aggregate3
+    rpc_node.fail_with = [429, 503]
+    batch = tmp_path / "calls.txt"
+    batch.write_text("".join(f"('0x80E097a70CACA11EB71B6401FB12D48A1A61Ef54', 'double(uint256)(uint256)', [{i}])\n" for i in range(3)))
+
+    result = runner.invoke(cli, ["call", "--batch", str(batch), "--raw", "--network", "ethereum:local:test"])
+
+    assert result.exit_code == 0, result.output
+    assert result.output.splitlines() == ["True\t0", "False\tNone", "True\t4"]
+    # * One aggregate call, answered on its third attempt
+    assert rpc_node.http_requests == 3
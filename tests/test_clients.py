@@ -0,0 +1,20 @@
+from ape_utils.clients import close_clients, configure_clients, get_session, get_web3
+
+
+def test_web3_client_is_reused_per_uri() -> None:
+    first = get_web3("http://127.0.0.1:8545")
+    assert get_web3("http://127.0.0.1:8545") is first
+    assert get_web3("http://127.0.0.1:8546") is not first
+    assert get_session("http://127.0.0.1:8545") is get_session("http://127.0.0.1:8545")
+    close_clients()
+    assert get_web3("http://127.0.0.1:8545") is not first
+
+
+def test_configure_clients_applies_pool_settings() -> None:
+    configure_clients(pool_size=3, timeout=5)
+    try:
+        session = get_session("http://127.0.0.1:8545")
+        assert session.get_adapter("http://127.0.0.1:8545")._pool_maxsize == 3
+        assert get_web3("http://127.0.0.1:8545").provider.get_request_kwargs()["timeout"] == 5
+    finally:
+        configure_clients()
@@ -0,0 +1,63 @@
+import io
+
+import pytest
+
+from ape_utils.columnar import encode_columns, read_csv_columns
+from ape_utils.utils import abi_encode_calldata, encode_calldata
+
+SIGNATURE = "transfer(address to, uint256 amount)"
+HOLDERS = ["0xDbB18e367E4A2A36A9F2AF7af8b3c743938deCF2", "0x" + "11" * 20, "0x" + "ab" * 20]
+
+
+def test_rows_match_encode_calldata() -> None:
+    amounts = [0, 1000, 2**255]
+    batch = encode_columns(SIGNATURE, {"to": HOLDERS, "amount": amounts})
+    assert len(batch) == 3
+    assert list(batch) == [bytes(encode_calldata(SIGNATURE, *row)) for row in zip(HOLDERS, amounts)]
+    assert len(batch.buffer) == 3 * 68
+    assert list(batch.offsets) == [0, 68, 136, 204]
+
+
+def test_numpy_columns_are_written_in_one_step() -> None:
+    np = pytest.importorskip("numpy")
+    signature = "f(int64 a, bool b, uint32 c)"
+    columns = [np.array([-5, 0, 2**62]), np.array([True, False, True]), np.array([1, 2, 3], dtype=np.uint8)]
+    batch = encode_columns(signature, columns, with_selector=False)
+    rows = zip(*(column.tolist() for column in columns))
+    assert list(batch) == [bytes(abi_encode_calldata(signature, *row)) for row in rows]
+
+
+def test_rows_needing_conversion_fall_back_to_ape() -> None:
+    batch = encode_columns(SIGNATURE, [HOLDERS[:2], ["1 ether", "5"]])
+    assert batch[0] == bytes(encode_calldata(SIGNATURE, HOLDERS[0], 10**18))
+    assert batch[-1] == bytes(encode_calldata(SIGNATURE, HOLDERS[1], 5))
+
+
+def test_invalid_rows_report_their_index() -> None:
+    with pytest.raises(ValueError, match="Row 1"):
+        encode_columns("f(uint8 a)", [[1, 300]])
+    with pytest.raises(ValueError, match="Missing columns: amount"):
+        encode_columns(SIGNATURE, {"to": HOLDERS})
+
+
+def test_dynamic_signatures_use_variable_offsets() -> None:
+    signature = "f(string s, uint256 a)"
+    batch = encode_columns(signature, [["a", "b" * 40], [1, 2]])
+    assert list(batch) == [bytes(encode_calldata(signature, "a", 1)), bytes(encode_calldata(signature, "b" * 40, 2))]
+    assert batch.offsets[-1] == len(batch.buffer)
+
+
+def test_encode_csv_input(runner, cli) -> None:
+    rows = "to,amount\n" + "".join(f"{holder},{index}\n" for index, holder in enumerate(HOLDERS))
+    assert read_csv_columns(io.StringIO(rows))["amount"] == ["0", "1", "2"]
+    result = runner.invoke(cli, ["encode", "--signature", SIGNATURE, "--input", "-"], input=rows)
+    assert result.exit_code == 0, result.output
+    expected = [f"0x{bytes(encode_calldata(SIGNATURE, holder, index)).hex()}" for index, holder in enumerate(HOLDERS)]
+    assert result.output.splitlines() == expected
+
+
+def test_encode_csv_input_reports_errors(runner, cli) -> None:
+    result = runner.invoke(cli, ["encode", "--signature", SIGNATURE, "--input", "-", "--format", "json"], input="to\n0x\n")
+    assert result.exit_code == 1
+    assert isinstance(result.exception, SystemExit)
+    assert "Missing columns: amount" in result.output
@@ -0,0 +1,49 @@
+import json
+
+import pytest
+from click.testing import CliRunner
+from ethpm_types import MethodABI
+import rich_click as rclick
+
+from ape_utils.dispatch import SelectorDecoder, UnknownSelectorError
+from ape_utils.utils import encode_calldata
+
+TRANSFER_ABI = {
+    "type": "function",
+    "name": "transfer",
+    "stateMutability": "nonpayable",
+    "inputs": [{"name": "to", "type": "address"}, {"name": "amount", "type": "uint256"}],
+    "outputs": [{"name": "", "type": "bool"}],
+}
+TRANSFER = "0x" + bytes(encode_calldata("transfer(address to, uint256 amount)", "0x894A02d4574318a9da4EEc7884a7D0c095E65507", 5)).hex()
+VIEW = "0x1e4f420d00000000000000000000000000000000000000000000000000000000000004d2"
+
+
+def test_selector_decoder_dispatches_on_selector() -> None:
+    decoder = SelectorDecoder(["call_this_view_function(uint256 arg1)"], abis=[MethodABI.model_validate(TRANSFER_ABI)])
+
+    assert len(decoder) == 2
+    assert decoder.decode(VIEW) == {"selector": "0x1e4f420d", "function": "call_this_view_function(uint256)", "args": {"arg1": 1234}}
+    assert decoder.decode(TRANSFER)["args"] == {"to": "0x894A02d4574318a9da4EEc7884a7D0c095E65507", "amount": 5}
+    assert decoder.decode(VIEW[2:]) == decoder.decode(VIEW)
+    with pytest.raises(UnknownSelectorError, match="0xdeadbeef"):
+        decoder.decode("0xdeadbeef")
+
+
+def test_decode_with_abi_file(runner: CliRunner, cli: rclick.RichGroup, tmp_path) -> None:
+    abi_file = tmp_path / "abi.json"
+    abi_file.write_text(json.dumps({"abi": [TRANSFER_ABI, {"type": "event", "name": "Transfer", "inputs": []}]}))
+    result = runner.invoke(cli, ["decode", "--abi-file", str(abi_file), "--input", "-"], input=f"{TRANSFER}\n0xdeadbeef\n")
+
+    assert result.exit_code == 0
+    rows = [json.loads(line) for line in result.output.splitlines()]
+    assert rows[0]["function"] == "transfer(address,uint256)"
+    assert rows[0]["args"]["amount"] == 5
+    assert rows[1] == {"error": "Unknown selector 0xdeadbeef"}
+
+
+def test_abi_file_entries_default_to_functions(tmp_path) -> None:
+    abi_file = tmp_path / "abi.json"
+    abi_file.write_text(json.dumps([{key: value for key, value in TRANSFER_ABI.items() if key != "type"}]))
+
+    assert SelectorDecoder.from_file(abi_file).decode(TRANSFER)["function"] == "transfer(address,uint256)"
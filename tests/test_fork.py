@@ -0,0 +1,100 @@
+import json
+
+import pytest
+
+import ape_utils.fork
+from ape_utils.abi import get_selector
+from ape_utils.fork import ForkState, LocalFork, MissingStateError, capture_call, capture_storage
+
+ADDRESS = "0xDbB18e367E4A2A36A9F2AF7af8b3c743938deCF2"
+# * Runtime code returning the word in storage slot 0, whatever the calldata
+SUPPLY_CODE = "0x60005460005260206000f3"
+
+
+@pytest.fixture
+def node(rpc_node, monkeypatch):
+    traces = []
+
+    def trace_call(transaction: dict, block: str, config: dict) -> dict:
+        traces.append((transaction, block, config))
+        return {ADDRESS.lower(): {"balance": "0x0", "code": SUPPLY_CODE, "storage": {"0x0": hex(5000)}}}
+
+    rpc_node.methods["debug_traceCall"] = trace_call
+    rpc_node.methods["eth_getBlockByNumber"] = lambda block, full: {"number": block, "timestamp": hex(1_700_000_000)}
+    rpc_node.traces = traces
+    monkeypatch.setattr(ape_utils.fork, "provider_http_uri", lambda _: rpc_node.uri)
+    return rpc_node
+
+
+def test_capture_call_and_replay_offline(node, tmp_path) -> None:
+    state = capture_call(None, "totalSupply()(uint256)", ADDRESS, [], 90)
+
+    transaction, block, config = node.traces[0]
+    assert (transaction["data"], block, config) == (f"0x{get_selector('totalSupply()').hex()}", hex(90), {"tracer": "prestateTracer"})
+    assert (state.chain_id, state.block, state.timestamp) == (1337, 90, 1_700_000_000)
+
+    node.storage[(ADDRESS.lower(), 1)] = 7
+    capture_storage(None, ADDRESS, [1], state=state).save(tmp_path / "fork.json")
+    with pytest.raises(ValueError, match="block 90"):
+        capture_storage(None, ADDRESS, [1], 91, state)
+
+    fork = LocalFork.open(tmp_path / "fork.json")
+    assert fork.call_view_function("totalSupply()(uint256 supply)", ADDRESS, []) == {"supply": 5000}
+    assert fork.read_storage_many(ADDRESS, [0, 1]) == [(5000).to_bytes(32, "big"), (7).to_bytes(32, "big")]
+    with pytest.raises(MissingStateError):
+        fork.read_storage(ADDRESS, 2)
+
+
+def test_local_fork_runs_with_the_captured_chain_id() -> None:
+    # * Runtime code returning `block.chainid` and `block.number`
+    probe = "0x46600052436020526040" + "6000f3"
+    fork = LocalFork(ForkState(11155111, 90, accounts={ADDRESS: {"code": probe}}))
+
+    assert fork.call_view_function("probe()(uint256 chain, uint256 number)", ADDRESS, []) == {"chain": 11155111, "number": 0}
+
+
+def test_fork_state_round_trips_through_json(tmp_path) -> None:
+    state = ForkState(1, 10, 20, {ADDRESS: {"balance": 3, "nonce": "0x1", "code": SUPPLY_CODE, "storage": {2: "0x01"}}})
+    state.save(tmp_path / "fork.json")
+
+    loaded = ForkState.load(tmp_path / "fork.json")
+    assert loaded.to_json() == state.to_json()
+    assert loaded.storage(ADDRESS, 2) == (1).to_bytes(32, "big")
+    assert json.loads((tmp_path / "fork.json").read_text())["accounts"][ADDRESS.lower()]["balance"] == "0x3"
+
+
+def test_local_fork_answers_worker_requests() -> None:
+    fork = LocalFork(ForkState(1, 10, accounts={ADDRESS: {"code": SUPPLY_CODE, "storage": {0: "0x2a"}}}))
+
+    call = {"op": "call", "function_sig": "totalSupply()(uint256)", "address": ADDRESS, "args": []}
+    assert fork.handle(call) == {"ok": True, "result": 42}
+    assert fork.handle({**call, "raw_output": True}) == {"ok": True, "result": f"0x{(42).to_bytes(32, 'big').hex()}"}
+    assert not fork.handle({**call, "block": 11})["ok"]
+    assert "not in the fork state" in fork.handle({"op": "read", "address": ADDRESS, "slots": [0, 1]})["error"]
+
+
+def test_read_command_from_fork_state(runner, cli, tmp_path) -> None:
+    ForkState(1, 10, accounts={ADDRESS: {"storage": {0: "0x2a", 1: "0x01"}}}).save(tmp_path / "fork.json")
+
+    result = runner.invoke(
+        cli, ["read", "--address", ADDRESS, "--slots", "0-1", "--raw", "--fork-state", str(tmp_path / "fork.json")]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert result.output.splitlines() == [f"0\t{(42).to_bytes(32, 'big').hex()}", f"1\t{(1).to_bytes(32, 'big').hex()}"]
+
+    result = runner.invoke(cli, ["read", "--address", ADDRESS, "--slot", "0", "--diff", "--fork-state", str(tmp_path / "fork.json")])
+    assert result.exit_code == 2
+    assert "--fork-state answers a single call" in result.output
+
+
+def test_fork_state_rejects_another_network(runner, cli, tmp_path) -> None:
+    ForkState(1, 10, accounts={ADDRESS: {"storage": {0: "0x2a"}}}).save(tmp_path / "fork.json")
+    command = ["read", "--address", ADDRESS, "--slot", "0", "--raw", "--fork-state", str(tmp_path / "fork.json")]
+
+    assert runner.invoke(cli, [*command, "--network", "ethereum:mainnet"]).exit_code == 0
+    result = runner.invoke(cli, [*command, "--network", ":sepolia"])
+    assert result.exit_code == 1
+    assert "of chain 1, not 11155111" in result.output
+    result = runner.invoke(cli, [*command, "--network", ":sepolia", "--network", "ethereum:mainnet"])
+    assert result.exit_code == 2
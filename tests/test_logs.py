@@ -0,0 +1,141 @@
+import json
+import time
+
+import pytest
+from eth_abi import encode
+from eth_utils import keccak
+
+import ape_utils.logs
+from ape_utils.abi import get_topic
+from ape_utils.logs import EventDecoder, UnknownTopicError, fetch_logs, too_many_results
+from ape_utils.rpc import RPCError
+
+TOKEN = "0xDbB18e367E4A2A36A9F2AF7af8b3c743938deCF2"
+HOLDER = "0x894A02d4574318a9da4EEc7884a7D0c095E65507"
+TRANSFER = "Transfer(address indexed from, address indexed to, uint256 value)"
+
+
+def transfer_log(block: int, value: int, log_index: int = 0) -> dict:
+    return {
+        "address": TOKEN.lower(),
+        "topics": [
+            f"0x{get_topic(TRANSFER).hex()}",
+            f"0x{encode(['address'], [TOKEN]).hex()}",
+            f"0x{encode(['address'], [HOLDER]).hex()}",
+        ],
+        "data": f"0x{encode(['uint256'], [value]).hex()}",
+        "blockNumber": hex(block),
+        "transactionHash": f"0x{block:064x}",
+        "logIndex": hex(log_index),
+    }
+
+
+def test_event_decoder_decodes_indexed_and_data_inputs() -> None:
+    decoder = EventDecoder([TRANSFER])
+    assert decoder.topics == ["0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"]
+
+    assert decoder.decode(transfer_log(7, 1000, 2)) == {
+        "block": 7,
+        "transaction": f"0x{7:064x}",
+        "log_index": 2,
+        "address": TOKEN,
+        "event": "Transfer",
+        "args": {"from": TOKEN, "to": HOLDER, "value": 1000},
+    }
+
+
+def test_event_decoder_keeps_hashed_inputs_and_reports_unknown_topics() -> None:
+    signature = "Named(string indexed name, bytes data)"
+    decoder = EventDecoder([signature])
+    log = {
+        **transfer_log(1, 0),
+        "topics": [f"0x{get_topic(signature).hex()}", f"0x{keccak(text='ape').hex()}"],
+        "data": f"0x{encode(['bytes'], [b'ape']).hex()}",
+    }
+    assert decoder.decode(log)["args"] == {"name": keccak(text="ape"), "data": b"ape"}
+
+    rows = list(decoder.decode_stream([transfer_log(1, 0)]))
+    assert isinstance(rows[0], UnknownTopicError)
+
+
+def test_fetch_logs_splits_chunks_and_keeps_block_order(rpc_node, monkeypatch) -> None:
+    monkeypatch.setattr(ape_utils.logs, "provider_http_uri", lambda _: rpc_node.uri)
+    rpc_node.logs = [transfer_log(block, block) for block in range(0, 100, 2)]
+    rpc_node.max_logs = 5
+
+    logs = list(fetch_logs(None, [TOKEN], [f"0x{get_topic(TRANSFER).hex()}"], 0, 99, chunk_size=100, workers=4))
+
+    assert [int(log["blockNumber"], 16) for log in logs] == list(range(0, 100, 2))
+
+
+def test_fetch_logs_buffers_a_bounded_window_behind_a_slow_chunk(rpc_node, monkeypatch) -> None:
+    monkeypatch.setattr(ape_utils.logs, "provider_http_uri", lambda _: rpc_node.uri)
+    rpc_node.logs = [transfer_log(block, block) for block in range(40)]
+    requested = []
+
+    def get_logs(log_filter: dict) -> list[dict]:
+        requested.append(int(log_filter["fromBlock"], 16))
+        if log_filter["fromBlock"] == "0x0":
+            time.sleep(0.3)
+        return rpc_node.get_logs(log_filter)
+
+    rpc_node.methods["eth_getLogs"] = get_logs
+    logs = fetch_logs(None, [], [], 0, 39, chunk_size=1, workers=2)
+
+    assert int(next(logs)["blockNumber"], 16) == 0
+    # * The first chunk and at most 2 * workers - 1 chunks behind it
+    assert len(requested) <= 4
+    assert [int(log["blockNumber"], 16) for log in logs] == list(range(1, 40))
+
+
+def test_fetch_logs_stops_without_waiting_for_requests_in_flight(rpc_node, monkeypatch) -> None:
+    monkeypatch.setattr(ape_utils.logs, "provider_http_uri", lambda _: rpc_node.uri)
+    rpc_node.logs = [transfer_log(block, block) for block in range(10)]
+    logs = fetch_logs(None, [], [], 0, 9, chunk_size=1, workers=2)
+    next(logs)
+    rpc_node.latency = 0.5
+
+    started = time.monotonic()
+    logs.close()
+    assert time.monotonic() - started < 0.3
+
+
+def test_too_many_results_ignores_rate_limits() -> None:
+    for message in [
+        "query returned more than 10000 results",
+        "Log response size exceeded. You can make eth_getLogs requests with up to a 2K block range",
+        "block range is too wide",
+    ]:
+        assert too_many_results(RPCError("eth_getLogs", {"code": -32005, "message": message}))
+    for message in [
+        "daily request count exceeded, request rate limited",
+        "Your app has exceeded its compute units per second capacity",
+        "execution timeout",
+    ]:
+        assert not too_many_results(RPCError("eth_getLogs", {"code": -32005, "message": message}))
+
+
+def test_fetch_logs_raises_other_errors(rpc_node, monkeypatch) -> None:
+    monkeypatch.setattr(ape_utils.logs, "provider_http_uri", lambda _: rpc_node.uri)
+    rpc_node.methods["eth_getLogs"] = lambda log_filter: 1 / 0
+
+    with pytest.raises(RPCError, match="division by zero"):
+        list(fetch_logs(None, [], [], 0, 10))
+
+
+def test_logs_command_streams_ndjson(runner, cli, rpc_node, monkeypatch) -> None:
+    monkeypatch.setattr(ape_utils.logs, "provider_http_uri", lambda _: rpc_node.uri)
+    rpc_node.logs = [transfer_log(block, block) for block in range(5)]
+
+    result = runner.invoke(
+        cli,
+        [
+            *("logs", "--address", TOKEN, "--event", "Transfer(address indexed,address indexed,uint256)"),
+            *("--from-block", "1", "--chunk-size", "2", "--network", "ethereum:local:test"),
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    rows = [json.loads(line) for line in result.output.splitlines()]
+    assert [row["block"] for row in rows] == [1, 2, 3, 4]
+    assert rows[0]["args"] == {"0": TOKEN, "1": HOLDER, "2": 1}
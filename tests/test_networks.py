@@ -0,0 +1,96 @@
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import ape_utils.utils
+from ape_utils.clients import aclose_clients
+from ape_utils.utils import acall_on_networks
+from tests.rpc_node import RPCNode
+
+ADDRESS = "0xDbB18e367E4A2A36A9F2AF7af8b3c743938deCF2"
+SIGNATURE = "totalSupply()(uint256)"
+
+
+def answer(value: int):
+    return lambda transaction, block: "0x" + value.to_bytes(32, "big").hex()
+
+
+@pytest.fixture
+def chains(rpc_node, monkeypatch):
+    slow = RPCNode().start()
+    rpc_node.call_handler = answer(1000)
+    slow.call_handler = lambda transaction, block: time.sleep(2) or answer(7)(transaction, block)
+    uris = {"fast:mainnet": rpc_node.uri, "slow:mainnet": slow.uri}
+
+    def get_provider_from_choice(choice):
+        if choice not in uris:
+            msg = f"No network {choice}"
+            raise ValueError(msg)
+        return SimpleNamespace(uri=uris[choice])
+
+    monkeypatch.setattr(ape_utils.utils.networks, "get_provider_from_choice", get_provider_from_choice)
+    yield
+    slow.stop()
+
+
+@pytest.mark.usefixtures("chains")
+def test_slow_networks_do_not_block_the_others() -> None:
+    async def run():
+        try:
+            return await acall_on_networks(
+                SIGNATURE, ADDRESS, [], ["fast:mainnet", "slow:mainnet", "missing:mainnet"], timeout=0.5
+            )
+        finally:
+            await aclose_clients()
+
+    start = time.perf_counter()
+    results = asyncio.run(run())
+    assert time.perf_counter() - start < 1.5
+    assert results == {
+        "fast:mainnet": (True, 1000),
+        "slow:mainnet": (False, "timed out after 0.5s"),
+        "missing:mainnet": (False, "No network missing:mainnet"),
+    }
+
+
+@pytest.mark.usefixtures("chains")
+def test_cli_merges_networks_as_json(runner, cli) -> None:
+    result = runner.invoke(
+        cli,
+        [
+            "call",
+            *("--function-sig", SIGNATURE, "--address", ADDRESS, "--args", "[]"),
+            *("--network", "fast:mainnet,slow:mainnet", "--network-timeout", "0.5", "--raw"),
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    assert json.loads(result.output) == {
+        "fast:mainnet": {"success": True, "output": 1000},
+        "slow:mainnet": {"success": False, "output": "timed out after 0.5s"},
+    }
+
+
+def test_network_choices_are_resolved_one_at_a_time(rpc_node, monkeypatch) -> None:
+    rpc_node.call_handler = answer(1000)
+    resolving, overlaps = [], []
+
+    def get_provider_from_choice(choice):
+        resolving.append(choice)
+        overlaps.append(len(resolving))
+        time.sleep(0.05)
+        resolving.remove(choice)
+        return SimpleNamespace(uri=rpc_node.uri)
+
+    monkeypatch.setattr(ape_utils.utils.networks, "get_provider_from_choice", get_provider_from_choice)
+
+    async def run():
+        try:
+            return await acall_on_networks(SIGNATURE, ADDRESS, [], [f"chain{index}:mainnet" for index in range(4)])
+        finally:
+            await aclose_clients()
+
+    assert all(success for success, _ in asyncio.run(run()).values())
+    assert overlaps == [1, 1, 1, 1]
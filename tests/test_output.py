@@ -0,0 +1,89 @@
+import io
+import json
+import subprocess
+import sys
+
+import pytest
+
+from ape_utils.streaming import buffered, write_rows
+
+ADDRESS = "0xDbB18e367E4A2A36A9F2AF7af8b3c743938deCF2"
+SIGNATURE = "transfer(address to, uint256 amount)"
+CALLDATA = (
+    "0xa9059cbb000000000000000000000000dbb18e367e4a2a36a9f2af7af8b3c743938decf2"
+    "0000000000000000000000000000000000000000000000000000000000000005"
+)
+
+_PROBE = f"""
+import sys
+from ape_utils._cli import cli
+try:
+    cli.main(["encode", "--signature", {SIGNATURE!r}, {ADDRESS!r}, "5", "--format", "hex"], standalone_mode=False)
+finally:
+    print(sorted(m for m in ("rich.console", "rich.pretty", "rich.table", "rich.traceback") if m in sys.modules))
+"""
+
+
+def test_write_rows_formats() -> None:
+    rows = [{"slot": 0, "value": b"\x01"}, {"slot": 1, "value": b"\x02"}]
+    outputs = {}
+    for output_format in ("json", "ndjson", "csv", "hex"):
+        output = io.StringIO()
+        assert write_rows(rows, output, output_format, ["slot", "value"], "value") == 2
+        outputs[output_format] = output.getvalue()
+
+    assert json.loads(outputs["json"]) == [{"slot": 0, "value": "0x01"}, {"slot": 1, "value": "0x02"}]
+    assert outputs["ndjson"] == '{"slot":0,"value":"0x01"}\n{"slot":1,"value":"0x02"}\n'
+    assert outputs["csv"] == "slot,value,error\n0,0x01,\n1,0x02,\n"
+    assert outputs["hex"] == "0x01\n0x02\n"
+
+
+def test_write_rows_rejects_non_bytes_as_hex() -> None:
+    with pytest.raises(ValueError, match="not bytes"):
+        write_rows([1], io.StringIO(), "hex")
+
+
+def test_buffered_keeps_the_underlying_stream_open() -> None:
+    binary = io.BytesIO()
+    stream = io.TextIOWrapper(binary, encoding="utf-8", line_buffering=True)
+    with buffered(stream) as output:
+        assert output is not stream
+        output.write("0x01\n")
+    stream.write("0x02\n")
+    stream.flush()
+    assert binary.getvalue() == b"0x01\n0x02\n"
+
+
+def test_encode_format_json(runner, cli) -> None:
+    result = runner.invoke(cli, ["encode", "--signature", SIGNATURE, ADDRESS, "5", "--format", "json"])
+    assert result.exit_code == 0, result.output
+    assert json.loads(result.output) == CALLDATA
+
+
+def test_decode_format_csv(runner, cli) -> None:
+    result = runner.invoke(cli, ["decode", "--signature", SIGNATURE, CALLDATA, "--format", "csv"])
+    assert result.exit_code == 0, result.output
+    assert result.output == f"to,amount,error\n{ADDRESS},5,\n"
+
+
+def test_decode_format_reports_errors_with_exit_code(runner, cli) -> None:
+    result = runner.invoke(cli, ["decode", "--signature", SIGNATURE, CALLDATA[:12], "--format", "json"])
+    assert result.exit_code == 1
+
+
+def test_read_format_ndjson(runner, cli) -> None:
+    result = runner.invoke(
+        cli, ["read", "--address", ADDRESS, "--slots", "0-1", "--format", "ndjson", "--network", "ethereum:local:test"]
+    )
+    assert result.exit_code == 0, result.output
+    assert [json.loads(line) for line in result.output.splitlines()] == [
+        {"slot": 0, "value": "0x" + "00" * 32},
+        {"slot": 1, "value": "0x" + "00" * 32},
+    ]
+
+
+def test_machine_output_does_not_import_rich() -> None:
+    result = subprocess.run([sys.executable, "-c", _PROBE], capture_output=True, text=True, check=True)  # noqa: S603
+    lines = result.stdout.splitlines()
+    assert lines[0] == CALLDATA
+    assert lines[-1] == "[]"
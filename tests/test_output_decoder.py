@@ -0,0 +1,69 @@
+from types import SimpleNamespace
+
+from eth_abi import encode
+
+from ape_utils.abi import get_selector
+from ape_utils.outputs import get_output_decoder, parse_output
+from ape_utils.utils import call_view_function
+
+ADDRESS = "0xDbB18e367E4A2A36A9F2AF7af8b3c743938deCF2"
+HOLDER = "0x894a02d4574318a9da4eec7884a7d0c095e65507"
+POSITION = "position(uint256 id)(uint256 amount, (address token, uint256 value)[] holdings, (uint8,bool))"
+POSITION_DATA = encode(["uint256", "(address,uint256)[]", "(uint8,bool)"], [5, [(HOLDER, 3)], (1, True)])
+
+
+def test_parse_output_canonicalizes_types() -> None:
+    assert parse_output("uint amount")[:2] == ("amount", "uint256")
+    assert parse_output("string memory name")[:2] == ("name", "string")
+    assert parse_output("(address token, uint value)[2][] holdings")[:2] == ("holdings", "(address,uint256)[2][]")
+    assert parse_output("tuple(uint8,bool)")[1:] == ("(uint8,bool)", None)
+
+
+def test_output_decoder_names_fields_and_structs() -> None:
+    decoder = get_output_decoder(POSITION)
+
+    assert decoder.signature == "position(uint256)(uint256,(address,uint256)[],(uint8,bool))"
+    assert decoder.decode(POSITION_DATA) == {
+        "amount": 5,
+        "holdings": [{"token": HOLDER, "value": 3}],
+        "2": (1, True),
+    }
+    assert get_output_decoder(POSITION) is decoder
+
+
+def test_output_decoder_keeps_unnamed_outputs() -> None:
+    assert get_output_decoder("f()(uint256)").decode(encode(["uint256"], [7])) == 7
+    assert get_output_decoder("f()(uint256,string)").decode(encode(["uint256", "string"], [7, "a"])) == (7, "a")
+    # * The empty output of an address without code
+    assert get_output_decoder("f()(uint256)").decode("0x") is None
+
+
+def test_output_decoder_applies_handlers_by_name_or_position() -> None:
+    decoder = get_output_decoder(POSITION)
+    handlers = {"amount": str, 2: list, "holdings": len}
+
+    assert decoder.decode(POSITION_DATA, handlers) == {"amount": "5", "holdings": 1, "2": [1, True]}
+    # * Batch results are decoded by the aggregate call and only shaped
+    assert decoder.shape([5, [(HOLDER, 3)], (1, True)], handlers) == {"amount": "5", "holdings": 1, "2": [1, True]}
+
+
+def test_call_view_function_decodes_named_outputs(rpc_node) -> None:
+    calls = []
+    rpc_node.call_handler = lambda transaction, block: calls.append(transaction["data"]) or f"0x{POSITION_DATA.hex()}"
+    provider = SimpleNamespace(uri=rpc_node.uri)
+
+    output = call_view_function(POSITION, ADDRESS, [1], provider)
+    assert output["holdings"] == [{"token": HOLDER, "value": 3}]
+
+    assert call_view_function(POSITION, ADDRESS, [1], provider, raw_output=True) == POSITION_DATA
+    assert calls[0] == calls[1] == f"0x{get_selector('position(uint256)').hex()}{encode(['uint256'], [1]).hex()}"
+
+
+def test_call_rejects_raw_output_with_batch(runner, cli, tmp_path) -> None:
+    batch = tmp_path / "calls.txt"
+    batch.write_text(f"('{ADDRESS}', 'totalSupply()(uint256)', [])\n")
+
+    result = runner.invoke(cli, ["call", "--batch", str(batch), "--raw-output", "--network", "ethereum:local:test"])
+
+    assert result.exit_code == 2
+    assert "--raw-output only applies to a single call" in result.output
@@ -0,0 +1,82 @@
+import io
+import json
+
+from ape_utils.codec import encode_calldata
+from ape_utils.parallel import byte_ranges, iter_range_lines, parallel_decode
+from ape_utils.streaming import decode_stream, input_columns, iter_calldata, write_csv, write_json, write_ndjson
+
+TRANSFER = "transfer(address to, uint256 amount)"
+HOLDER = "0x894A02d4574318a9da4EEc7884a7D0c095E65507"
+
+
+def write_calldata(path, count: int) -> list[str]:
+    lines = [f"0x{bytes(encode_calldata(TRANSFER, HOLDER, amount)).hex()}" for amount in range(count)]
+    # * A blank line, a line without prefix and a broken calldata on the chunk boundaries
+    lines[3], lines[7] = "", "0xdeadbeef"
+    lines[11] = lines[11][2:]
+    path.write_text("\n".join(lines) + "\n")
+    return lines
+
+
+def test_byte_ranges_yield_every_line_once(tmp_path) -> None:
+    source = tmp_path / "calldata.txt"
+    lines = write_calldata(source, 40)
+
+    for chunk_bytes in (1, 50, 137, 138, 139, 10_000):
+        ranges = byte_ranges(source, chunk_bytes)
+        assert ranges[0][0] == 0
+        assert ranges[-1][1] == source.stat().st_size
+        read = [line.rstrip("\n") for start, end in ranges for line in iter_range_lines(source, start, end)]
+        assert read == lines
+
+
+def test_parallel_decode_matches_serial_output(tmp_path) -> None:
+    source = tmp_path / "calldata.txt"
+    write_calldata(source, 60)
+    rows = list(decode_stream(TRANSFER, iter_calldata(source.read_text().splitlines())))
+
+    for output_format, write in [
+        ("ndjson", write_ndjson),
+        ("json", write_json),
+        ("csv", lambda rows, output: write_csv(rows, output, input_columns(TRANSFER))),
+    ]:
+        expected, output = io.StringIO(), io.StringIO()
+        write(rows, expected)
+        count = parallel_decode(source, TRANSFER, output=output, output_format=output_format, workers=2, chunk_bytes=700)
+        assert count == len(rows)
+        assert output.getvalue() == expected.getvalue()
+
+
+def test_parallel_decode_writes_shards(tmp_path) -> None:
+    source = tmp_path / "calldata.txt"
+    write_calldata(source, 30)
+
+    count = parallel_decode(source, TRANSFER, shard_dir=tmp_path / "shards", output_format="csv", workers=2, chunk_bytes=1000)
+
+    shards = sorted((tmp_path / "shards").iterdir())
+    assert len(shards) == len(byte_ranges(source, 1000))
+    assert all(shard.read_text().startswith("to,amount,error\n") for shard in shards)
+    assert sum(len(shard.read_text().splitlines()) - 1 for shard in shards) == count == 29
+
+
+def test_decode_command_with_workers(runner, cli, tmp_path) -> None:
+    source = tmp_path / "calldata.txt"
+    write_calldata(source, 20)
+    signatures = tmp_path / "signatures.txt"
+    signatures.write_text(f"{TRANSFER}\n")
+
+    result = runner.invoke(cli, ["decode", "--abi-file", str(signatures), "--input", str(source), "--workers", "2"])
+
+    assert result.exit_code == 0, result.output
+    rows = [json.loads(line) for line in result.output.splitlines()]
+    assert len(rows) == 19
+    assert rows[0]["args"] == {"to": HOLDER, "amount": 0}
+    assert "error" in rows[6]
+    assert rows[-1]["args"]["amount"] == 19
+
+
+def test_decode_command_rejects_workers_on_stdin(runner, cli) -> None:
+    result = runner.invoke(cli, ["decode", "--signature", TRANSFER, "--input", "-", "--workers", "2"], input="0x\n")
+
+    assert result.exit_code == 2
+    assert "need --input to be a file" in result.output
@@ -0,0 +1,95 @@
+import json
+
+import pytest
+
+import ape_utils.utils
+from ape_utils.profiling import PROFILER, Profiler
+from ape_utils.utils import read_storage_many
+
+ADDRESS = "0xDbB18e367E4A2A36A9F2AF7af8b3c743938deCF2"
+
+
+@pytest.fixture(autouse=True)
+def reset_profiler():
+    PROFILER.reset()
+    yield
+    PROFILER.reset()
+
+
+def test_disabled_profiler_records_nothing() -> None:
+    profiler = Profiler()
+    with profiler.stage("rpc"):
+        profiler.add("http_requests")
+        profiler.cache("results", 1, 0)
+    assert profiler.report() == {"stages": {}, "counters": dict.fromkeys(profiler.counters, 0), "caches": {}}
+
+
+def test_report_and_openmetrics() -> None:
+    profiler = Profiler()
+    profiler.enable()
+    for _ in range(2):
+        with profiler.stage("rpc"):
+            pass
+    profiler.add("rpc_requests", 5)
+    profiler.cache("results", 3, 1)
+
+    report = profiler.report({"method_abi": {"hits": 0, "misses": 0}})
+    assert report["stages"]["rpc"]["count"] == 2
+    assert report["counters"]["rpc_requests"] == 5
+    assert report["caches"] == {
+        "results": {"hits": 3, "misses": 1, "hit_rate": 0.75},
+        "method_abi": {"hits": 0, "misses": 0, "hit_rate": 0.0},
+    }
+
+    metrics = profiler.to_openmetrics().splitlines()
+    assert 'ape_utils_stage_entries_total{stage="rpc"} 2' in metrics
+    assert "ape_utils_rpc_requests_total 5" in metrics
+    assert 'ape_utils_cache_hits_total{cache="results"} 3' in metrics
+    assert metrics[-1] == "# EOF"
+
+
+def test_rpc_requests_are_counted(rpc_node, monkeypatch) -> None:
+    monkeypatch.setattr(ape_utils.utils, "provider_http_uri", lambda _: rpc_node.uri)
+    PROFILER.enable()
+
+    read_storage_many(ADDRESS, range(256), batch_size=100)
+
+    report = PROFILER.report()
+    assert report["stages"]["rpc"]["count"] == 3
+    assert report["counters"]["http_requests"] == 3
+    assert report["counters"]["rpc_requests"] == 256
+    assert report["counters"]["rpc_bytes_sent"] > 0
+    assert report["counters"]["rpc_bytes_received"] > 256 * 64
+
+
+def test_cli_exports_the_profile(runner, cli, tmp_path) -> None:
+    path = tmp_path / "profile.json"
+    result = runner.invoke(
+        cli,
+        [
+            *("--profile-output", str(path)),
+            *("encode", "--signature", "transfer(address to, uint256 amount)", ADDRESS, "5", "--raw"),
+        ],
+    )
+    assert result.exit_code == 0, result.output
+
+    report = json.loads(path.read_text())
+    assert {"startup", "command"} <= set(report["stages"])
+    assert "method_abi" in report["caches"]
+
+
+def test_cli_profiles_network_stages(runner, cli, tmp_path) -> None:
+    path = tmp_path / "profile.txt"
+    result = runner.invoke(
+        cli,
+        [
+            *("--profile-output", str(path), "--profile-format", "openmetrics"),
+            *("read", "--address", ADDRESS, "--slot", "0", "--network", "ethereum:local:test"),
+        ],
+    )
+    assert result.exit_code == 0, result.output
+
+    metrics = path.read_text()
+    for stage in ("startup", "network", "connect", "command"):
+        assert f'ape_utils_stage_entries_total{{stage="{stage}"}} 1' in metrics
+    assert metrics.endswith("# EOF\n")
@@ -0,0 +1,185 @@
+import asyncio
+import socket
+from types import SimpleNamespace
+
+import aiohttp
+import pytest
+
+import ape_utils.utils
+from ape_utils.clients import aclose_clients, configure_clients, endpoint_stats, failover_uris, get_retry_policy
+from ape_utils.profiling import PROFILER
+from ape_utils.resilience import RateLimiter, RetryPolicy
+from ape_utils.rpc import rpc_batch
+from ape_utils.utils import acall_view_function, call_view_function, read_storage
+
+ADDRESS = "0xDbB18e367E4A2A36A9F2AF7af8b3c743938deCF2"
+
+
+@pytest.fixture(autouse=True)
+def fast_retries():
+    configure_clients(backoff=0.001)
+    yield
+    configure_clients()
+    PROFILER.reset()
+
+
+@pytest.fixture
+def dead_uri() -> str:
+    # * A port nothing listens on, so every request is refused at once
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}"
+
+
+def test_rate_limiter_adapts_to_throttling() -> None:
+    limiter = RateLimiter()
+    assert limiter.reserve() == 0.0
+    assert limiter.rate is None
+
+    limiter.throttled()
+    assert limiter.rate == 1.0
+    # * The burst is drained on throttling, so the next request waits for a token
+    assert limiter.reserve() > 0
+    limiter.succeeded()
+    assert limiter.rate > 1.0
+
+    stats = limiter.stats()
+    assert stats["requests"] == 2
+    assert stats["throttled"] == 1
+    assert stats["available"]
+
+
+def test_rate_limiter_recovers_up_to_the_configured_rate() -> None:
+    limiter = RateLimiter(rate=10)
+    limiter.throttled()
+    assert limiter.rate == 5.0
+    for _ in range(200):
+        limiter.succeeded()
+    assert limiter.rate == 10
+
+
+def test_retry_policy_jitters_within_bounds() -> None:
+    policy = RetryPolicy(retries=3, backoff=0.5, max_backoff=2)
+    for attempt in range(5):
+        assert 0 <= policy.delay(attempt) <= min(2, 0.5 * 2**attempt)
+    assert policy.delay(0, retry_after=1.5) >= 1.5
+    assert policy.delay(0, retry_after=60) <= 2
+
+
+def test_rpc_batch_retries_throttled_requests(rpc_node) -> None:
+    PROFILER.enable()
+    rpc_node.fail_with = [429, 503]
+
+    assert rpc_batch(rpc_node.uri, [("eth_chainId", [])]) == [hex(1337)]
+
+    assert rpc_node.http_requests == 3
+    assert PROFILER.report()["counters"]["rpc_retries"] == 2
+    assert PROFILER.report()["counters"]["rpc_throttled"] == 1
+    stats = next(iter(endpoint_stats().values()))
+    assert stats["throttled"] == 1
+    assert stats["rate"] is not None
+
+
+def test_rpc_batch_gives_up_after_the_retries(rpc_node) -> None:
+    configure_clients(retries=1, backoff=0.001)
+    rpc_node.fail_with = [503, 503, 503]
+
+    with pytest.raises(Exception, match="503"):
+        rpc_batch(rpc_node.uri, [("eth_chainId", [])])
+    assert rpc_node.http_requests == 2
+
+
+def test_requests_fail_over_in_order(rpc_node, dead_uri, monkeypatch) -> None:
+    rpc_node.storage[(ADDRESS.lower(), 3)] = 9
+    configure_clients(retries=1, backoff=0.001, fallback_uris=[rpc_node.uri])
+    monkeypatch.setattr(ape_utils.utils, "provider_http_uri", lambda _: dead_uri)
+
+    assert int.from_bytes(read_storage(ADDRESS, 3), "big") == 9
+    assert int.from_bytes(read_storage(ADDRESS, 3), "big") == 9
+
+    stats = endpoint_stats()
+    assert stats[dead_uri]["failovers"] == 1
+    assert not stats[dead_uri]["available"]
+    # * The dead node is skipped during its cooldown
+    assert stats[dead_uri]["requests"] == 2
+    assert stats[rpc_node.uri]["requests"] == 2
+
+
+def test_call_view_function_retries(rpc_node) -> None:
+    rpc_node.call_handler = lambda transaction, block: "0x" + (5).to_bytes(32, "big").hex()
+    rpc_node.fail_with = [502]
+
+    output = call_view_function("totalSupply()(uint256)", ADDRESS, [], SimpleNamespace(uri=rpc_node.uri))
+
+    assert output == 5
+    assert endpoint_stats()[rpc_node.uri]["retries"] == 1
+
+
+def test_async_call_retries_and_fails_over(rpc_node, dead_uri) -> None:
+    rpc_node.call_handler = lambda transaction, block: "0x" + (5).to_bytes(32, "big").hex()
+    rpc_node.fail_with = [429]
+    configure_clients(retries=1, backoff=0.001, fallback_uris=[rpc_node.uri])
+
+    async def run() -> int:
+        try:
+            return await acall_view_function(
+                "totalSupply()(uint256)", ADDRESS, [], SimpleNamespace(uri=dead_uri), retries=1, backoff=0.001
+            )
+        finally:
+            await aclose_clients()
+
+    assert asyncio.run(run()) == 5
+    stats = endpoint_stats()
+    assert stats[dead_uri]["failovers"] == 1
+    assert stats[rpc_node.uri]["throttled"] == 1
+
+
+class RateLimitedError(Exception):
+    code = -32005
+
+
+def acall(uri: str) -> int:
+    async def run() -> int:
+        try:
+            return await acall_view_function("totalSupply()(uint256)", ADDRESS, [], SimpleNamespace(uri=uri), retries=2)
+        finally:
+            await aclose_clients()
+
+    return asyncio.run(run())
+
+
+def test_async_call_retries_rate_limit_errors(rpc_node) -> None:
+    errors = [RateLimitedError("daily request count exceeded, request rate limited")]
+
+    def call(transaction: dict, block: str) -> str:
+        if errors:
+            raise errors.pop()
+        return "0x" + (5).to_bytes(32, "big").hex()
+
+    rpc_node.call_handler = call
+
+    assert acall(rpc_node.uri) == 5
+    assert rpc_node.http_requests == 2
+    assert endpoint_stats()[rpc_node.uri]["throttled"] == 1
+
+
+def test_async_call_raises_client_errors_at_once(rpc_node) -> None:
+    rpc_node.fail_with = [400, 400, 400]
+
+    with pytest.raises(aiohttp.ClientResponseError, match="400"):
+        acall(rpc_node.uri)
+    assert rpc_node.http_requests == 1
+
+
+def test_cli_configures_the_clients(runner, cli, rpc_node) -> None:
+    result = runner.invoke(
+        cli,
+        [
+            *("--rpc-retries", "1", "--rpc-rate", "50", "--fallback-uri", rpc_node.uri),
+            *("read", "--address", ADDRESS, "--slot", "0", "--network", "ethereum:local:test"),
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    assert get_retry_policy().retries == 1
+    assert failover_uris("http://127.0.0.1:1") == ["http://127.0.0.1:1", rpc_node.uri]
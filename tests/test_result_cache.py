@@ -0,0 +1,49 @@
+import ape_utils.utils
+from ape_utils.result_cache import CALL, STORAGE, ResultCache
+from ape_utils.utils import read_storage_many
+
+ADDRESS = "0xDbB18e367E4A2A36A9F2AF7af8b3c743938deCF2"
+
+
+def test_result_cache_round_trip(tmp_path) -> None:
+    cache = ResultCache(tmp_path / "results.sqlite")
+    cache.set(1, 100, ADDRESS, CALL, b"\x01\x02", b"output")
+
+    assert cache.get(1, 100, ADDRESS.lower(), CALL, b"\x01\x02") == b"output"
+    assert cache.get(1, 101, ADDRESS, CALL, b"\x01\x02") is None
+    assert cache.get(1, 100, ADDRESS, STORAGE, b"\x01\x02") is None
+    cache.close()
+
+    reopened = ResultCache(tmp_path / "results.sqlite")
+    assert reopened.get(1, 100, ADDRESS, CALL, b"\x01\x02") == b"output"
+    assert reopened.size == len(b"output")
+
+    # * Storing a key again replaces its value, so only the new value counts towards the size
+    reopened.set(1, 100, ADDRESS, CALL, b"\x01\x02", b"out")
+    assert reopened.size == len(b"out")
+
+
+def test_result_cache_evicts_least_recently_used(tmp_path) -> None:
+    cache = ResultCache(tmp_path / "results.sqlite", max_bytes=100)
+    for slot in range(3):
+        cache.set(1, 100, ADDRESS, STORAGE, bytes([slot]), b"x" * 40)
+        # * Touch the first entry so it is the most recently used
+        cache.get(1, 100, ADDRESS, STORAGE, b"\x00")
+
+    assert cache.size <= 100
+    assert cache.get(1, 100, ADDRESS, STORAGE, b"\x00") is not None
+    assert cache.get(1, 100, ADDRESS, STORAGE, b"\x01") is None
+
+
+def test_block_pinned_reads_hit_the_cache(rpc_node, monkeypatch, tmp_path) -> None:
+    rpc_node.storage[(ADDRESS.lower(), 3)] = 9
+    monkeypatch.setattr(ape_utils.utils, "provider_http_uri", lambda _: rpc_node.uri)
+    cache = ResultCache(tmp_path / "results.sqlite")
+
+    first = read_storage_many(ADDRESS, range(5), block_identifier=100, cache=cache)
+    second = read_storage_many(ADDRESS, range(8), block_identifier=100, cache=cache)
+
+    assert second[:5] == first
+    assert int.from_bytes(second[3], "big") == 9
+    # * The second read only fetches the three slots that were not cached yet
+    assert rpc_node.rpc_requests == 8
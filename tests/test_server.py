@@ -0,0 +1,169 @@
+import io
+import json
+import socket
+import threading
+import time
+
+import pytest
+from eth_abi import encode
+
+import ape_utils._cli
+import ape_utils.fork
+import ape_utils.logs
+import ape_utils.utils
+from ape_utils.fork import ForkState
+from ape_utils.abi import get_selector
+from ape_utils.server import Worker, forward
+from ape_utils.utils import encode_calldata, get_web3
+
+SIGNATURE = "transfer(address to, uint256 amount)"
+ADDRESS = "0xDbB18e367E4A2A36A9F2AF7af8b3c743938deCF2"
+
+
+@pytest.fixture
+def worker(provider):
+    return Worker(provider)
+
+
+@pytest.fixture
+def socket_path(worker, tmp_path, monkeypatch):
+    path = tmp_path / "serve.sock"
+    threading.Thread(target=worker.serve_socket, args=(path,), daemon=True).start()
+    while not path.exists():
+        time.sleep(0.01)
+    monkeypatch.setattr(ape_utils._cli, "DEFAULT_SOCKET_PATH", path)
+    return path
+
+
+def test_worker_answers_codec_requests(worker) -> None:
+    calldata = f"0x{bytes(encode_calldata(SIGNATURE, ADDRESS, 5)).hex()}"
+    assert worker.handle({"id": 1, "op": "encode", "signature": SIGNATURE, "args": [ADDRESS, 5]}) == {
+        "ok": True,
+        "result": calldata,
+        "id": 1,
+    }
+    response = worker.handle({"op": "decode", "signature": SIGNATURE, "calldata": calldata})
+    assert response["result"] == {"to": ADDRESS, "amount": 5}
+    assert worker.handle({"op": "nope"}) == {"ok": False, "error": "Unknown op 'nope'"}
+    assert not worker.handle({"op": "encode", "signature": SIGNATURE, "args": []})["ok"]
+
+
+def test_worker_only_serves_its_network(worker) -> None:
+    request = {"op": "read", "address": ADDRESS, "slots": [0, 1], "network": "ethereum:local:test"}
+    assert worker.handle(request) == {"ok": True, "result": ["0x" + "00" * 32] * 2}
+    assert worker.handle({**request, "network": "ethereum:sepolia:node"})["fallback"]
+    # * Each choice is resolved once
+    assert worker._serves == {"ethereum:local:test": True, "ethereum:sepolia:node": False}
+
+
+def test_worker_answers_typed_requests(worker) -> None:
+    calldata = f"0x{bytes(encode_calldata(SIGNATURE, ADDRESS, 5)).hex()}"
+    response = worker.handle({"op": "encode", "signature": SIGNATURE, "args": [ADDRESS, 5], "typed": True})
+    assert response == {"ok": True, "result": {"$HexBytes": calldata}}
+    worker.operations["set"] = lambda _: {1, 2}
+    assert worker.handle({"op": "set", "typed": True})["fallback"]
+
+
+def test_serve_lines(worker) -> None:
+    output = io.StringIO()
+    lines = ['{"id": "a", "op": "ping"}', "", "not json"]
+    assert worker.serve_lines(lines, output) == 2
+    first, second = (json.loads(line) for line in output.getvalue().splitlines())
+    assert first["id"] == "a"
+    assert first["result"]["network"] == "ethereum:local:test"
+    assert second["error"].startswith("Invalid JSON")
+
+
+def test_forward_without_worker(tmp_path, capsys) -> None:
+    assert forward({"op": "ping"}, tmp_path / "missing.sock") is None
+    assert capsys.readouterr().err == ""
+
+
+def test_forward_gives_up_on_a_stuck_worker(tmp_path, capsys) -> None:
+    path = tmp_path / "stuck.sock"
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stuck:
+        stuck.bind(str(path))
+        stuck.listen()
+        start = time.perf_counter()
+        assert forward({"op": "ping"}, path, timeout=0.2) is None
+        assert time.perf_counter() - start < 1
+    assert "did not answer (timed out), running locally" in capsys.readouterr().err
+    # * A socket file left behind by a worker that is gone
+    assert forward({"op": "ping"}, path) is None
+    assert "running locally" in capsys.readouterr().err
+
+
+def test_cli_forwarded_output_matches_local_output(runner, cli, worker, socket_path, rpc_node, monkeypatch, tmp_path) -> None:
+    requests = []
+    handle = worker.handle
+    worker.handle = lambda request: requests.append(request["op"]) or handle(request)
+    monkeypatch.setattr(ape_utils.utils, "get_web3", lambda _: get_web3(rpc_node.uri))
+    output = encode(["bytes32", "(uint256,bool)", "uint256"], [b"\x01" * 32, (2**200, True), 2**255])
+    rpc_node.call_handler = lambda transaction, block: f"0x{output.hex()}"
+    types = ["bytes32", "uint256[]", "bytes", "address"]
+    calldata = get_selector(f"f({','.join(types)})") + encode(types, [b"\x01" * 32, [2**255, 3], b"\x02", ADDRESS])
+    commands = [
+        ["call", "--function-sig", "f()(bytes32 tag, (uint256,bool) pair, uint256 big)", "--address", ADDRESS, "--args", "[]"],
+        ["call", "--function-sig", "f()(bytes32,(uint256,bool),uint256)", "--address", ADDRESS, "--args", "[]", "--raw"],
+        ["decode", "--signature", "f(bytes32 tag, uint256[] big, bytes data, address to)", f"0x{calldata.hex()}"],
+        ["decode", "--signature", "f(bytes32 tag, uint256[] big, bytes data, address to)", f"0x{calldata.hex()}", "--raw"],
+        ["read", "--address", ADDRESS, "--slots", "0-1", "--no-cache"],
+    ]
+
+    for command in commands:
+        args = [*command, "--network", "ethereum:local:test"] if command[0] != "decode" else command
+        monkeypatch.setattr(ape_utils._cli, "DEFAULT_SOCKET_PATH", socket_path)
+        forwarded = runner.invoke(cli, args)
+        assert forwarded.exit_code == 0, forwarded.output
+        monkeypatch.setattr(ape_utils._cli, "DEFAULT_SOCKET_PATH", tmp_path / "missing.sock")
+        local = runner.invoke(cli, args)
+        assert local.exit_code == 0, local.output
+        assert forwarded.output == local.output
+
+    assert requests == ["call", "call", "decode", "decode", "read"]
+
+
+def test_cli_forwards_to_the_worker(runner, cli, worker, socket_path) -> None:
+    requests = []
+    handle = worker.handle
+    worker.handle = lambda request: requests.append(request) or handle(request)
+
+    result = runner.invoke(
+        cli, ["read", "--address", ADDRESS, "--slots", "0-1", "--network", "ethereum:local:test", "--raw"]
+    )
+    assert result.exit_code == 0, result.output
+    assert [line.split() for line in result.output.splitlines()] == [["0", "00" * 32], ["1", "00" * 32]]
+
+    result = runner.invoke(cli, ["encode", "--signature", SIGNATURE, ADDRESS, "5", "--raw"])
+    assert result.exit_code == 0, result.output
+    assert [request["op"] for request in requests] == ["read", "encode"]
+    assert requests[0]["slots"] == [0, 1]
+
+
+def test_cli_runs_captures_itself(runner, cli, worker, socket_path, rpc_node, monkeypatch, tmp_path) -> None:
+    requests, read_at = [], []
+    handle = worker.handle
+    worker.handle = lambda request: requests.append(request) or handle(request)
+    for module in (ape_utils.fork, ape_utils.utils):
+        monkeypatch.setattr(module, "provider_http_uri", lambda _: rpc_node.uri)
+    monkeypatch.setattr(ape_utils.logs, "latest_block", lambda _: 90)
+    rpc_node.methods["eth_getBlockByNumber"] = lambda block, full: {"number": block, "timestamp": hex(1_700_000_000)}
+    rpc_node.methods["eth_getStorageAt"] = lambda address, slot, block: read_at.append(block) or "0x" + "07".rjust(64, "0")
+    path = tmp_path / "fork.json"
+
+    result = runner.invoke(
+        cli,
+        [
+            "read",
+            *("--address", ADDRESS, "--slots", "0-1", "--no-cache", "--network", "ethereum:local:test"),
+            *("--capture", "--fork-state", str(path)),
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert requests == []
+    # * The read and the capture run at the same block
+    assert read_at == [hex(90)] * 4
+    state = ForkState.load(path)
+    assert state.block == 90
+    assert state.storage(ADDRESS, 1) == (7).to_bytes(32, "big")
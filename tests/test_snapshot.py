@@ -0,0 +1,79 @@
+import json
+
+import ape_utils.utils
+from ape_utils.snapshot import Snapshot, diff_snapshots, diff_storage, slot_set
+from ape_utils.storage import mapping_slot
+
+ADDRESS = "0xDbB18e367E4A2A36A9F2AF7af8b3c743938deCF2"
+HOLDER = "0x894A02d4574318a9da4EEc7884a7D0c095E65507"
+
+
+def values_at(changes: dict[int, int]) -> list[bytes]:
+    return [changes.get(slot, 0).to_bytes(32, "big") for slot in range(300)]
+
+
+def storage_by_block(rpc_node, blocks: dict[int, dict[int, int]]) -> None:
+    def get_storage_at(address: str, slot: str, block: str) -> str:
+        return "0x" + blocks.get(int(block, 16), {}).get(int(slot, 16), 0).to_bytes(32, "big").hex()
+
+    rpc_node.methods["eth_getStorageAt"] = get_storage_at
+
+
+def test_snapshot_round_trip(tmp_path) -> None:
+    slots = [1, 5, 2**255]
+    values = [b"\x01", b"\x05" * 32, b"\xff" * 32]
+    path = tmp_path / "storage.snap"
+
+    with Snapshot.build(1, ADDRESS, 100, slots, values, path) as written, Snapshot.open(path) as snapshot:
+        assert path.stat().st_size == 64 + 2 * 3 * 32
+        assert (snapshot.chain_id, snapshot.block, snapshot.address) == (1, 100, ADDRESS.lower())
+        assert snapshot.get(1) == b"\x01".rjust(32, b"\x00")
+        assert snapshot.get(2**255) == b"\xff" * 32
+        assert snapshot.get(3) is None
+        assert list(snapshot) == list(written)
+
+
+def test_diff_snapshots_yields_only_changed_slots() -> None:
+    before = Snapshot.build(1, ADDRESS, 1, range(300), values_at({5: 1, 250: 7}))
+    after = Snapshot.build(1, ADDRESS, 2, range(300), values_at({5: 2, 250: 7, 299: 1}))
+
+    changes = [
+        (slot, int.from_bytes(old, "big"), int.from_bytes(new, "big"))
+        for slot, old, new in diff_snapshots(before, after)
+    ]
+
+    assert changes == [(5, 1, 2), (299, 0, 1)]
+
+
+def test_diff_storage_reuses_snapshots(rpc_node, monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(ape_utils.utils, "provider_http_uri", lambda _: rpc_node.uri)
+    balance = mapping_slot(HOLDER, 0)
+    storage_by_block(rpc_node, {10: {1: 3, balance: 100}, 20: {1: 3, balance: 40}})
+    slots = slot_set(range(4), [(0, [HOLDER])])
+
+    first = list(diff_storage(ADDRESS, slots, 10, 20, directory=tmp_path))
+    requests = rpc_node.rpc_requests
+    second = list(diff_storage(ADDRESS, slots, 10, 20, directory=tmp_path))
+
+    assert first == second == [(balance, (100).to_bytes(32, "big"), (40).to_bytes(32, "big"))]
+    assert requests == 2 * len(slots)
+    assert rpc_node.rpc_requests == requests
+    assert len(list(tmp_path.glob("*.snap"))) == 2
+
+
+def test_read_diff_command(runner, cli, rpc_node, monkeypatch) -> None:
+    monkeypatch.setattr(ape_utils.utils, "provider_http_uri", lambda _: rpc_node.uri)
+    storage_by_block(rpc_node, {10: {2: 1}, 20: {2: 5}})
+
+    result = runner.invoke(
+        cli,
+        [
+            *("read", "--address", ADDRESS, "--slots", "0-3", "--diff", "--from-block", "10", "--to-block", "20"),
+            *("--no-cache", "--format", "ndjson", "--network", "ethereum:local:test"),
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert [json.loads(line) for line in result.output.splitlines()] == [
+        {"slot": 2, "before": "0x" + (1).to_bytes(32, "big").hex(), "after": "0x" + (5).to_bytes(32, "big").hex()}
+    ]
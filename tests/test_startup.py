@@ -0,0 +1,38 @@
+import json
+import os
+import subprocess
+import sys
+
+# * Wall clock budget for `import ape_utils._cli` in a fresh interpreter, override on slow machines
+IMPORT_BUDGET = float(os.environ.get("APE_UTILS_IMPORT_BUDGET", "1.0"))
+NETWORK_MODULES = ["web3", "multicall", "aiohttp", "ape_node.provider", "ape_utils.utils", "ape_utils.clients"]
+
+_PROBE = f"""
+import json, sys, time
+start = time.perf_counter()
+import ape_utils._cli
+elapsed = time.perf_counter() - start
+print(json.dumps({{"elapsed": elapsed, "loaded": [m for m in {NETWORK_MODULES!r} if m in sys.modules]}}))
+"""
+
+
+def _probe() -> dict:
+    result = subprocess.run([sys.executable, "-c", _PROBE], capture_output=True, text=True, check=True)  # noqa: S603
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def test_cli_import_skips_the_network_stack() -> None:
+    assert _probe()["loaded"] == []
+
+
+def test_cli_import_time_budget() -> None:
+    # * Best of three runs to keep the check stable on a busy machine
+    elapsed = min(_probe()["elapsed"] for _ in range(3))
+    assert elapsed < IMPORT_BUDGET, f"import ape_utils._cli took {elapsed:.2f}s, budget is {IMPORT_BUDGET:.2f}s"
+
+
+def test_package_exports_stay_lazy() -> None:
+    import ape_utils  # noqa: PLC0415
+    from ape_utils.utils import call_view_function  # noqa: PLC0415
+
+    assert ape_utils.call_view_function is call_view_function
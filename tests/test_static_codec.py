@@ -0,0 +1,115 @@
+import random
+
+import ape
+import pytest
+
+from ape_utils.abi import get_method_abi, get_selector
+from ape_utils.static_codec import get_static_codec
+from ape_utils.utils import abi_decode_calldata, abi_encode_calldata, decode_calldata, encode_calldata
+
+SIGNATURE = "f(uint256 a, int8 b, address c, bool d, bytes4 e, uint8 g)"
+ADDRESS = "0xDbB18e367E4A2A36A9F2AF7af8b3c743938deCF2"
+
+
+def ape_encode(signature, *args):
+    method_abi = get_method_abi(signature)
+    return get_selector(signature) + bytes(ape.networks.ethereum.encode_calldata(method_abi, *args))
+
+
+def ape_decode(signature, data):
+    return ape.networks.ethereum.decode_calldata(get_method_abi(signature), data)
+
+
+def random_args(rng):
+    return (
+        rng.getrandbits(256),
+        rng.randint(-128, 127),
+        "0x" + rng.randbytes(20).hex(),
+        rng.random() < 0.5,
+        rng.randbytes(4),
+        rng.randint(0, 255),
+    )
+
+
+def test_static_signatures_are_compiled() -> None:
+    codec = get_static_codec(SIGNATURE)
+    assert codec is not None
+    assert len(codec) == 6
+    assert get_static_codec("f(uint256 a, string b)") is None
+    assert get_static_codec("f(uint256[2] a)") is None
+
+
+def test_encode_matches_ape() -> None:
+    rng = random.Random(0)
+    for _ in range(50):
+        args = random_args(rng)
+        calldata = encode_calldata(SIGNATURE, *args)
+        assert bytes(calldata) == ape_encode(SIGNATURE, *args)
+        assert bytes(abi_encode_calldata(SIGNATURE, *args)) == bytes(calldata)[4:]
+
+
+def test_decode_matches_ape() -> None:
+    rng = random.Random(1)
+    for _ in range(50):
+        data = ape_encode(SIGNATURE, *random_args(rng))
+        decoded = decode_calldata(SIGNATURE, "0x" + data.hex())
+        assert decoded == ape_decode(SIGNATURE, data[4:])
+        assert abi_decode_calldata(SIGNATURE, "0x" + data[4:].hex()) == decoded
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ("1234", "0x7f", ADDRESS, False, "0x01020304", "0xff"),
+        (0, -1, ADDRESS.lower(), True, b"\x01", 0),
+        ((1 << 256) - 1, -128, bytes.fromhex(ADDRESS[2:]), True, "0x", 255),
+    ],
+)
+def test_cli_style_arguments_match_ape(args) -> None:
+    assert bytes(encode_calldata(SIGNATURE, *args)) == ape_encode(SIGNATURE, *args)
+
+
+@pytest.mark.parametrize(
+    ("signature", "value"),
+    [
+        ("f(uint8 a)", 256),
+        ("f(uint8 a)", -1),
+        ("f(int8 a)", 128),
+        ("f(bytes2 a)", "0x010203"),
+        ("f(uint256 a)", "-2"),
+        ("f(uint256 a)", "0x_1"),
+        ("f(uint256 a)", " 0x1 "),
+        ("f(uint256 a)", "0x1_0"),
+        ("f(uint256 a)", "0x1\n"),
+        ("f(bytes4 a)", bytearray(b"\x01")),
+        ("f(bytes4 a)", "0x01 02"),
+        ("f(bytes4 a)", "0x01\n"),
+        ("f(address a)", bytearray(20)),
+        ("f(address a)", ADDRESS.lower() + "\n"),
+    ],
+)
+def test_unsupported_values_fall_back_to_ape(signature, value) -> None:
+    assert get_static_codec(signature).encode([value]) is None
+    with pytest.raises(Exception) as fast_error:
+        encode_calldata(signature, value)
+    with pytest.raises(Exception) as ape_error:
+        ape_encode(signature, value)
+    assert type(fast_error.value) is type(ape_error.value)
+
+
+def test_conversions_fall_back_to_ape() -> None:
+    assert bytes(encode_calldata("f(uint256 a)", "1 ether")) == ape_encode("f(uint256 a)", "1 ether")
+
+
+@pytest.mark.parametrize("word", ["00" * 31 + "02", "01" + "00" * 31])
+def test_invalid_calldata_raises_like_ape(word) -> None:
+    with pytest.raises(Exception) as fast_error:
+        abi_decode_calldata("f(bool a)", "0x" + word)
+    with pytest.raises(Exception) as ape_error:
+        ape_decode("f(bool a)", bytes.fromhex(word))
+    assert str(fast_error.value) == str(ape_error.value)
+
+
+def test_unnamed_inputs_are_keyed_by_position() -> None:
+    data = ape_encode("f(uint256,address)", 1, ADDRESS)
+    assert decode_calldata("f(uint256,address)", "0x" + data.hex()) == ape_decode("f(uint256,address)", data[4:])
@@ -0,0 +1,36 @@
+import pytest
+
+import ape_utils.utils
+from ape_utils._cli import parse_slots
+from ape_utils.rpc import RPCError, rpc_batch
+from ape_utils.utils import read_storage_many
+
+ADDRESS = "0xDbB18e367E4A2A36A9F2AF7af8b3c743938deCF2"
+
+
+def test_parse_slots() -> None:
+    assert parse_slots("0-3, 7,0x10") == [0, 1, 2, 3, 7, 16]
+
+
+def test_read_storage_many_batches_requests(rpc_node, monkeypatch) -> None:
+    rpc_node.storage[(ADDRESS.lower(), 1)] = 42
+    rpc_node.storage[(ADDRESS.lower(), 250)] = 7
+    monkeypatch.setattr(ape_utils.utils, "provider_http_uri", lambda _: rpc_node.uri)
+
+    values = read_storage_many(ADDRESS, range(256), batch_size=100)
+
+    assert len(values) == 256
+    assert int.from_bytes(values[1], "big") == 42
+    assert int.from_bytes(values[250], "big") == 7
+    assert rpc_node.http_requests == 3
+    assert rpc_node.rpc_requests == 256
+
+
+def test_read_storage_many_without_http_node() -> None:
+    values = read_storage_many(ADDRESS, [0, 1])
+    assert values == [b"\x00" * 32, b"\x00" * 32]
+
+
+def test_rpc_batch_raises_on_error(rpc_node) -> None:
+    with pytest.raises(RPCError, match="eth_unknown"):
+        rpc_batch(rpc_node.uri, [("eth_chainId", []), ("eth_unknown", [])])
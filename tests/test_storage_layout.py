@@ -0,0 +1,81 @@
+from eth_abi import encode
+from eth_utils import keccak
+import pytest
+
+import ape_utils.utils
+from ape_utils.storage import array_slot, mapping_slot, mapping_slots, nested_mapping_slot, read_mapping, unpack_slot
+
+HOLDER = "0xDbB18e367E4A2A36A9F2AF7af8b3c743938deCF2"
+SPENDER = "0x894A02d4574318a9da4EEc7884a7D0c095E65507"
+
+
+def _slot(*parts: bytes) -> int:
+    return int.from_bytes(keccak(b"".join(parts)), "big")
+
+
+def test_mapping_slots_match_solidity_layout() -> None:
+    assert mapping_slot(HOLDER, 3) == _slot(encode(["address", "uint256"], [HOLDER, 3]))
+    assert mapping_slot(7, 1, "uint256") == _slot(encode(["uint256", "uint256"], [7, 1]))
+    assert mapping_slot(-1, 1, "int128") == _slot(encode(["int128", "uint256"], [-1, 1]))
+    assert mapping_slot("abc", 2, "string") == _slot(b"abc", encode(["uint256"], [2]))
+    assert nested_mapping_slot([(HOLDER, "address"), (SPENDER, "address")], 1) == mapping_slot(SPENDER, mapping_slot(HOLDER, 1))
+    assert mapping_slots([HOLDER, SPENDER], 3) == [mapping_slot(HOLDER, 3), mapping_slot(SPENDER, 3)]
+    assert mapping_slots([HOLDER[2:], bytes.fromhex(SPENDER[2:])], 3) == mapping_slots([HOLDER, SPENDER], 3)
+
+
+def test_array_slots_and_packing() -> None:
+    start = _slot(encode(["uint256"], [5]))
+    assert array_slot(5, 3) == (start + 3, 0)
+    assert array_slot(5, 3, element_size=8) == (start, 24)
+    assert array_slot(5, 2, element_size=64) == (start + 4, 0)
+
+    value = bytes.fromhex("00" * 4 + "0000000000000007" + HOLDER[2:].lower())
+    assert unpack_slot(value, 0, 20).hex() == HOLDER[2:].lower()
+    assert int.from_bytes(unpack_slot(value, 20, 8), "big") == 7
+
+
+def test_read_mapping_in_bulk(rpc_node, monkeypatch) -> None:
+    rpc_node.storage[(HOLDER.lower(), mapping_slot(SPENDER, 0))] = 100
+    monkeypatch.setattr(ape_utils.utils, "provider_http_uri", lambda _: rpc_node.uri)
+
+    balances = read_mapping(HOLDER, 0, [HOLDER, SPENDER])
+
+    assert [int.from_bytes(value, "big") for value in balances] == [0, 100]
+    assert rpc_node.http_requests == 1
+
+
+@pytest.mark.parametrize(
+    ("key_type", "text", "key"),
+    [("bytes32", "0x" + "11" * 32, b"\x11" * 32), ("uint256", "0x10", 16), ("bool", "true", True), ("int8", "-0x1", -1)],
+)
+def test_read_mapping_keys_of_their_type(runner, cli, rpc_node, monkeypatch, tmp_path, key_type, text, key) -> None:
+    monkeypatch.setattr(ape_utils.utils, "provider_http_uri", lambda _: rpc_node.uri)
+    rpc_node.storage[(HOLDER.lower(), mapping_slot(key, 4, key_type))] = 9
+    (tmp_path / "keys.txt").write_text(f"# {key_type} keys\n{text}\n")
+
+    result = runner.invoke(
+        cli,
+        [
+            *("read", "--address", HOLDER, "--mapping", "4", str(tmp_path / "keys.txt"), "--key-type", key_type),
+            *("--raw", "--no-cache", "--network", "ethereum:local:test"),
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert result.output.split() == [str(mapping_slot(key, 4, key_type)), (9).to_bytes(32, "big").hex()]
+
+
+def test_read_mapping_reports_bad_keys(runner, cli, tmp_path) -> None:
+    (tmp_path / "keys.txt").write_text(f"0x{'11' * 32}\n\n0xzz\n")
+
+    result = runner.invoke(
+        cli,
+        [
+            *("read", "--address", HOLDER, "--mapping", "4", str(tmp_path / "keys.txt"), "--key-type", "bytes32"),
+            *("--no-cache", "--network", "ethereum:local:test"),
+        ],
+    )
+
+    assert result.exit_code == 2
+    assert "Bad bytes32 key on line 3" in result.output
+    assert "Traceback" not in result.output
@@ -0,0 +1,83 @@
+import json
+import time
+
+import pytest
+
+import ape_utils.sweep
+from ape_utils.sweep import block_range, read_checkpoint, sweep_call
+
+ADDRESS = "0xDbB18e367E4A2A36A9F2AF7af8b3c743938deCF2"
+SIGNATURE = "totalSupply()(uint256)"
+
+
+def supply_at(transaction: dict, block: str) -> str:
+    if int(block, 16) < 10:
+        raise ValueError("execution reverted")
+    return "0x" + (int(block, 16) * 1000).to_bytes(32, "big").hex()
+
+
+@pytest.fixture
+def node(rpc_node, monkeypatch):
+    rpc_node.call_handler = supply_at
+    monkeypatch.setattr(ape_utils.sweep, "provider_http_uri", lambda _: rpc_node.uri)
+    return rpc_node
+
+
+def test_block_range() -> None:
+    assert block_range(100, 120, 8) == [100, 108, 116, 120]
+    assert block_range(5, 5) == [5]
+    with pytest.raises(ValueError, match="step"):
+        block_range(0, 10, 0)
+
+
+def test_sweep_batches_and_reports_reverts(node, provider) -> None:
+    rows = list(sweep_call(SIGNATURE, ADDRESS, [], provider, range(5, 30), batch_size=10, workers=2))
+    assert sorted(block for block, _, _ in rows) == list(range(5, 30))
+    by_block = {block: (success, output) for block, success, output in rows}
+    assert by_block[5] == (False, "execution reverted")
+    assert by_block[29] == (True, 29_000)
+    assert node.http_requests == 3
+    assert node.rpc_requests == 25
+
+
+def test_sweep_stops_without_waiting_for_queued_batches(node, provider) -> None:
+    node.latency = 0.2
+    rows = sweep_call(SIGNATURE, ADDRESS, [], provider, range(10, 20), batch_size=1, workers=1)
+    next(rows)
+
+    started = time.monotonic()
+    rows.close()
+    assert time.monotonic() - started < 0.5
+    assert node.http_requests < 10
+
+
+def test_sweep_reuses_the_result_cache(node, provider, tmp_path) -> None:
+    from ape_utils.result_cache import ResultCache
+
+    cache = ResultCache(tmp_path / "results.sqlite")
+    first = sorted(sweep_call(SIGNATURE, ADDRESS, [], provider, range(8, 20), cache=cache))
+    requests = node.rpc_requests
+    # * Only the reverted blocks are called again
+    assert sorted(sweep_call(SIGNATURE, ADDRESS, [], provider, range(8, 20), cache=cache)) == first
+    assert node.rpc_requests == requests + 2
+
+
+def test_sweep_resumes_from_checkpoint(runner, cli, node, tmp_path) -> None:
+    checkpoint = tmp_path / "sweep.ndjson"
+    # * An interrupted run recorded blocks 10 and 12, the second line was cut short
+    checkpoint.write_text('{"block":10,"success":true,"output":10000}\n{"block":12,"succ')
+    result = runner.invoke(
+        cli,
+        [
+            "call",
+            *("--function-sig", SIGNATURE, "--address", ADDRESS, "--args", "[]"),
+            *("--from-block", "8", "--to-block", "16", "--step", "2"),
+            *("--checkpoint", str(checkpoint), "--no-cache", "--raw", "--network", "ethereum:local:test"),
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    assert node.rpc_requests == 4
+    assert sorted(line.split()[0] for line in result.output.splitlines()) == ["12", "14", "16", "8"]
+    assert read_checkpoint(checkpoint) == {10, 12, 14, 16}
+    records = [json.loads(line) for line in checkpoint.read_text().splitlines()[2:]]
+    assert {record["block"]: record["output"] for record in records}[16] == 16_000
@@ -57,3 +57,28 @@ def test_decode_function_signature(runner: CliRunner, cli: rclick.RichGroup) ->
 
     assert result.exit_code == 0
     assert "1234" in result.output
+
+
+def test_decode_streams_ndjson_from_stdin(runner: CliRunner, cli: rclick.RichGroup) -> None:
+    calldata = "\n".join(
+        [
+            "0x1e4f420d00000000000000000000000000000000000000000000000000000000000004d2",
+            "",
+            "1e4f420d0000000000000000000000000000000000000000000000000000000000000005",
+        ]
+    )
+    result = runner.invoke(cli, ['decode', '--signature', 'call_this_view_function(uint256 arg1)', '--input', '-'], input=calldata)
+
+    assert result.exit_code == 0
+    assert result.output == '{"arg1":1234}\n{"arg1":5}\n'
+
+
+def test_abi_decode_streams_csv(runner: CliRunner, cli: rclick.RichGroup, tmp_path) -> None:
+    source = tmp_path / "calldata.txt"
+    source.write_text(
+        "0x00000000000000000000000000000000000000000000000000000000000004d20000000000000000000000000000000000000000000000000000000000000040000000000000000000000000000000000000000000000000000000000000000a3078646561646265656600000000000000000000000000000000000000000000\n"
+    )
+    result = runner.invoke(cli, ['abi_decode', '--signature', 'call_this_view_function(uint256 arg1, string addr)', '--input', str(source), '--format', 'csv'])
+
+    assert result.exit_code == 0
+    assert result.output == "arg1,addr,error\n1234,0xdeadbeef,\n"